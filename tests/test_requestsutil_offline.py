@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HttpClient离线测试
+
+使用本地http.server回显请求，不依赖外部网络
+"""
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.authutil import AuthManager
+from utils import requestsutil
+from utils.requestsutil import HttpClient, IPRotationAdapter, RequestSend
+
+
+class _EchoHandler(BaseHTTPRequestHandler):
+    """把请求方法、路径、请求头和请求体以JSON形式返回；/flaky开头的路径第一次返回503"""
+
+    flaky_bodies = {}
+
+    def _echo(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        if self.path.startswith('/flaky'):
+            bodies = self.flaky_bodies.setdefault(self.path, [])
+            bodies.append(body)
+            if len(bodies) == 1:
+                self.send_response(503)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+        payload = json.dumps({
+            'method': self.command,
+            'path': self.path,
+            'headers': dict(self.headers),
+            'body_size': len(body)
+        }).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = do_POST = do_PUT = do_DELETE = _echo
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _EchoHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_host_header_without_auth(server):
+    # 按IP改写URL后，即使没有配置认证，也要带上原始Host
+    port = server.server_address[1]
+    with HttpClient(base_url=f"http://localhost:{port}", ip_list=["127.0.0.1"]) as client:
+        response = client.send_request("GET", "/x")
+
+    assert response.status_code == 200
+    assert response.url.startswith(f"http://127.0.0.1:{port}/x")
+    assert response.json()['headers']['Host'] == f"localhost:{port}"
+
+
+def test_https_pool_uses_original_host_for_sni():
+    # 直连IP的HTTPS连接池按Host设置SNI和证书主机名
+    adapter = IPRotationAdapter()
+    request = requests.Request(
+        'GET', 'https://127.0.0.1:8443/x', headers={'Host': 'example.com:8443'}
+    ).prepare()
+    _, pool_kwargs = adapter.build_connection_pool_key_attributes(request, True)
+
+    assert pool_kwargs['server_hostname'] == 'example.com'
+    assert pool_kwargs['assert_hostname'] == 'example.com'
+
+
+def test_basic_auth_headers_are_cached(monkeypatch):
+    # 与请求体无关的认证策略只计算一次认证头，之后命中缓存
+    client = HttpClient(max_workers=1)
+    client.set_auth_strategy('basic')
+    client.set_auth_config({'username': 'user', 'password': 'pass'})
+
+    calls = []
+    original = AuthManager.get_auth_headers
+
+    def _counting(self, request_data=None):
+        calls.append(request_data)
+        return original(self, request_data)
+
+    monkeypatch.setattr(AuthManager, 'get_auth_headers', _counting)
+
+    expected = 'Basic ' + base64.b64encode(b'user:pass').decode('ascii')
+    first = client._prepare_auth_headers('GET', 'http://example.com/a', headers={'X-Trace': '1'})
+    second = client._prepare_auth_headers('GET', 'http://example.com/b')
+
+    assert first == {'X-Trace': '1', 'Authorization': expected}
+    assert second == {'Authorization': expected}
+    assert len(calls) == 1
+    client.close()
+
+
+def test_hmac_auth_headers_sent(server):
+    # HMAC认证每次请求重新签名，签名头随请求发出
+    port = server.server_address[1]
+    with HttpClient(base_url=f"http://127.0.0.1:{port}", max_workers=1) as client:
+        client.set_auth_strategy('hmac')
+        client.set_auth_config({'secret_key': 'secret'})
+        response = client.send_request("POST", "/sign", json_data={'a': 1})
+
+    headers = response.json()['headers']
+    assert headers['X-Signature']
+    assert headers['X-Timestamp']
+    assert headers['X-Nonce']
+
+
+def test_upload_file_with_retry(server, tmp_path, monkeypatch):
+    # 上传请求遇到503重试时，重新发送完整的文件内容
+    monkeypatch.setattr(requestsutil.time, 'sleep', lambda seconds: None)
+    upload = tmp_path / "upload.bin"
+    upload.write_bytes(os.urandom(4096))
+    port = server.server_address[1]
+
+    with HttpClient(base_url=f"http://127.0.0.1:{port}", max_workers=1, retry_count=2) as client:
+        response = client.send_request("POST", "/flaky/upload", files={'file': str(upload)})
+
+    bodies = _EchoHandler.flaky_bodies['/flaky/upload']
+    assert response.status_code == 200
+    # multipart边界每次不同，逐次检查文件内容完整
+    assert len(bodies) == 2
+    assert all(upload.read_bytes() in body for body in bodies)
+
+
+def test_upload_file_md5_cache_is_bounded(tmp_path, monkeypatch):
+    # 同一文件的MD5只计算一次，缓存条目数不超过上限
+    monkeypatch.setattr(requestsutil, '_FILE_MD5_CACHE_SIZE', 2)
+    calls = []
+    original = requestsutil.HMACAuth._calculate_file_path_md5
+
+    def _counting(file_path):
+        calls.append(file_path)
+        return original(file_path)
+
+    monkeypatch.setattr(requestsutil.HMACAuth, '_calculate_file_path_md5', staticmethod(_counting))
+    paths = []
+    for i in range(5):
+        path = tmp_path / f"file{i}.txt"
+        path.write_bytes(f"content {i}".encode('utf-8'))
+        paths.append(str(path))
+
+    client = HttpClient(max_workers=1)
+    first = client._get_upload_file_md5(paths[0])
+    assert client._get_upload_file_md5(('file0.txt', paths[0])) == first
+    assert first == hashlib.md5(b"content 0").hexdigest()
+    assert len(calls) == 1
+
+    for path in paths[1:]:
+        client._get_upload_file_md5(path)
+        assert len(client._file_md5_cache) <= 2
+    assert len(calls) == 5
+    client.close()
+
+
+def test_dynamic_time_params_share_one_snapshot(monkeypatch):
+    # 一次动态参数替换只取一次时间，跨秒时同一请求内的时间参数依然一致
+    clock = iter([1000.9, 1001.2, 1002.5])
+    monkeypatch.setattr(requestsutil.time, 'time', lambda: next(clock))
+    client = HttpClient(max_workers=1)
+
+    data = {'a': '${timestamp}', 'b': ['${timestamp}', 'at ${datetime}'], 'c': {'d': '${timestamp}'}}
+    first = client._process_dynamic_params(data)
+    second = client._process_dynamic_params({'a': '${timestamp}'}, {'date': lambda: 'custom'})
+
+    assert first['a'] == first['b'][0] == first['c']['d'] == '1000'
+    assert first['b'][1].startswith('at ')
+    assert second == {'a': '1001'}
+    assert client._process_dynamic_params('${date}', {'date': lambda: 'custom'}) == 'custom'
+    client.close()
+
+
+@pytest.mark.skipif(not requestsutil.HAS_AIOHTTP, reason="需要aiohttp")
+def test_async_batch_falls_back_to_thread_pool(server, monkeypatch):
+    # 启用重试、速率限制、IP轮询，或已处于事件循环中时，async_mode回退到线程池
+    port = server.server_address[1]
+    base_url = f"http://127.0.0.1:{port}"
+    urls = [f"{base_url}/a", f"{base_url}/b"]
+
+    async def _no_async_batch(*args, **kwargs):
+        raise AssertionError("不应使用协程并发")
+
+    def _batch(**client_kwargs):
+        with HttpClient(base_url=base_url, async_mode=True, max_workers=2, **client_kwargs) as client:
+            monkeypatch.setattr(client, '_async_batch', _no_async_batch)
+            return client.send_batch_requests("GET", urls, sequential=False)
+
+    for client_kwargs in ({}, {'retry_enabled': False, 'rate_limit': 100},
+                          {'retry_enabled': False, 'ip_list': ['127.0.0.1']}):
+        results = _batch(**client_kwargs)
+        assert [response.status_code for _, response in results] == [200, 200]
+
+    async def _inside_loop():
+        return _batch(retry_enabled=False)
+
+    results = asyncio.run(_inside_loop())
+    assert [response.json()['path'] for _, response in results] == ['/a', '/b']
+
+
+@pytest.mark.skipif(not requestsutil.HAS_AIOHTTP, reason="需要aiohttp")
+def test_async_batch_used_without_retries(server):
+    # 未启用重试等功能时使用协程并发，结果顺序与URL顺序一致
+    port = server.server_address[1]
+    urls = [f"http://127.0.0.1:{port}/a", f"http://127.0.0.1:{port}/b"]
+    with HttpClient(async_mode=True, retry_enabled=False, max_workers=2) as client:
+        assert client._can_use_async_batch([None, None], [None, None], [None, None], [None, None], {})
+        results = client.send_batch_requests("GET", urls, sequential=False)
+
+    assert [response.json()['path'] for _, response in results] == ['/a', '/b']
+
+
+@pytest.mark.skipif(not requestsutil.HAS_AIOHTTP, reason="需要aiohttp")
+def test_async_batch_params_with_none_or_bool_fall_back(server, monkeypatch):
+    # requests丢弃None并把布尔值转成字符串，aiohttp会抛出TypeError，这类参数回退到线程池
+    port = server.server_address[1]
+    urls = [f"http://127.0.0.1:{port}/a", f"http://127.0.0.1:{port}/b"]
+
+    async def _no_async_batch(*args, **kwargs):
+        raise AssertionError("不应使用协程并发")
+
+    with HttpClient(async_mode=True, retry_enabled=False, max_workers=2) as client:
+        monkeypatch.setattr(client, '_async_batch', _no_async_batch)
+        results = client.send_batch_requests(
+            "GET", urls, params_list=[{'x': None, 'y': True}, None], sequential=False)
+        assert not client._can_use_async_batch(
+            [None], [{'form': None}], [None], [None], {'retry_enabled': False})
+
+    assert [response.json()['path'] for _, response in results] == ['/a?y=True', '/b']
+
+
+@pytest.mark.skipif(not requestsutil.HAS_AIOHTTP, reason="需要aiohttp")
+def test_async_batch_matches_thread_pool_per_request(server):
+    # 协程并发与线程池结果一致：同时给出data和json时发送data，json无法序列化或请求头非法时只有该请求失败
+    port = server.server_address[1]
+    urls = [f"http://127.0.0.1:{port}/{name}" for name in ('data', 'nan', 'header', 'ok')]
+    batch_kwargs = {
+        'data_list': [{'x': '1'}, None, None, None],
+        'json_list': [{'a': 1}, {'a': float('nan')}, None, {'a': 1}],
+        'headers_list': [None, None, {'X-Count': 1}, None],
+        'sequential': False
+    }
+
+    summaries = []
+    for async_mode in (False, True):
+        with HttpClient(async_mode=async_mode, retry_enabled=False, max_workers=4) as client:
+            if async_mode:
+                assert client._can_use_async_batch(
+                    batch_kwargs['data_list'], [None] * 4, [None] * 4, [None] * 4, {'retry_enabled': False})
+            results = client.send_batch_requests("POST", urls, **batch_kwargs)
+        summaries.append([response and (response.status_code, response.json()['body_size'])
+                          for _, response in results])
+
+    assert summaries[0] == summaries[1] == [(200, 3), None, None, (200, len(requestsutil._dump_json_body({'a': 1})))]
+
+
+def test_json_body_rejects_non_finite_floats(server):
+    # 与requests一致，NaN和无穷大不会被悄悄序列化为null
+    assert json.loads(requestsutil._dump_json_body({'a': None, 'b': [1.5, None]})) == {'a': None, 'b': [1.5, None]}
+    for value in (float('nan'), float('inf'), -float('inf')):
+        with pytest.raises(ValueError):
+            requestsutil._dump_json_body({'a': None, 'b': [value]})
+
+    request_kwargs = {'json': {'a': float('nan')}}
+    with pytest.raises(requests.exceptions.InvalidJSONError):
+        requestsutil._encode_json_kwargs(request_kwargs)
+    assert request_kwargs == {'json': {'a': request_kwargs['json']['a']}}
+
+    port = server.server_address[1]
+    with HttpClient(base_url=f"http://127.0.0.1:{port}", max_workers=1) as client:
+        assert client.send_request("POST", "/nan", json_data={'a': float('nan')}) is None
+        with pytest.raises(requests.exceptions.InvalidJSONError):
+            client.request("POST", "/nan", json={'a': float('inf')})
+
+    # api_run使用JSON请求头时，无法序列化的请求体返回与请求失败相同的结果
+    with RequestSend(base_url=f"http://127.0.0.1:{port}", max_workers=1) as sender:
+        json_headers = {'Content-Type': 'application/json'}
+        assert sender.api_run("/nan", "post", data={'a': float('nan')}, headers=json_headers) == \
+            {'code': 0, 'headers': {}, 'body': {'hi': '请求失败'}, 'cookies': {}}
+        assert sender.api_run("/ok", "post", data={'a': 1}, headers=json_headers)['code'] == 200
+
+
+def test_upload_multiple_files_content_cache(server, tmp_path, monkeypatch):
+    # 上传内容按 (路径, 修改时间, 大小) 缓存为bytes，文件变化后重新读取，大文件不缓存
+    monkeypatch.setattr(requestsutil, '_UPLOAD_CACHE_MAX_FILE_SIZE', 16)
+    small = tmp_path / "small.txt"
+    large = tmp_path / "large.txt"
+    small.write_bytes(b"v1")
+    large.write_bytes(b"x" * 64)
+    port = server.server_address[1]
+
+    with HttpClient(base_url=f"http://127.0.0.1:{port}", max_workers=1) as client:
+        result = client.upload_multiple_files("/upload", {'a': str(small), 'b': str(large)})
+        assert result['status_code'] == 200
+        first = client._get_upload_content(str(small))
+        assert client._get_upload_content(str(small)) is first
+        assert list(client._upload_contents) == [os.path.realpath(small)]
+
+        small.write_bytes(b"v2-longer")
+        assert client._get_upload_content(str(small)) == b"v2-longer"
+        assert client._get_upload_content(str(large)) == b"x" * 64
+
+
+def test_upload_file_hmac_signs_content(server, tmp_path):
+    # upload_file以bytes上传文件，HMAC签名覆盖文件内容的MD5，缓存内容的MD5只在读取时计算一次
+    upload = tmp_path / "signed.txt"
+    upload.write_bytes(b"signed content")
+    port = server.server_address[1]
+
+    with HttpClient(base_url=f"http://127.0.0.1:{port}", max_workers=1) as client:
+        client.set_auth_strategy('hmac')
+        client.set_auth_config({'secret_key': 'secret'})
+        headers = client.upload_file("/upload", str(upload))['json']['headers']
+        content = client._get_upload_content(str(upload))
+        assert client._get_upload_file_md5(('signed.txt', content)) == client._upload_md5s[id(content)][1]
+
+    body = "file:" + hashlib.md5(b"signed content").hexdigest()
+    sign_str = headers['X-Timestamp'] + body + headers['X-Nonce'] + "POST" + "/upload"
+    expected = base64.b64encode(hmac.new(b'secret', sign_str.encode('utf-8'), hashlib.sha256).digest()).decode('utf-8')
+    assert headers['X-Signature'] == expected
+    assert client._get_upload_file_md5(('a.txt', bytearray(b"abc"))) == hashlib.md5(b"abc").hexdigest()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HttpClient冒烟测试
+
+原utils/requestsutil.py中__main__部分的演示代码，需要访问httpbin.org，
+使用 pytest -m "not network" 可跳过
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.requestsutil import HttpClient
+
+BASE_URL = "http://httpbin.org"
+
+pytestmark = pytest.mark.network
+
+
+@pytest.fixture(scope="module")
+def client():
+    with HttpClient(base_url=BASE_URL) as http_client:
+        yield http_client
+
+
+def test_single_request(client):
+    # 测试单请求
+    response = client.get("/get")
+    assert response['status_code'] == 200
+
+
+def test_multiple_paths(client):
+    # 测试多路径请求
+    paths = ["/get", "/headers", "/status/200"]
+    results = client.send_multiple_paths(
+        base_url=BASE_URL,
+        paths=paths,
+        method="GET"
+    )
+    
+    assert [url for url, _ in results] == [f"{BASE_URL}{path}" for path in paths]
+    assert all(resp is not None and resp.status_code == 200 for _, resp in results)
+
+
+def test_batch_requests(client):
+    # 测试批量请求（/post只接受POST，返回405同样说明请求已送达）
+    urls = [f"{BASE_URL}/get", f"{BASE_URL}/post"]
+    batch_results = client.send_batch_requests(
+        method="GET",
+        urls=urls
+    )
+    
+    assert [url for url, _ in batch_results] == urls
+    assert [resp.status_code for _, resp in batch_results] == [200, 405]
+
+
+def test_upload_file(client, tmp_path):
+    # 测试文件上传：调用方只传文件路径，文件句柄由客户端管理
+    temp_file = tmp_path / "temp_test.txt"
+    temp_file.write_text("This is a test file for upload")
+    
+    upload_response = client.upload_file("/post", str(temp_file), file_param="test_file")
+    assert upload_response['status_code'] == 200
+    assert upload_response['json']['files']['test_file'] == "This is a test file for upload"
+    
+    # 同一文件上传到多个字段
+    upload_response = client.upload_multiple_files(
+        "/post", {'file1': str(temp_file), 'file2': str(temp_file)}
+    )
+    assert upload_response['status_code'] == 200
+    assert set(upload_response['json']['files']) == {'file1', 'file2'}
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TaskScheduler定时堆的确定性测试
+
+不启动定时线程，替换time.time后直接处理堆条目
+"""
+
+import heapq
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils import scheduleutil
+
+
+class _Clock:
+    """可手动拨动的时钟"""
+
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = _Clock(1000.0)
+    monkeypatch.setattr(scheduleutil.time, 'time', fake)
+    return fake
+
+
+@pytest.fixture
+def scheduler(clock):
+    return scheduleutil.TaskScheduler(max_workers=1)
+
+
+def _noop():
+    return None
+
+
+def _fire_due(scheduler):
+    # 与定时线程相同：取出所有到期的堆条目并处理
+    fired = []
+    with scheduler.lock:
+        heap = scheduler._timer_heap
+        while heap and heap[0][0] <= scheduleutil.time.time():
+            next_run, task_id = heapq.heappop(heap)
+            fired.append(task_id)
+            scheduler._fire_timer_locked(next_run, task_id)
+    return fired
+
+
+def test_interval_catch_up_skips_missed_periods(scheduler, clock):
+    # 落后多个周期时只触发一次，下次执行时间对齐到原计划的周期上
+    task_id = scheduler.add_interval_task(_noop, seconds=10)
+    key = scheduler._task_key(task_id)
+    assert scheduler.tasks[key]['_next_run_ts'] == 1010.0
+
+    clock.now = 1045.0
+    assert _fire_due(scheduler) == [key]
+    assert scheduler.execution_queue.qsize() == 1
+    assert scheduler.tasks[key]['_next_run_ts'] == 1050.0
+    assert scheduler._timer_heap == [(1050.0, key)]
+
+    # 按时触发时以上次计划时间为基准累加
+    clock.now = 1050.5
+    _fire_due(scheduler)
+    assert scheduler.tasks[key]['_next_run_ts'] == 1060.0
+
+
+def test_one_time_task_keeps_deadline_on_resume(scheduler, clock):
+    # 一次性任务恢复后按原截止时间执行，暂停期间已过截止时间则立即执行
+    task_id = scheduler.add_one_time_task(_noop, delay_seconds=30)
+    key = scheduler._task_key(task_id)
+
+    clock.now = 1010.0
+    assert scheduler.pause_task(task_id)
+    clock.now = 1020.0
+    assert scheduler.resume_task(task_id)
+    assert scheduler.tasks[key]['_next_run_ts'] == 1030.0
+
+    assert scheduler.pause_task(task_id)
+    clock.now = 1100.0
+    assert scheduler.resume_task(task_id)
+    assert scheduler.tasks[key]['_next_run_ts'] == 1100.0
+
+    # 暂停前留下的旧条目被跳过，任务只执行一次，执行后不能再恢复
+    assert _fire_due(scheduler) == [key, key, key]
+    assert scheduler.execution_queue.qsize() == 1
+    assert scheduler.tasks[key]['_fired']
+    assert not scheduler.resume_task(task_id)
+    assert not scheduler.pause_task(task_id)
+
+
+def test_stale_timer_entries_are_compacted(scheduler, clock):
+    # 暂停和移除留下的失效条目超过堆的一半时重建定时堆
+    scheduler._TIMER_COMPACT_MIN = 2
+    task_ids = [scheduler.add_interval_task(_noop, seconds=10 + i) for i in range(4)]
+    keys = [scheduler._task_key(task_id) for task_id in task_ids]
+
+    assert scheduler.pause_task(task_ids[0])
+    assert scheduler.pause_task(task_ids[1])
+    assert len(scheduler._timer_heap) == 4
+    assert scheduler._timer_stale == 2
+
+    assert scheduler.remove_task(task_ids[2])
+    assert scheduler._timer_heap == [(1013.0, keys[3])]
+    assert scheduler._timer_stale == 0
+
+    assert scheduler.resume_task(task_ids[0])
+    assert sorted(task_id for _, task_id in scheduler._timer_heap) == [keys[0], keys[3]]
+    clock.now = 2000.0
+    _fire_due(scheduler)
+    assert scheduler.execution_queue.qsize() == 2
+
+
+def test_task_id_string_coercion(scheduler):
+    # 对外的"task_<n>"字符串和内部整数键可以互换使用，其他形式的ID视为不存在
+    task_id = scheduler.add_interval_task(_noop, seconds=5, task_name="ping")
+    key = int(task_id[len("task_"):])
+
+    assert scheduleutil.TaskScheduler._task_key(task_id) == key
+    assert scheduleutil.TaskScheduler._task_key(key) == key
+    for invalid in (str(key), "task_", "task_x", "job_1", None):
+        assert scheduleutil.TaskScheduler._task_key(invalid) is None
+
+    assert scheduler.get_task_info(task_id)['task_id'] == task_id
+    assert scheduler.get_task_info(key)['name'] == "ping"
+    assert scheduler.get_task_info(str(key)) is None
+    assert not scheduler.pause_task(str(key))
+    assert scheduler.pause_task(key)
+    assert scheduler.resume_task(task_id)
+    assert scheduler.remove_task(task_id)
+    assert scheduler.get_task_info(key) is None
+
+
+def test_schedule_test_suite(clock):
+    # 按间隔和延迟调度测试套件，任务以套件名命名
+    scheduler = scheduleutil.TestCaseScheduler(suite_workers=1)
+    scheduler.add_test_suite("smoke", [(_noop, (), {})])
+
+    interval_id = scheduler.schedule_test_suite("smoke", interval_seconds=60)
+    one_time_id = scheduler.schedule_test_suite("smoke", delay_seconds=5)
+
+    assert scheduler.get_task_info(interval_id)['name'] == "测试套件-smoke"
+    assert scheduler.get_task_info(interval_id)['type'] == 'interval'
+    assert scheduler.get_task_info(one_time_id)['type'] == 'one_time'
+    with pytest.raises(ValueError):
+        scheduler.schedule_test_suite("missing", interval_seconds=60)
+    with pytest.raises(ValueError):
+        scheduler.schedule_test_suite("smoke")
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+流式测试工具离线测试
+"""
+
+import json
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.streamutil import AdvancedStreamTester, AssertionResult
+
+
+def test_recording_saves_materialized_assertion_results(tmp_path):
+    # 返回的数据块保留AssertionResult，保存的记录中是带断言名称和期望值的字典
+    tester = AdvancedStreamTester()
+    tester.add_assertion("has_hello", "contains", "hello")
+    chunk = tester.process_chunk({'content': 'hello world'})
+    assert isinstance(chunk['assertion_results'][0], AssertionResult)
+
+    file_path = tmp_path / "recording.json"
+    assert tester.save_recording(str(file_path)) is True
+    with open(file_path, 'r', encoding='utf-8') as f:
+        records = json.load(f)['records']
+
+    assert records[0]['chunk']['assertion_results'] == [{
+        'name': 'has_hello',
+        'type': 'contains',
+        'expected': 'hello',
+        'actual': 'hello world',
+        'passed': True,
+        'message': '',
+        'chunk_index': 0
+    }]
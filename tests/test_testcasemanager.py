@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TestCaseManager离线测试
+
+所有数据写入pytest提供的临时目录
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils import testcasemanager
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return testcasemanager.TestCaseManager(storage_dir=str(tmp_path))
+
+
+def test_listing_returns_read_only_views(manager):
+    # 列表、搜索和测试套件返回只读视图，不能绕过update_test_case修改已建索引的字段
+    manager.create_test_case("case1", {"name": "login", "priority": "high"})
+    manager.create_test_case("case2", {"name": "logout", "priority": "low"})
+    manager.create_test_suite("suite1", "smoke", ["case1", "case2"])
+
+    listed = manager.list_test_cases({"priority": "high"})
+    found = manager.search_test_cases("logout")
+    suite = manager.get_test_suite("suite1")
+
+    assert [case["id"] for case in listed] == ["case1"]
+    assert [case["id"] for case in found] == ["case2"]
+    assert [case["name"] for case in suite["cases_data"]] == ["login", "logout"]
+    for case in listed + found + suite["cases_data"]:
+        with pytest.raises(TypeError):
+            case["priority"] = "changed"
+
+    # 修改返回的套件副本不影响管理器中的数据
+    suite["cases"].remove("case1")
+    assert manager.get_test_suite("suite1")["cases"] == ["case1", "case2"]
+    assert manager.list_test_cases({"priority": "high"})[0]["name"] == "login"
+
+
+def test_search_anchors_match_single_fields(manager):
+    # ^ 和 $ 对应每个字段的开头和结尾（字段内的换行不算），. 不会跨字段匹配
+    manager.create_test_case("case1", {"name": "login", "method": "POST"})
+    manager.create_test_case("case2", {"name": "user login", "method": "GET", "desc": "then logout"})
+    manager.create_test_case("case3", {"name": "login page", "method": "GET", "desc": "see login\nmore"})
+
+    def _ids(keyword):
+        return [case["id"] for case in manager.search_test_cases(keyword)]
+
+    assert _ids("^login") == ["case1", "case3"]
+    assert _ids("login$") == ["case1", "case2"]
+    assert _ids("^login$") == ["case1"]
+    assert _ids("login.POST") == []
+    assert _ids("login\\sPOST") == []
+    assert _ids(r"\Acase[12]") == ["case1", "case2"]
+    assert _ids("LOGOUT") == ["case2"]
+
+
+@pytest.mark.skipif(not testcasemanager.HAS_MSGSPEC, reason="延迟加载需要msgspec")
+def test_get_test_case_read_only_in_both_modes(tmp_path):
+    # 完整加载和延迟加载下get_test_case都返回只读视图
+    manager = testcasemanager.TestCaseManager(storage_dir=str(tmp_path))
+    manager.create_test_case("case1", {"name": "login"})
+    manager.save_cases()
+
+    hot = manager.get_test_case("case1")
+    with pytest.raises(TypeError):
+        hot["name"] = "changed"
+
+    lazy_manager = testcasemanager.TestCaseManager(storage_dir=str(tmp_path))
+    assert lazy_manager._snapshot_index is not None
+    cold = lazy_manager.get_test_case("case1")
+    assert cold["name"] == "login"
+    with pytest.raises(TypeError):
+        cold["name"] = "changed"
+    assert lazy_manager.get_test_case("missing") is None
+
+    # 通过update_test_case修改后，两种路径读到的都是新数据
+    lazy_manager.update_test_case("case1", {**cold, "name": "changed"})
+    assert lazy_manager.get_test_case("case1")["name"] == "changed"
+
+
+def test_update_accepts_read_only_view(manager):
+    # get_test_case返回的只读视图可以直接传回update_test_case，传入的数据不会被修改
+    data = {"name": "login"}
+    manager.create_test_case("case1", data)
+    assert data == {"name": "login"}
+
+    view = manager.get_test_case("case1")
+    assert manager.update_test_case("case1", view) is True
+    assert manager.get_test_case("case1")["created_at"] == view["created_at"]
+    assert manager.create_test_case("case2", manager.get_test_case("case1")) is True
+    assert manager.get_test_case("case2")["name"] == "login"
+
+
+def _reopen(manager, storage_dir):
+    # 模拟进程重启：关闭日志文件后用同一目录重新创建管理器
+    if manager._wal is not None:
+        manager._wal.close()
+    return testcasemanager.TestCaseManager(storage_dir=str(storage_dir))
+
+
+needs_msgspec = pytest.mark.skipif(not testcasemanager.HAS_MSGSPEC, reason="追加日志和快照需要msgspec")
+
+
+@needs_msgspec
+def test_create_restart_replays_wal(tmp_path):
+    # 增删改只写入追加日志，重启后回放得到相同的数据
+    manager = testcasemanager.TestCaseManager(storage_dir=str(tmp_path))
+    manager.create_test_case("case1", {"name": "login"})
+    manager.create_test_case("case2", {"name": "logout"})
+    manager.update_test_case("case1", {"name": "login v2"})
+    manager.delete_test_case("case2")
+    manager.create_test_suite("suite1", "smoke", ["case1"])
+    assert not os.path.exists(tmp_path / "test_cases.mpk")
+
+    reopened = _reopen(manager, tmp_path)
+    assert [case["name"] for case in reopened.list_test_cases()] == ["login v2"]
+    assert reopened.get_test_case("case2") is None
+    assert reopened.get_test_suite("suite1")["cases"] == ["case1"]
+    assert reopened.list_test_cases({"name": "login v2"})[0]["id"] == "case1"
+
+
+@needs_msgspec
+def test_open_wal_truncates_torn_tail(tmp_path):
+    # 日志末尾不完整的帧在启动时被截掉，之后追加的记录可以正常回放
+    manager = testcasemanager.TestCaseManager(storage_dir=str(tmp_path))
+    manager.create_test_case("case1", {"name": "login"})
+    manager._wal.close()
+    wal_path = tmp_path / "cases.wal"
+    valid_size = wal_path.stat().st_size
+    with open(wal_path, 'ab') as f:
+        f.write(testcasemanager._FRAME_HEADER.pack(100) + b"\x81\xa2op")
+
+    reopened = testcasemanager.TestCaseManager(storage_dir=str(tmp_path))
+    assert wal_path.stat().st_size == valid_size
+    assert reopened.get_test_case("case1")["name"] == "login"
+
+    reopened.create_test_case("case2", {"name": "logout"})
+    again = _reopen(reopened, tmp_path)
+    assert sorted(case["id"] for case in again.list_test_cases()) == ["case1", "case2"]
+
+
+@needs_msgspec
+def test_compact_force_writes_snapshot(tmp_path):
+    # 强制压缩时忽略阈值，写入快照和索引并清空日志
+    manager = testcasemanager.TestCaseManager(storage_dir=str(tmp_path))
+    manager.create_test_case("case1", {"name": "login"})
+    wal_path = tmp_path / "cases.wal"
+    assert wal_path.stat().st_size > 0
+
+    assert manager.compact() is True
+    assert wal_path.stat().st_size > 0
+    assert manager.compact(force=True) is True
+    assert wal_path.stat().st_size == 0
+    assert (tmp_path / "test_cases.mpk").exists()
+    assert (tmp_path / "test_cases.idx").exists()
+
+    reopened = _reopen(manager, tmp_path)
+    assert reopened._snapshot_index is not None
+    assert reopened.get_test_case("case1")["name"] == "login"
+
+
+@needs_msgspec
+def test_lazy_get_test_case_with_overlay_and_deletes(tmp_path):
+    # 延迟加载时，快照之后的更新和删除从日志回放结果中读取，完整加载后结果一致
+    manager = testcasemanager.TestCaseManager(storage_dir=str(tmp_path))
+    for case_id in ("case1", "case2", "case3"):
+        manager.create_test_case(case_id, {"name": case_id})
+    manager.create_test_suite("suite1", "all", ["case1", "case2", "case3"])
+    manager.save_cases()
+    manager.update_test_case("case2", {"name": "case2 v2"})
+    manager.delete_test_case("case3")
+
+    reopened = _reopen(manager, tmp_path)
+    assert reopened._snapshot_index is not None
+    assert reopened.get_test_case("case1")["name"] == "case1"
+    assert reopened.get_test_case("case2")["name"] == "case2 v2"
+    assert reopened.get_test_case("case3") is None
+    assert reopened.get_test_case("missing") is None
+    assert reopened.test_suites["suite1"]["cases"] == ["case1", "case2"]
+    assert reopened._snapshot_index is not None
+
+    # 过滤需要全部用例，触发完整加载并按顺序应用回放的操作
+    assert [case["id"] for case in reopened.list_test_cases({"name": "case2 v2"})] == ["case2"]
+    assert reopened._snapshot_index is None
+    assert sorted(reopened.test_cases) == ["case1", "case2"]
+
+
+def test_legacy_json_store_without_msgspec(tmp_path, monkeypatch):
+    # 未安装msgspec时读写旧的test_cases.json，不使用追加日志
+    monkeypatch.setattr(testcasemanager, 'HAS_MSGSPEC', False)
+    monkeypatch.setattr(testcasemanager, '_encoder', None)
+    monkeypatch.setattr(testcasemanager, '_decoder', None)
+    (tmp_path / "test_cases.json").write_text(
+        '{"case1": {"name": "login", "status": "active"}}', encoding='utf-8')
+    (tmp_path / "test_suites.json").write_text(
+        '{"suite1": {"name": "smoke", "cases": ["case1"]}}', encoding='utf-8')
+
+    manager = testcasemanager.TestCaseManager(storage_dir=str(tmp_path))
+    assert manager._wal is None
+    assert manager.get_test_case("case1")["name"] == "login"
+    assert manager.get_test_suite("suite1")["cases_data"][0]["id"] == "case1"
+
+    manager.create_test_case("case2", {"name": "logout"})
+    assert not (tmp_path / "cases.wal").exists()
+    assert not (tmp_path / "test_cases.mpk").exists()
+
+    reopened = testcasemanager.TestCaseManager(storage_dir=str(tmp_path))
+    assert [case["id"] for case in reopened.list_test_cases()] == ["case1", "case2"]
+
+
+@pytest.mark.skipif(testcasemanager.openpyxl is None, reason="导入Excel需要openpyxl")
+def test_import_from_excel_parses_json_cells(manager, tmp_path):
+    # 形如JSON的单元格解析为对象，解析失败的保留原字符串，不影响后面的单元格
+    workbook = testcasemanager.openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(["id", "name", "bad", "params", "tags"])
+    sheet.append(["case1", "login", "{not json}", '{"user": "a"}', '["smoke"]'])
+    file_path = tmp_path / "cases.xlsx"
+    workbook.save(file_path)
+
+    assert manager.import_from_excel(str(file_path)) is True
+    case = manager.get_test_case("case1")
+    assert case["bad"] == "{not json}"
+    assert case["params"] == {"user": "a"}
+    assert case["tags"] == ["smoke"]
@@ -0,0 +1,226 @@
+"""
+性能测试报告渲染模块
+提供文本/HTML格式性能测试报告的生成函数，逐行写入文件对象，避免拼接出完整的大字符串
+"""
+import io
+from typing import Any, Dict, TextIO
+
+
+# HTML报告的固定头部（样式表等），只需构建一次
+_HTML_REPORT_HEAD = '\n'.join([
+    "<!DOCTYPE html>",
+    "<html lang='zh-CN'>",
+    "<head>",
+    "<meta charset='UTF-8'>",
+    "<meta name='viewport' content='width=device-width, initial-scale=1.0'>",
+    "<title>性能测试报告</title>",
+    "<style>",
+    "  body { font-family: Arial, sans-serif; margin: 20px; }",
+    "  h1, h2, h3 { color: #2c3e50; }",
+    "  .header { background-color: #f8f9fa; padding: 15px; border-radius: 5px; margin-bottom: 20px; }",
+    "  .summary { background-color: #e9ecef; padding: 15px; border-radius: 5px; margin-bottom: 20px; }",
+    "  .details { margin-bottom: 20px; }",
+    "  .result-card { border: 1px solid #ddd; border-radius: 5px; padding: 15px; margin-bottom: 15px; }",
+    "  .error-type { background-color: #f8d7da; padding: 10px; border-radius: 3px; }",
+    "  .path-stats { background-color: #e3f2fd; padding: 10px; border-radius: 3px; }",
+    "  table { border-collapse: collapse; width: 100%; margin-top: 10px; }",
+    "  th, td { text-align: left; padding: 8px; border-bottom: 1px solid #ddd; }",
+    "  th { background-color: #f2f2f2; }",
+    "  tr:hover { background-color: #f5f5f5; }",
+    "</style>",
+    "</head>",
+    "<body>",
+    "<h1>性能测试报告</h1>",
+]) + '\n'
+
+
+def write_text_report(report_data: Dict[str, Any], f: TextIO) -> None:
+    """
+    将文本格式的报告逐行写入文件对象
+
+    Args:
+        report_data: 报告数据字典
+        f: 可写的文本文件对象
+    """
+    write = f.write
+    write("=" * 60 + "\n")
+    write("          性能测试报告          \n")
+    write("=" * 60 + "\n")
+    write(f"测试ID: {report_data.get('test_id', 'N/A')}\n")
+    write(f"生成时间: {report_data.get('generated_at', 'N/A')}\n")
+    write(f"总运行次数: {report_data.get('total_runs', 0)}\n")
+    write("-" * 60 + "\n")
+
+    # 总体统计
+    write("【总体统计】\n")
+    write(f"总请求数: {report_data.get('total_requests', 0)}\n")
+    write(f"成功请求: {report_data.get('total_success', 0)}\n")
+    write(f"失败请求: {report_data.get('total_errors', 0)}\n")
+    write(f"总体错误率: {report_data.get('overall_error_rate', 0):.2%}\n")
+    write(f"平均响应时间: {report_data.get('overall_avg_response_time', 0):.2f}ms\n")
+    write("-" * 60 + "\n")
+
+    # 详细结果
+    write("【详细测试结果】\n")
+    for i, result in enumerate(report_data['results'], 1):
+        write(f"测试 #{i}\n")
+        write(f"  并发数: {result.get('concurrency', 'N/A')}\n")
+        write(f"  持续时间: {result.get('duration', 'N/A')}秒\n")
+        write(f"  请求总数: {result.get('total_requests', 0)}\n")
+        write(f"  成功数: {result.get('success_count', 0)}\n")
+        write(f"  错误数: {result.get('error_count', 0)}\n")
+        write(f"  错误率: {result.get('error_rate', 0):.2%}\n")
+        write(f"  平均响应时间: {result.get('avg_response_time', 0):.2f}ms\n")
+        write(f"  P90响应时间: {result.get('p90_response_time', 0):.2f}ms\n")
+        write(f"  P95响应时间: {result.get('p95_response_time', 0):.2f}ms\n")
+        write(f"  P99响应时间: {result.get('p99_response_time', 0):.2f}ms\n")
+        write(f"  TPS: {result.get('tps', 0):.2f}\n")
+
+        # 错误类型统计
+        if result.get('error_types'):
+            write("  错误类型分布:\n")
+            for error_type, count in result['error_types'].items():
+                write(f"    {error_type}: {count}\n")
+
+        # 路径统计
+        if result.get('path_stats'):
+            write("  路径统计:\n")
+            for path, stats in result['path_stats'].items():
+                write(f"    路径 {path}:\n")
+                write(f"      请求数: {stats.get('total_requests', 0)}\n")
+                write(f"      平均响应时间: {stats.get('avg_response_time', 0):.2f}ms\n")
+
+        write("\n")
+
+    # 错误总结
+    if report_data.get('error_summary'):
+        write("【错误类型总结】\n")
+        for error_type, count in report_data['error_summary'].items():
+            write(f"  {error_type}: {count}\n")
+        write("\n")
+
+    write("=" * 60)
+
+
+def write_html_report(report_data: Dict[str, Any], f: TextIO) -> None:
+    """
+    将HTML格式的报告逐行写入文件对象
+
+    Args:
+        report_data: 报告数据字典
+        f: 可写的文本文件对象
+    """
+    write = f.write
+    write(_HTML_REPORT_HEAD)
+
+    # 头部信息
+    write("<div class='header'>\n")
+    write(f"<p><strong>测试ID:</strong> {report_data.get('test_id', 'N/A')}</p>\n")
+    write(f"<p><strong>生成时间:</strong> {report_data.get('generated_at', 'N/A')}</p>\n")
+    write(f"<p><strong>总运行次数:</strong> {report_data.get('total_runs', 0)}</p>\n")
+    write("</div>\n")
+
+    # 总体统计
+    write("<div class='summary'>\n")
+    write("<h2>总体统计</h2>\n")
+    write("<table>\n")
+    write("<tr><th>指标</th><th>值</th></tr>\n")
+    write(f"<tr><td>总请求数</td><td>{report_data.get('total_requests', 0)}</td></tr>\n")
+    write(f"<tr><td>成功请求</td><td>{report_data.get('total_success', 0)}</td></tr>\n")
+    write(f"<tr><td>失败请求</td><td>{report_data.get('total_errors', 0)}</td></tr>\n")
+    write(f"<tr><td>总体错误率</td><td>{report_data.get('overall_error_rate', 0):.2%}</td></tr>\n")
+    write(f"<tr><td>平均响应时间</td><td>{report_data.get('overall_avg_response_time', 0):.2f}ms</td></tr>\n")
+    write("</table>\n")
+    write("</div>\n")
+
+    # 详细结果
+    write("<div class='details'>\n")
+    write("<h2>详细测试结果</h2>\n")
+
+    for i, result in enumerate(report_data['results'], 1):
+        write("<div class='result-card'>\n")
+        write(f"<h3>测试 #{i}</h3>\n")
+        write("<table>\n")
+        write("<tr><th>指标</th><th>值</th></tr>\n")
+        write(f"<tr><td>并发数</td><td>{result.get('concurrency', 'N/A')}</td></tr>\n")
+        write(f"<tr><td>持续时间</td><td>{result.get('duration', 'N/A')}秒</td></tr>\n")
+        write(f"<tr><td>请求总数</td><td>{result.get('total_requests', 0)}</td></tr>\n")
+        write(f"<tr><td>成功数</td><td>{result.get('success_count', 0)}</td></tr>\n")
+        write(f"<tr><td>错误数</td><td>{result.get('error_count', 0)}</td></tr>\n")
+        write(f"<tr><td>错误率</td><td>{result.get('error_rate', 0):.2%}</td></tr>\n")
+        write(f"<tr><td>平均响应时间</td><td>{result.get('avg_response_time', 0):.2f}ms</td></tr>\n")
+        write(f"<tr><td>P90响应时间</td><td>{result.get('p90_response_time', 0):.2f}ms</td></tr>\n")
+        write(f"<tr><td>P95响应时间</td><td>{result.get('p95_response_time', 0):.2f}ms</td></tr>\n")
+        write(f"<tr><td>P99响应时间</td><td>{result.get('p99_response_time', 0):.2f}ms</td></tr>\n")
+        write(f"<tr><td>TPS</td><td>{result.get('tps', 0):.2f}</td></tr>\n")
+        write("</table>\n")
+
+        # 错误类型统计
+        if result.get('error_types'):
+            write("<h4>错误类型分布</h4>\n")
+            write("<div class='error-type'>\n")
+            write("<table>\n")
+            write("<tr><th>错误类型</th><th>次数</th></tr>\n")
+            for error_type, count in result['error_types'].items():
+                write(f"<tr><td>{error_type}</td><td>{count}</td></tr>\n")
+            write("</table>\n")
+            write("</div>\n")
+
+        # 路径统计
+        if result.get('path_stats'):
+            write("<h4>路径统计</h4>\n")
+            write("<div class='path-stats'>\n")
+            write("<table>\n")
+            write("<tr><th>路径</th><th>请求数</th><th>平均响应时间</th></tr>\n")
+            for path, stats in result['path_stats'].items():
+                write(f"<tr><td>{path}</td><td>{stats.get('total_requests', 0)}</td><td>{stats.get('avg_response_time', 0):.2f}ms</td></tr>\n")
+            write("</table>\n")
+            write("</div>\n")
+
+        write("</div>\n")
+
+    write("</div>\n")
+
+    # 错误总结
+    if report_data.get('error_summary'):
+        write("<div class='summary'>\n")
+        write("<h2>错误类型总结</h2>\n")
+        write("<table>\n")
+        write("<tr><th>错误类型</th><th>总次数</th></tr>\n")
+        for error_type, count in report_data['error_summary'].items():
+            write(f"<tr><td>{error_type}</td><td>{count}</td></tr>\n")
+        write("</table>\n")
+        write("</div>\n")
+
+    write("</body>\n")
+    write("</html>")
+
+
+def generate_text_report(report_data: Dict[str, Any]) -> str:
+    """
+    生成文本格式的报告
+
+    Args:
+        report_data: 报告数据字典
+
+    Returns:
+        文本报告
+    """
+    buf = io.StringIO()
+    write_text_report(report_data, buf)
+    return buf.getvalue()
+
+
+def generate_html_report(report_data: Dict[str, Any]) -> str:
+    """
+    生成HTML格式的报告
+
+    Args:
+        report_data: 报告数据字典
+
+    Returns:
+        HTML报告
+    """
+    buf = io.StringIO()
+    write_html_report(report_data, buf)
+    return buf.getvalue()
@@ -23,6 +23,45 @@ logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# 计算文件MD5时每次读取的块大小
+_MD5_CHUNK_SIZE = 1 << 20
+# Python 3.11+ 提供C实现的hashlib.file_digest
+_file_digest = getattr(hashlib, 'file_digest', None)
+
+
+def _md5_from_stream(file_obj: Any) -> str:
+    """
+    从文件对象当前位置读到结尾并计算MD5
+    
+    Args:
+        file_obj: 可读取的文件对象
+        
+    Returns:
+        MD5十六进制字符串
+    """
+    if _file_digest is not None:
+        try:
+            return _file_digest(file_obj, 'md5').hexdigest()
+        except ValueError:
+            # 非二进制可读对象（如文本文件），退回逐块读取
+            pass
+    
+    md5_hash = hashlib.md5()
+    readinto = getattr(file_obj, 'readinto', None)
+    if readinto is not None:
+        # 复用同一块缓冲区，避免每块分配新的bytes对象
+        buffer = bytearray(_MD5_CHUNK_SIZE)
+        view = memoryview(buffer)
+        while True:
+            size = readinto(buffer)
+            if not size:
+                break
+            md5_hash.update(view[:size])
+    else:
+        while chunk := file_obj.read(_MD5_CHUNK_SIZE):
+            md5_hash.update(chunk)
+    return md5_hash.hexdigest()
+
 
 class AuthBase:
     """
@@ -453,6 +492,10 @@ class HMACAuth(AuthBase):
         # 检查是否有文件上传
         files = request_data.get('files')
         if files:
+            # 调用方已按字段算好MD5时直接使用，格式与_calculate_file_md5s一致
+            file_md5_map = request_data.get('file_md5_map')
+            if isinstance(files, dict) and file_md5_map and len(file_md5_map) == len(files):
+                return '|'.join(sorted(f"{field_name}:{file_md5}" for field_name, file_md5 in file_md5_map.items()))
             file_md5 = self._calculate_file_md5s(files)
             logger.debug(f"文件上传场景，计算的MD5: {file_md5}")
             return file_md5
@@ -611,6 +654,10 @@ class HMACAuth(AuthBase):
             else:
                 file_obj = file_item
             
+            # 文件内容直接计算
+            if isinstance(file_obj, (bytes, bytearray, memoryview)):
+                return hashlib.md5(file_obj).hexdigest()
+            
             # 检查是否为文件路径字符串
             if isinstance(file_obj, str):
                 if os.path.exists(file_obj):
@@ -621,26 +668,38 @@ class HMACAuth(AuthBase):
             
             # 尝试处理文件对象
             try:
-                # 保存当前位置
-                current_pos = file_obj.tell()
-                # 移动到文件开头
-                file_obj.seek(0)
-                # 计算MD5
-                md5_hash = hashlib.md5()
-                while chunk := file_obj.read(8192):
-                    md5_hash.update(chunk)
-                # 恢复位置
-                file_obj.seek(current_pos)
-                return md5_hash.hexdigest()
+                return self._calculate_file_md5(file_obj)
             except Exception:
                 # 如果无法操作文件对象，返回随机值
                 logger.warning("无法读取文件对象，使用随机值代替")
-                return self._generate_nonce(16)
+                return self._generate_nonce()
         except Exception as e:
             logger.error(f"计算文件MD5时出错: {str(e)}")
             return None
     
-    def _calculate_file_path_md5(self, file_path: str) -> Optional[str]:
+    @staticmethod
+    def _calculate_file_md5(file_obj: Any) -> str:
+        """
+        计算文件对象全部内容的MD5值，计算后恢复文件指针位置
+        
+        Args:
+            file_obj: 支持seek/tell的文件对象
+            
+        Returns:
+            文件的MD5值
+        """
+        # 保存当前位置
+        current_pos = file_obj.tell()
+        # 移动到文件开头
+        file_obj.seek(0)
+        try:
+            return _md5_from_stream(file_obj)
+        finally:
+            # 恢复位置
+            file_obj.seek(current_pos)
+    
+    @staticmethod
+    def _calculate_file_path_md5(file_path: str) -> Optional[str]:
         """
         计算文件路径对应的MD5值
         
@@ -651,11 +710,8 @@ class HMACAuth(AuthBase):
             文件的MD5值或None
         """
         try:
-            md5_hash = hashlib.md5()
-            with open(file_path, 'rb') as f:
-                while chunk := f.read(8192):
-                    md5_hash.update(chunk)
-            return md5_hash.hexdigest()
+            with open(file_path, 'rb', buffering=_MD5_CHUNK_SIZE) as f:
+                return _md5_from_stream(f)
         except Exception as e:
             logger.error(f"计算文件 {file_path} 的MD5时出错: {str(e)}")
             return None
@@ -856,6 +912,20 @@ class AuthManager:
             self.logger.debug(traceback.format_exc())
             return request_data
     
+    def get_auth_headers(self, request_data: Optional[Dict[str, Any]] = None) -> Dict[str, str]:
+        """
+        计算请求所需的认证头
+        
+        Args:
+            request_data: 请求数据（method、url、data、json_data、files等，签名类认证需要）
+            
+        Returns:
+            认证头字典
+        """
+        request_copy = dict(request_data or {})
+        request_copy['headers'] = {}
+        return self.auth_strategy.authenticate(request_copy).get('headers', {})
+    
     def clear_cache(self) -> None:
         """
         清除认证缓存
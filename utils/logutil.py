@@ -199,6 +199,10 @@ class LogUtil:
         elif level == 'critical':
             self.logger.critical(message, extra=extra)
     
+    def isEnabledFor(self, level: int) -> bool:
+        """判断指定级别的日志是否会被处理，用于在构造日志消息前跳过开销"""
+        return self.logger.isEnabledFor(level)
+    
     def debug(self, message: str, extra: Dict[str, Any] = None):
         """记录debug级别日志"""
         self._log_with_type('debug', message, extra)
@@ -3,31 +3,77 @@
 HTTP请求工具模块
 提供增强的HTTP请求功能，支持智能重试、流式响应、动态参数等特性
 """
+import os
+import ipaddress
+import hashlib
 import json
+import math
+import asyncio
 import time
 import random
 import threading
+import weakref
 import statistics
 import string
 import re
 import logging
+import functools
+from collections import ChainMap, defaultdict
+from collections.abc import Mapping as _MappingABC
 from concurrent.futures import ThreadPoolExecutor
-from typing import Dict, List, Optional, Union, Any, Tuple, Generator, Callable, Pattern
-from urllib.parse import urljoin
+from typing import Dict, List, Optional, Union, Any, Tuple, Generator, Callable, Pattern, Mapping
+from urllib.parse import urljoin, urlparse, urlunparse
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from urllib3.exceptions import InsecureRequestWarning
 from utils.logutil import logger
+from utils._reporters import (
+    write_text_report, write_html_report, generate_text_report, generate_html_report
+)
 
 # 导入认证工具
-from utils.authutil import AuthManager, create_auth_manager as default_auth_manager
+from utils.authutil import AuthManager, HMACAuth, create_auth_manager
 
 # 导入并发控制工具
 from utils.concurrencyutil import (
     RateLimiter, ConcurrentExecutor, ConcurrencyManager,
-    limited_concurrency, run_with_rate_limit
+    limited_concurrency
 )
+# 尝试导入orjson以加速JSON解析和序列化，如果不可用则使用标准库json
+try:
+    import orjson  # 需要安装: pip install orjson
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
+# 尝试导入aiohttp，用于异步并发请求（AsyncHttpClient）
+HAS_AIOHTTP = False
+try:
+    import aiohttp  # 需要安装: pip install aiohttp
+    HAS_AIOHTTP = True
+except ImportError:
+    aiohttp = None
+
+# 尝试导入httpx，用于HTTP/2多路复用（AsyncHttpClient的http2模式）
+HAS_HTTPX = False
+try:
+    import httpx  # 需要安装: pip install httpx h2
+    HAS_HTTPX = True
+except ImportError:
+    httpx = None
+
+# 尝试导入gevent，用于以协程（greenlet）代替线程进行并发压测
+HAS_GEVENT = False
+try:
+    import gevent  # 需要安装: pip install gevent
+    from gevent import monkey as gevent_monkey
+    HAS_GEVENT = True
+except ImportError:
+    gevent = None
+    gevent_monkey = None
+
 # 禁用不安全请求警告
 requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
 
@@ -170,6 +216,10 @@ class RandomContentGenerator:
 default_random_generator = RandomContentGenerator()
 
 
+# 报告写盘时使用的缓冲区大小
+_REPORT_WRITE_BUFFER_SIZE = 1 << 20
+
+
 class PerformanceTester:
     """
     性能测试类，提供自动爬坡找极限性能功能
@@ -209,31 +259,63 @@ class PerformanceTester:
         Returns:
             (是否成功, 响应时间, 错误信息, 错误类型)
         """
-        start_time = time.time()
-        try:
-            current_path = path or self.path
-            url = urljoin(self.base_url, current_path)
-            response = self.http_client.send_request(
-                method=method,
-                url=url,
-                params=params,
-                data=data,
-                json_data=json_data,
-                headers=headers,
-                **kwargs
-            )
-            response_time = (time.time() - start_time) * 1000  # 转换为毫秒
-            success = response.status_code < 400
-            error_msg = f"HTTP错误: {response.status_code}" if not success else None
-            error_type = f"HTTP_{response.status_code}" if not success else None
-            return success, response_time, error_msg, error_type
-        except Exception as e:
-            response_time = (time.time() - start_time) * 1000
-            error_type = type(e).__name__
-            error_msg = str(e)
-            return False, response_time, error_msg, error_type
+        return self._build_test_request(
+            method=method, params=params, data=data, json_data=json_data, headers=headers, **kwargs
+        )(path)
     
-    def _run_concurrent_tests(self, concurrency, duration, paths=None, path_weights=None, **request_kwargs):
+    def _build_test_request(self, method='GET', params=None, data=None, json_data=None, headers=None, **kwargs):
+        """
+        构建测试请求函数：请求方法和固定参数在测试开始前绑定一次，各路径的完整URL只拼接一次，
+        压测循环中每次请求只需传入路径
+        
+        Args:
+            method: 请求方法
+            params: 请求参数
+            data: 请求数据
+            json_data: JSON数据
+            headers: 请求头
+            **kwargs: 其他参数
+            
+        Returns:
+            函数 test_request(path=None) -> (是否成功, 响应时间, 错误信息, 错误类型)
+        """
+        send = functools.partial(
+            self.http_client.send_request,
+            method,
+            params=params,
+            data=data,
+            json_data=json_data,
+            headers=headers,
+            **kwargs
+        )
+        base_url = self.base_url
+        default_path = self.path
+        url_cache = {}  # 路径 -> 完整URL
+        
+        # 使用单调时钟的纳秒整数计时，只在得到结果时换算为毫秒
+        now_ns = time.perf_counter_ns
+        get_cached_url = url_cache.get
+        
+        def test_request(path=None):
+            start_ns = now_ns()
+            try:
+                url = get_cached_url(path)
+                if url is None:
+                    url = url_cache[path] = urljoin(base_url, path or default_path)
+                response = send(url=url)
+                response_time = (now_ns() - start_ns) / 1_000_000  # 转换为毫秒
+                status_code = response.status_code
+                if status_code < 400:
+                    return True, response_time, None, None
+                return False, response_time, f"HTTP错误: {status_code}", f"HTTP_{status_code}"
+            except Exception as e:
+                response_time = (now_ns() - start_ns) / 1_000_000
+                return False, response_time, str(e), type(e).__name__
+        
+        return test_request
+    
+    def _run_concurrent_tests(self, concurrency, duration, paths=None, path_weights=None, use_gevent=False,
+                              **request_kwargs):
         """
         以指定并发数运行测试，支持多路径混合测试
         
@@ -242,6 +324,7 @@ class PerformanceTester:
             duration: 测试持续时间（秒）
             paths: 要测试的路径列表
             path_weights: 路径权重字典，控制各路径的请求比例
+            use_gevent: 是否使用gevent协程代替线程（需先通过_gevent_available检查）
             request_kwargs: 请求参数
             
         Returns:
@@ -253,7 +336,8 @@ class PerformanceTester:
             for path in paths:
                 path_results[path] = []
         
-        stop_time = time.time() + duration
+        # 截止时间使用单调时钟（纳秒整数），不受系统时间调整影响
+        stop_ns = time.perf_counter_ns() + int(duration * 1_000_000_000)
         active_count = threading.Semaphore(concurrency)
         
         # 错误类型统计
@@ -273,16 +357,22 @@ class PerformanceTester:
         else:
             path_selector = lambda: None
         
+        # 请求参数在启动工作线程前绑定一次
+        test_request = self._build_test_request(**request_kwargs)
+        
         def worker():
-            while time.time() < stop_time and not self.stop_event.is_set():
+            # 循环内用到的函数和方法预先绑定到局部变量，减少每次请求的属性查找
+            now_ns = time.perf_counter_ns
+            is_stopped = self.stop_event.is_set
+            add_result = results.append
+            track_paths = bool(paths)
+            while now_ns() < stop_ns and not is_stopped():
                 with active_count:
-                    if self.stop_event.is_set():
+                    if is_stopped():
                         break
                     # 选择当前请求的路径
                     current_path = path_selector()
-                    success, response_time, error, error_type = self._test_request(
-                        path=current_path, **request_kwargs
-                    )
+                    success, response_time, error, error_type = test_request(current_path)
                     
                     result = {
                         'success': success,
@@ -291,27 +381,31 @@ class PerformanceTester:
                         'error_type': error_type,
                         'path': current_path
                     }
-                    results.append(result)
+                    add_result(result)
                     
                     # 按路径统计
-                    if current_path and paths:
+                    if current_path and track_paths:
                         path_results[current_path].append(result)
                     
                     # 统计错误类型
                     if not success and error_type:
                         error_types[error_type] = error_types.get(error_type, 0) + 1
         
-        # 创建线程
-        threads = []
-        for _ in range(concurrency):
-            thread = threading.Thread(target=worker)
-            thread.daemon = True
-            thread.start()
-            threads.append(thread)
-        
-        # 等待所有线程完成
-        for thread in threads:
-            thread.join()
+        if use_gevent:
+            # 每个并发用户一个greenlet，单线程内协作式调度
+            gevent.joinall([gevent.spawn(worker) for _ in range(concurrency)])
+        else:
+            # 创建线程
+            threads = []
+            for _ in range(concurrency):
+                thread = threading.Thread(target=worker)
+                thread.daemon = True
+                thread.start()
+                threads.append(thread)
+            
+            # 等待所有线程完成
+            for thread in threads:
+                thread.join()
         
         # 计算总体结果
         total_requests = len(results)
@@ -375,7 +469,8 @@ class PerformanceTester:
     def find_max_concurrency(self, start_concurrency=1, max_concurrency=100, 
                            step=1, duration=5, error_threshold=0.05, 
                            response_time_threshold=2000, scaling_strategy='linear',
-                           paths=None, path_weights=None, **request_kwargs):
+                           paths=None, path_weights=None, warmup_connections=None, use_gevent=False,
+                           **request_kwargs):
         """
         自动爬坡找最大并发数，支持多种爬坡策略
         
@@ -389,6 +484,9 @@ class PerformanceTester:
             scaling_strategy: 爬坡策略，可选值：'linear'(线性增长), 'exponential'(指数增长), 'binary'(二分查找)
             paths: 要测试的路径列表
             path_weights: 路径权重字典，控制各路径的请求比例
+            warmup_connections: 正式测试前预热的连接数，None表示按最大并发数自动确定，0表示不预热
+            use_gevent: 是否使用gevent协程模拟并发用户（可支持远超线程数量的并发，
+                需在程序入口处最先执行 from gevent import monkey; monkey.patch_all()）
             request_kwargs: 请求参数
             
         Returns:
@@ -397,6 +495,12 @@ class PerformanceTester:
         self.results = []
         self.stop_event.clear()
         best_concurrency = start_concurrency
+        use_gevent = use_gevent and self._gevent_available()
+        
+        # 预先建立连接，避免首轮测试承担TCP/TLS握手开销
+        if warmup_connections is None:
+            warmup_connections = max_concurrency
+        self._warm_up_connections(warmup_connections, paths=paths, headers=request_kwargs.get('headers'))
         
         try:
             # 根据策略生成并发数序列
@@ -427,7 +531,8 @@ class PerformanceTester:
                     
                 logger.info(f"测试并发数: {concurrency}, 策略: {scaling_strategy}")
                 result = self._run_concurrent_tests(
-                    concurrency, duration, paths=paths, path_weights=path_weights, **request_kwargs
+                    concurrency, duration, paths=paths, path_weights=path_weights,
+                    use_gevent=use_gevent, **request_kwargs
                 )
                 self.results.append(result)
                 
@@ -493,6 +598,55 @@ class PerformanceTester:
         finally:
             self.stop_event.set()
     
+    @staticmethod
+    def _gevent_available():
+        """
+        检查是否可以使用gevent协程进行压测
+        
+        monkey.patch_all()必须在导入threading、ssl等模块之前执行，测试过程中再打补丁并不安全，
+        因此这里只检查调用方是否已在程序入口完成了补丁
+        
+        Returns:
+            是否可以使用gevent
+        """
+        if not HAS_GEVENT:
+            logger.warning("gevent未安装，将使用线程进行并发测试，请执行: pip install gevent")
+            return False
+        if not gevent_monkey.is_module_patched('socket'):
+            logger.warning("socket未被gevent打补丁，将使用线程进行并发测试；"
+                           "请在程序入口处最先执行 from gevent import monkey; monkey.patch_all()")
+            return False
+        return True
+    
+    def _warm_up_connections(self, connections, paths=None, headers=None):
+        """
+        预热连接池：并发发送HEAD请求，让会话的连接池中保持足够的空闲长连接
+        
+        Args:
+            connections: 预热的连接数（超过连接池容量的部分无法保持，会被截断）
+            paths: 测试路径列表，预热请求在各路径间轮流发送
+            headers: 请求头
+        """
+        connections = min(connections, max(self.http_client.max_workers, _POOL_MAXSIZE))
+        if connections <= 0:
+            return
+        
+        urls = [urljoin(self.base_url, path) for path in (paths or [self.path])]
+        send_request = self.http_client.send_request
+        
+        def _warm_up(i):
+            try:
+                send_request('HEAD', urls[i % len(urls)], headers=headers, retry_enabled=False)
+            except Exception as e:
+                logger.debug(f"连接预热请求失败: {str(e)}")
+        
+        logger.info(f"预热连接池，连接数: {connections}")
+        start_time = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=connections) as executor:
+            # 等待全部预热请求完成
+            list(executor.map(_warm_up, range(connections)))
+        logger.info(f"连接池预热完成，耗时: {(time.perf_counter() - start_time) * 1000:.2f}ms")
+    
     def _generate_binary_search_sequence(self, start, end):
         """
         生成二分查找序列
@@ -569,7 +723,7 @@ class PerformanceTester:
     def find_max_tps(self, start_tps=1, max_tps=100, step=1, 
                     duration=5, error_threshold=0.05,
                     response_time_threshold=2000, scaling_strategy='linear',
-                    paths=None, path_weights=None, **request_kwargs):
+                    paths=None, path_weights=None, warmup_connections=None, **request_kwargs):
         """
         自动爬坡找最大TPS，支持多种爬坡策略和多路径测试
         
@@ -583,6 +737,7 @@ class PerformanceTester:
             scaling_strategy: 爬坡策略，可选值：'linear'(线性增长), 'exponential'(指数增长), 'binary'(二分查找)
             paths: 要测试的路径列表
             path_weights: 路径权重字典，控制各路径的请求比例
+            warmup_connections: 正式测试前预热的连接数，None表示按最大TPS对应的并发数自动确定，0表示不预热
             request_kwargs: 请求参数
             
         Returns:
@@ -591,6 +746,11 @@ class PerformanceTester:
         self.results = []
         self.stop_event.clear()
         best_tps = start_tps
+        
+        # 预先建立连接，避免首轮测试承担TCP/TLS握手开销
+        if warmup_connections is None:
+            warmup_connections = max(max_tps * 2, 10)
+        self._warm_up_connections(warmup_connections, paths=paths, headers=request_kwargs.get('headers'))
         original_rate_limiter = None
         
         try:
@@ -709,6 +869,73 @@ class PerformanceTester:
         if not self.results:
             return "暂无测试数据"
             
+        report_data = self._build_report_data(include_chart_data)
+        
+        # 生成指定格式的报告
+        if format == 'json':
+            report_content = json.dumps(report_data, indent=2, ensure_ascii=False)
+        elif format == 'text':
+            report_content = self._generate_text_report(report_data)
+        elif format == 'html':
+            report_content = self._generate_html_report(report_data)
+        else:
+            raise ValueError(f"不支持的报告格式: {format}")
+        
+        # 保存到文件
+        if save_to_file:
+            try:
+                with open(save_to_file, 'w', encoding='utf-8', buffering=_REPORT_WRITE_BUFFER_SIZE) as f:
+                    f.write(report_content)
+                logger.info(f"报告已保存到: {save_to_file}")
+            except Exception as e:
+                logger.error(f"保存报告失败: {str(e)}")
+        
+        return report_content
+    
+    def save_report(self, file_path, format='html', include_chart_data=False):
+        """
+        将测试报告直接流式写入文件，不在内存中构建完整的报告字符串，适合结果很多的大报告
+        
+        Args:
+            file_path: 报告文件路径
+            format: 报告格式，支持'json', 'text', 'html'
+            include_chart_data: 是否包含图表数据
+            
+        Returns:
+            是否保存成功
+        """
+        if not self.results:
+            logger.warning("暂无测试数据")
+            return False
+        
+        writers = {
+            'json': lambda data, f: json.dump(data, f, indent=2, ensure_ascii=False),
+            'text': self._write_text_report,
+            'html': self._write_html_report
+        }
+        if format not in writers:
+            raise ValueError(f"不支持的报告格式: {format}")
+        
+        report_data = self._build_report_data(include_chart_data)
+        try:
+            with open(file_path, 'w', encoding='utf-8', buffering=_REPORT_WRITE_BUFFER_SIZE) as f:
+                writers[format](report_data, f)
+            logger.info(f"报告已保存到: {file_path}")
+            return True
+        except Exception as e:
+            logger.error(f"保存报告失败: {str(e)}")
+            return False
+    
+    def _build_report_data(self, include_chart_data=False):
+        """
+        构建报告数据字典
+        
+        Args:
+            include_chart_data: 是否包含图表数据
+            
+        Returns:
+            报告数据字典
+        """
         # 准备基础报告数据
         report_data = {
             'test_id': self.current_test_id,
@@ -748,26 +975,7 @@ class PerformanceTester:
             chart_data = self._prepare_chart_data()
             report_data['chart_data'] = chart_data
         
-        # 生成指定格式的报告
-        if format == 'json':
-            report_content = json.dumps(report_data, indent=2, ensure_ascii=False)
-        elif format == 'text':
-            report_content = self._generate_text_report(report_data)
-        elif format == 'html':
-            report_content = self._generate_html_report(report_data)
-        else:
-            raise ValueError(f"不支持的报告格式: {format}")
-        
-        # 保存到文件
-        if save_to_file:
-            try:
-                with open(save_to_file, 'w', encoding='utf-8') as f:
-                    f.write(report_content)
-                logger.info(f"报告已保存到: {save_to_file}")
-            except Exception as e:
-                logger.error(f"保存报告失败: {str(e)}")
-        
-        return report_content
+        return report_data
     
     def _prepare_chart_data(self):
         """
@@ -828,66 +1036,17 @@ class PerformanceTester:
         Returns:
             文本报告
         """
-        lines = []
-        lines.append("=" * 60)
-        lines.append("          性能测试报告          ")
-        lines.append("=" * 60)
-        lines.append(f"测试ID: {report_data.get('test_id', 'N/A')}")
-        lines.append(f"生成时间: {report_data.get('generated_at', 'N/A')}")
-        lines.append(f"总运行次数: {report_data.get('total_runs', 0)}")
-        lines.append("-" * 60)
-        
-        # 总体统计
-        lines.append("【总体统计】")
-        lines.append(f"总请求数: {report_data.get('total_requests', 0)}")
-        lines.append(f"成功请求: {report_data.get('total_success', 0)}")
-        lines.append(f"失败请求: {report_data.get('total_errors', 0)}")
-        lines.append(f"总体错误率: {report_data.get('overall_error_rate', 0):.2%}")
-        lines.append(f"平均响应时间: {report_data.get('overall_avg_response_time', 0):.2f}ms")
-        lines.append("-" * 60)
-        
-        # 详细结果
-        lines.append("【详细测试结果】")
-        for i, result in enumerate(report_data['results'], 1):
-            lines.append(f"测试 #{i}")
-            lines.append(f"  并发数: {result.get('concurrency', 'N/A')}")
-            lines.append(f"  持续时间: {result.get('duration', 'N/A')}秒")
-            lines.append(f"  请求总数: {result.get('total_requests', 0)}")
-            lines.append(f"  成功数: {result.get('success_count', 0)}")
-            lines.append(f"  错误数: {result.get('error_count', 0)}")
-            lines.append(f"  错误率: {result.get('error_rate', 0):.2%}")
-            lines.append(f"  平均响应时间: {result.get('avg_response_time', 0):.2f}ms")
-            lines.append(f"  P90响应时间: {result.get('p90_response_time', 0):.2f}ms")
-            lines.append(f"  P95响应时间: {result.get('p95_response_time', 0):.2f}ms")
-            lines.append(f"  P99响应时间: {result.get('p99_response_time', 0):.2f}ms")
-            lines.append(f"  TPS: {result.get('tps', 0):.2f}")
-            
-            # 错误类型统计
-            if result.get('error_types'):
-                lines.append("  错误类型分布:")
-                for error_type, count in result['error_types'].items():
-                    lines.append(f"    {error_type}: {count}")
-            
-            # 路径统计
-            if result.get('path_stats'):
-                lines.append("  路径统计:")
-                for path, stats in result['path_stats'].items():
-                    lines.append(f"    路径 {path}:")
-                    lines.append(f"      请求数: {stats.get('total_requests', 0)}")
-                    lines.append(f"      平均响应时间: {stats.get('avg_response_time', 0):.2f}ms")
-            
-            lines.append("")
-        
-        # 错误总结
-        if report_data.get('error_summary'):
-            lines.append("【错误类型总结】")
-            for error_type, count in report_data['error_summary'].items():
-                lines.append(f"  {error_type}: {count}")
-            lines.append("")
-        
-        lines.append("=" * 60)
+        return generate_text_report(report_data)
+    
+    def _write_text_report(self, report_data, f):
+        """
+        将文本格式的报告逐行写入文件对象，避免拼接出完整的大字符串
         
-        return '\n'.join(lines)
+        Args:
+            report_data: 报告数据字典
+            f: 可写的文本文件对象
+        """
+        write_text_report(report_data, f)
     
     def _generate_html_report(self, report_data):
         """
@@ -899,115 +1058,17 @@ class PerformanceTester:
         Returns:
             HTML报告
         """
-        html_parts = [
-            "<!DOCTYPE html>",
-            "<html lang='zh-CN'>",
-            "<head>",
-            "<meta charset='UTF-8'>",
-            "<meta name='viewport' content='width=device-width, initial-scale=1.0'>",
-            "<title>性能测试报告</title>",
-            "<style>",
-            "  body { font-family: Arial, sans-serif; margin: 20px; }",
-            "  h1, h2, h3 { color: #2c3e50; }",
-            "  .header { background-color: #f8f9fa; padding: 15px; border-radius: 5px; margin-bottom: 20px; }",
-            "  .summary { background-color: #e9ecef; padding: 15px; border-radius: 5px; margin-bottom: 20px; }",
-            "  .details { margin-bottom: 20px; }",
-            "  .result-card { border: 1px solid #ddd; border-radius: 5px; padding: 15px; margin-bottom: 15px; }",
-            "  .error-type { background-color: #f8d7da; padding: 10px; border-radius: 3px; }",
-            "  .path-stats { background-color: #e3f2fd; padding: 10px; border-radius: 3px; }",
-            "  table { border-collapse: collapse; width: 100%; margin-top: 10px; }",
-            "  th, td { text-align: left; padding: 8px; border-bottom: 1px solid #ddd; }",
-            "  th { background-color: #f2f2f2; }",
-            "  tr:hover { background-color: #f5f5f5; }",
-            "</style>",
-            "</head>",
-            "<body>",
-            "<h1>性能测试报告</h1>",
-        ]
-        
-        # 头部信息
-        html_parts.append("<div class='header'>")
-        html_parts.append(f"<p><strong>测试ID:</strong> {report_data.get('test_id', 'N/A')}</p>")
-        html_parts.append(f"<p><strong>生成时间:</strong> {report_data.get('generated_at', 'N/A')}</p>")
-        html_parts.append(f"<p><strong>总运行次数:</strong> {report_data.get('total_runs', 0)}</p>")
-        html_parts.append("</div>")
-        
-        # 总体统计
-        html_parts.append("<div class='summary'>")
-        html_parts.append("<h2>总体统计</h2>")
-        html_parts.append("<table>")
-        html_parts.append("<tr><th>指标</th><th>值</th></tr>")
-        html_parts.append(f"<tr><td>总请求数</td><td>{report_data.get('total_requests', 0)}</td></tr>")
-        html_parts.append(f"<tr><td>成功请求</td><td>{report_data.get('total_success', 0)}</td></tr>")
-        html_parts.append(f"<tr><td>失败请求</td><td>{report_data.get('total_errors', 0)}</td></tr>")
-        html_parts.append(f"<tr><td>总体错误率</td><td>{report_data.get('overall_error_rate', 0):.2%}</td></tr>")
-        html_parts.append(f"<tr><td>平均响应时间</td><td>{report_data.get('overall_avg_response_time', 0):.2f}ms</td></tr>")
-        html_parts.append("</table>")
-        html_parts.append("</div>")
-        
-        # 详细结果
-        html_parts.append("<div class='details'>")
-        html_parts.append("<h2>详细测试结果</h2>")
-        
-        for i, result in enumerate(report_data['results'], 1):
-            html_parts.append(f"<div class='result-card'>")
-            html_parts.append(f"<h3>测试 #{i}</h3>")
-            html_parts.append("<table>")
-            html_parts.append("<tr><th>指标</th><th>值</th></tr>")
-            html_parts.append(f"<tr><td>并发数</td><td>{result.get('concurrency', 'N/A')}</td></tr>")
-            html_parts.append(f"<tr><td>持续时间</td><td>{result.get('duration', 'N/A')}秒</td></tr>")
-            html_parts.append(f"<tr><td>请求总数</td><td>{result.get('total_requests', 0)}</td></tr>")
-            html_parts.append(f"<tr><td>成功数</td><td>{result.get('success_count', 0)}</td></tr>")
-            html_parts.append(f"<tr><td>错误数</td><td>{result.get('error_count', 0)}</td></tr>")
-            html_parts.append(f"<tr><td>错误率</td><td>{result.get('error_rate', 0):.2%}</td></tr>")
-            html_parts.append(f"<tr><td>平均响应时间</td><td>{result.get('avg_response_time', 0):.2f}ms</td></tr>")
-            html_parts.append(f"<tr><td>P90响应时间</td><td>{result.get('p90_response_time', 0):.2f}ms</td></tr>")
-            html_parts.append(f"<tr><td>P95响应时间</td><td>{result.get('p95_response_time', 0):.2f}ms</td></tr>")
-            html_parts.append(f"<tr><td>P99响应时间</td><td>{result.get('p99_response_time', 0):.2f}ms</td></tr>")
-            html_parts.append(f"<tr><td>TPS</td><td>{result.get('tps', 0):.2f}</td></tr>")
-            html_parts.append("</table>")
-            
-            # 错误类型统计
-            if result.get('error_types'):
-                html_parts.append("<h4>错误类型分布</h4>")
-                html_parts.append("<div class='error-type'>")
-                html_parts.append("<table>")
-                html_parts.append("<tr><th>错误类型</th><th>次数</th></tr>")
-                for error_type, count in result['error_types'].items():
-                    html_parts.append(f"<tr><td>{error_type}</td><td>{count}</td></tr>")
-                html_parts.append("</table>")
-                html_parts.append("</div>")
-            
-            # 路径统计
-            if result.get('path_stats'):
-                html_parts.append("<h4>路径统计</h4>")
-                html_parts.append("<div class='path-stats'>")
-                html_parts.append("<table>")
-                html_parts.append("<tr><th>路径</th><th>请求数</th><th>平均响应时间</th></tr>")
-                for path, stats in result['path_stats'].items():
-                    html_parts.append(f"<tr><td>{path}</td><td>{stats.get('total_requests', 0)}</td><td>{stats.get('avg_response_time', 0):.2f}ms</td></tr>")
-                html_parts.append("</table>")
-                html_parts.append("</div>")
-            
-            html_parts.append("</div>")
-        
-        html_parts.append("</div>")
-        
-        # 错误总结
-        if report_data.get('error_summary'):
-            html_parts.append("<div class='summary'>")
-            html_parts.append("<h2>错误类型总结</h2>")
-            html_parts.append("<table>")
-            html_parts.append("<tr><th>错误类型</th><th>总次数</th></tr>")
-            for error_type, count in report_data['error_summary'].items():
-                html_parts.append(f"<tr><td>{error_type}</td><td>{count}</td></tr>")
-            html_parts.append("</table>")
-            html_parts.append("</div>")
-        
-        html_parts.append("</body>")
-        html_parts.append("</html>")
+        return generate_html_report(report_data)
+    
+    def _write_html_report(self, report_data, f):
+        """
+        将HTML格式的报告逐行写入文件对象，避免拼接出完整的大字符串
         
-        return '\n'.join(html_parts)
+        Args:
+            report_data: 报告数据字典
+            f: 可写的文本文件对象
+        """
+        write_html_report(report_data, f)
     
     def stop_test(self):
         """
@@ -1069,16 +1130,377 @@ class PerformanceTester:
             self.stop_event.set()
 
 
+# 状态码动作表的标志位：按HTTP状态码直接索引，避免逐次做集合/区间判断
+_CODE_RETRY = 1
+_CODE_SUCCESS = 2
+_CODE_SERVER_ERROR = 4
+_CODE_TABLE_SIZE = 600
+
+
+def _build_code_action_table(retry_status_codes) -> bytearray:
+    """
+    构建状态码动作表
+    
+    Args:
+        retry_status_codes: 需要重试的HTTP状态码集合
+        
+    Returns:
+        长度为600的bytearray，下标为状态码，值为动作标志位的组合
+    """
+    retry_codes = set(retry_status_codes)
+    table = bytearray(_CODE_TABLE_SIZE)
+    for code in range(_CODE_TABLE_SIZE):
+        action = 0
+        if code in retry_codes:
+            action |= _CODE_RETRY
+        if 200 <= code < 400:
+            action |= _CODE_SUCCESS
+        elif code >= 500:
+            action |= _CODE_SERVER_ERROR
+        table[code] = action
+    return table
+
+
 # 导入RequestManager以进行包装
 # 不需要导入，因为HttpClient类将直接实现相关功能
 
 
+# 动态参数模式 ${expr} 及其中的函数调用形式 func(arg1, arg2)
+_DYNAMIC_PARAM_RE = re.compile(r'\$\{(.+?)\}')
+_FUNC_CALL_RE = re.compile(r'([a-zA-Z_]\w*)\((.*)\)')
+
+
+# 时间快照 (epoch秒, timestamp, date, datetime)，同一秒内复用格式化好的字符串
+_time_snapshot: Tuple[int, str, str, str] = (-1, '', '', '')
+
+
+def _get_time_snapshot() -> Tuple[int, str, str, str]:
+    """
+    获取当前秒的时间快照，每秒只调用一次strftime
+    
+    Returns:
+        (epoch秒, timestamp字符串, 日期字符串, 日期时间字符串)
+    """
+    global _time_snapshot
+    now = int(time.time())
+    snapshot = _time_snapshot
+    if snapshot[0] != now:
+        local_now = time.localtime(now)
+        snapshot = (
+            now,
+            str(now),
+            time.strftime('%Y-%m-%d', local_now),
+            time.strftime('%Y-%m-%d %H:%M:%S', local_now)
+        )
+        # 整体替换元组，多线程下读到的始终是完整快照
+        _time_snapshot = snapshot
+    return snapshot
+
+
+# 与实例无关的默认动态参数处理函数
+_DEFAULT_DYNAMIC_FUNCS: Dict[str, Callable] = {
+    'random_num': lambda: str(random.randint(1000, 9999)),
+}
+
+# 时间类动态参数 -> 时间快照中的下标；同一次_process_dynamic_params只取一次快照，
+# 保证一个请求内所有时间参数一致（自定义函数同名时以自定义函数为准）
+_TIME_SNAPSHOT_FIELDS: Dict[str, int] = {
+    'timestamp': 1,
+    'date': 2,
+    'datetime': 3
+}
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_dynamic_template(pattern: Pattern, text: str) -> Tuple[Union[str, Tuple[str, str, Tuple[str, ...]]], ...]:
+    """
+    将含动态参数的字符串解析为片段序列，结果按(模式, 字符串)缓存
+    
+    只缓存解析结果（字面量和函数名/参数），函数本身在每次替换时调用，
+    因此timestamp、random_*等非确定性函数不受缓存影响
+    
+    Args:
+        pattern: 动态参数匹配模式
+        text: 原始字符串
+        
+    Returns:
+        片段元组，元素为字面量字符串或 (表达式, 函数名, 参数元组)
+    """
+    segments = []
+    pos = 0
+    for match in pattern.finditer(text):
+        if match.start() > pos:
+            segments.append(text[pos:match.start()])
+        pos = match.end()
+        expr = match.group(1).strip()
+        # 检查是否是函数调用形式: func() 或 func(arg1, arg2)，否则视为简单的变量名
+        func_match = _FUNC_CALL_RE.match(expr)
+        if func_match:
+            func_name, args_str = func_match.groups()
+            args = tuple(arg.strip() for arg in args_str.split(',')) if args_str.strip() else ()
+        else:
+            func_name, args = expr, ()
+        segments.append((expr, func_name, args))
+    if pos < len(text):
+        segments.append(text[pos:])
+    return tuple(segments)
+
+
+# 认证头只取决于策略和配置（与请求体、时间戳、nonce无关）的认证策略
+_CACHEABLE_AUTH_STRATEGIES = frozenset({'none', 'basic', 'token'})
+_AUTH_HEADERS_CACHE_SIZE = 256
+
+# 按IP改写URL的结果缓存上限
+_URL_REWRITE_CACHE_SIZE = 4096
+
+# 上传文件MD5的缓存上限
+_FILE_MD5_CACHE_SIZE = 256
+
+# 上传文件内容的缓存上限（文件数），以及可缓存的单个文件大小上限（字节）
+_UPLOAD_CACHE_SIZE = 64
+_UPLOAD_CACHE_MAX_FILE_SIZE = 8 << 20
+
+# 会话连接池配置：缓存的主机连接池数量，以及每个主机保持的最大连接数
+_POOL_CONNECTIONS = 32
+_POOL_MAXSIZE = 128
+
+
+def _auth_config_key(strategy: str, config: Dict[str, Any]) -> Optional[Tuple]:
+    """
+    生成 (认证策略, 认证配置) 的哈希键，用于复用认证管理器
+    
+    Args:
+        strategy: 认证策略名称
+        config: 认证配置
+        
+    Returns:
+        哈希键，配置中包含不可哈希的值时返回None
+    """
+    try:
+        items = tuple(sorted(config.items()))
+        hash(items)
+    except TypeError:
+        return None
+    return strategy, items
+
+
+def _auth_headers_cache_key(strategy: str, config: Dict[str, Any]) -> Optional[Tuple]:
+    """
+    生成认证头缓存键
+    
+    HMAC等包含时间戳/nonce/请求体签名的策略不可缓存；
+    配置中包含可调用对象（动态token等）或不可哈希的值时也不缓存
+    
+    Args:
+        strategy: 认证策略名称
+        config: 认证配置
+        
+    Returns:
+        缓存键，不可缓存时返回None
+    """
+    if strategy not in _CACHEABLE_AUTH_STRATEGIES:
+        return None
+    key = _auth_config_key(strategy, config)
+    if key is None or any(callable(value) for _, value in key[1]):
+        return None
+    return key
+
+
+def _has_non_finite_float(obj: Any) -> bool:
+    """
+    检查对象中是否含有NaN或正负无穷大的浮点数
+    
+    Args:
+        obj: 待检查的对象（递归检查字典的值和列表、元组的元素）
+        
+    Returns:
+        是否含有非有限浮点数
+    """
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(_has_non_finite_float(value) for value in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(_has_non_finite_float(item) for item in obj)
+    return False
+
+
+def _dump_json_body(obj: Any) -> bytes:
+    """
+    将对象序列化为UTF-8编码的JSON请求体
+    
+    优先使用orjson；orjson不支持的类型（如非字符串键）回退到标准库。
+    与requests一致，NaN和正负无穷大不是合法的JSON，会抛出ValueError
+    
+    Args:
+        obj: 待序列化的对象
+        
+    Returns:
+        JSON字节串
+    """
+    if orjson is not None:
+        try:
+            body = orjson.dumps(obj)
+        except TypeError:
+            pass
+        else:
+            # orjson把NaN和无穷大输出为null，只有输出中出现null时才需要检查
+            if b'null' in body and _has_non_finite_float(obj):
+                raise ValueError("Out of range float values are not JSON compliant")
+            return body
+    return json.dumps(obj, allow_nan=False).encode('utf-8')
+
+
+@functools.lru_cache(maxsize=16)
+def _normalize_method(method: str) -> str:
+    """
+    规范化请求方法名（结果缓存，压测中同一方法反复出现时直接命中）
+    
+    Args:
+        method: 请求方法
+        
+    Returns:
+        大写的请求方法
+    """
+    return method.upper()
+
+
+@functools.lru_cache(maxsize=64)
+def _is_json_content_type(content_type: str) -> bool:
+    """
+    判断Content-Type是否为JSON（结果缓存）
+    
+    Args:
+        content_type: Content-Type请求头的值
+        
+    Returns:
+        是否为application/json
+    """
+    return content_type.startswith('application/json')
+
+
+def _encode_json_kwargs(request_kwargs: Dict[str, Any]) -> None:
+    """
+    将请求参数中的json请求体预先序列化为data（原地修改）
+    
+    requests内部使用标准库json.dumps序列化json参数，这里改用_dump_json_body，
+    并在调用方未指定时补充Content-Type；同时给出data时requests本就忽略json，保持不变
+    
+    Args:
+        request_kwargs: 传给Session.request的参数字典
+        
+    Raises:
+        requests.exceptions.InvalidJSONError: 请求体无法序列化为合法的JSON（如包含NaN），与requests的行为一致
+    """
+    if request_kwargs.get('json') is None or request_kwargs.get('data'):
+        return
+    try:
+        body = _dump_json_body(request_kwargs['json'])
+    except ValueError as e:
+        raise requests.exceptions.InvalidJSONError(e)
+    del request_kwargs['json']
+    request_kwargs['data'] = body
+    headers = request_kwargs.get('headers') or {}
+    if not any(key.lower() == 'content-type' for key in headers):
+        request_kwargs['headers'] = {**headers, 'Content-Type': 'application/json'}
+
+
+def _is_aiohttp_compatible_fields(fields: Any) -> bool:
+    """
+    判断params或data能否由aiohttp按与requests相同的方式编码
+    
+    requests会丢弃值为None的字段、把布尔值转成'True'/'False'并展开列表值，aiohttp遇到这些值会抛出TypeError，
+    因此只接受字符串、bytes和值全为字符串或数字的字典
+    
+    Args:
+        fields: params或data
+        
+    Returns:
+        是否可以交给aiohttp编码
+    """
+    if fields is None or isinstance(fields, (str, bytes)):
+        return True
+    if not isinstance(fields, _MappingABC):
+        return False
+    return all(isinstance(value, (str, int, float)) and not isinstance(value, bool) for value in fields.values())
+
+
+def _release_client_resources(sessions, executors) -> None:
+    """
+    释放HttpClient持有的会话和线程池（由weakref.finalize在客户端被回收时调用）
+    
+    Args:
+        sessions: 需要关闭的会话
+        executors: 需要停止的线程池，不等待正在执行的任务
+    """
+    for session in sessions:
+        session.close()
+    for executor in executors:
+        executor.shutdown(wait=False)
+
+
+@functools.lru_cache(maxsize=256)
+def _is_ip_address(host: str) -> bool:
+    """
+    判断主机名是否为IP地址
+    
+    Args:
+        host: 主机名（IPv6地址可带方括号）
+        
+    Returns:
+        是否为IP地址
+    """
+    try:
+        ipaddress.ip_address(host.strip('[]'))
+        return True
+    except ValueError:
+        return False
+
+
+class IPRotationAdapter(HTTPAdapter):
+    """
+    支持按IP轮询的连接池适配器
+    
+    请求URL的主机被改写为IP后（见HttpClient._prepare_request_with_ip），urllib3按IP缓存连接池并保持长连接；
+    对HTTPS请求，按请求头中的原始Host设置SNI和证书主机名校验，否则直连IP会因证书不匹配而失败
+    """
+    
+    def build_connection_pool_key_attributes(self, request, verify, cert=None):
+        host_params, pool_kwargs = super().build_connection_pool_key_attributes(request, verify, cert)
+        host = request.headers.get('Host')
+        if host and host_params['scheme'] == 'https' and _is_ip_address(host_params['host']):
+            hostname = urlparse(f"//{host}").hostname
+            if hostname and not _is_ip_address(hostname):
+                pool_kwargs['server_hostname'] = hostname
+                pool_kwargs['assert_hostname'] = hostname
+        return host_params, pool_kwargs
+    
+    def resize_pool_cache(self, num_pools: int) -> None:
+        """
+        扩大缓存的主机连接池数量（IP数量超过缓存上限时，最久未用的连接池会被淘汰并重新建连）
+        
+        Args:
+            num_pools: 需要同时保持的连接池数量
+        """
+        if num_pools <= self._pool_connections:
+            return
+        old_manager = self.poolmanager
+        self.init_poolmanager(num_pools, self._pool_maxsize, block=self._pool_block)
+        old_manager.clear()
+
+
 class HttpClient:
     """
     HTTP客户端工具类，作为RequestManager的高级包装器
     提供统一的HTTP请求接口，支持同步/异步请求、批量操作、多IP等高级功能
     """
     
+    # 性能测试类型 -> 对应的PerformanceTester方法，新增测试类型时在此注册
+    _PERFORMANCE_TESTS: Dict[str, Callable] = {
+        'concurrency': PerformanceTester.find_max_concurrency,
+        'tps': PerformanceTester.find_max_tps,
+    }
+    
     def __init__(self, 
                  base_url: str = None, 
                  timeout: int = 30, 
@@ -1092,7 +1514,9 @@ class HttpClient:
                  rate_limit: Optional[float] = None,
                  rate_limit_period: float = 1.0,
                  random_generator: RandomContentGenerator = None,
-                 logger=None):
+                 logger=None,
+                 async_mode: bool = False,
+                 ip_list: Optional[List[str]] = None):
         """
         初始化HTTP客户端
         
@@ -1109,54 +1533,134 @@ class HttpClient:
             rate_limit: 每秒最大请求数（None表示不限制）
             rate_limit_period: 速率限制的时间窗口（秒）
             random_generator: 随机内容生成器实例
+            async_mode: 并行批量请求是否使用aiohttp+asyncio.gather代替线程池（需要安装aiohttp；
+                启用重试、速率限制、代理或IP轮询时仍使用线程池）
+            ip_list: 轮询使用的IP地址列表
         """
         self.base_url = base_url
         self.timeout = timeout
         self.retry_count = retry_count
         self.retry_backoff_factor = retry_backoff_factor
+        self._backoff_table = self._build_backoff_table()
         self.random_generator = random_generator or default_random_generator
         
         # 初始化日志记录器，如果未提供则使用默认logger
         self.logger = logger or logging.getLogger(__name__)
         
         # 动态参数替换模式
-        self.dynamic_param_pattern: Pattern = re.compile(r'\$\{(.+?)\}')
+        self.dynamic_param_pattern: Pattern = _DYNAMIC_PARAM_RE
+        
+        # 默认动态参数处理函数：模块级的无状态函数 + 依赖实例随机生成器的random_str，只构建一次
+        self._default_param_funcs: Mapping[str, Callable] = ChainMap(
+            {'random_str': lambda: self.random_generator.random_string()},
+            _DEFAULT_DYNAMIC_FUNCS
+        )
         
         # 初始化IP选择相关属性
         self._ip_lock = threading.Lock()
         self._current_ip_index = 0
-        self.ip_list = []
+        self.ip_list = list(ip_list) if ip_list else []
+        self._host_headers: Dict[str, str] = {}  # IP改写后的URL -> 原始Host
+        self._url_rewrite_cache: Dict[Tuple[str, str], Tuple[str, str]] = {}  # (URL, IP) -> (改写后的URL, 原始Host)
+        self._file_md5_cache: Dict[Tuple[str, int, int], str] = {}  # (真实路径, mtime_ns, 大小) -> MD5
+        self._upload_contents: Dict[str, Tuple[Tuple[int, int], bytes]] = {}  # 真实路径 -> ((mtime_ns, 大小), 文件内容)
+        self._upload_md5s: Dict[int, Tuple[bytes, str]] = {}  # id(缓存的文件内容) -> (文件内容, MD5)
+        self._upload_lock = threading.Lock()
         
         # 初始化认证配置存储
         self.auth_strategy = None
         self.auth_config = {}
         self.ip_auth_configs = {}
         self.path_auth_configs = {}
-        self.ip_path_auth_configs = {}
+        self.ip_path_auth_configs: Dict[str, Dict[str, Dict[str, Any]]] = defaultdict(dict)  # {ip: {path_pattern: config_info}}
         self.auth_manager = None  # 初始化auth_manager属性
+        self._auth_headers_cache: Dict[Tuple, Dict[str, str]] = {}  # 可缓存策略的认证头
+        self._auth_managers: Dict[Tuple, AuthManager] = {}  # (认证策略, 认证配置) -> 认证管理器
         
         # 配置重试和代理设置
         self.retry_enabled = retry_enabled
         self.retry_status_forcelist = tuple(retry_status_codes) if retry_status_codes else (429, 500, 502, 503, 504)
         self.retry_methods = tuple(retry_methods) if retry_methods else ("GET", "POST", "PUT", "DELETE", "PATCH")
+        self._code_action = _build_code_action_table(self.retry_status_forcelist)
         self.proxy_pool = proxy_pool
         self.verify_ssl = True  # 默认验证SSL
+        # send_request中需要重试的异常类型
+        self.retry_exceptions = (
+            requests.exceptions.ConnectionError,
+            requests.exceptions.Timeout,
+            requests.exceptions.ChunkedEncodingError
+        )
+        # 文件上传请求的响应分块大小（字节），大于0时上传请求以流式方式读取响应，0表示不启用
+        self.file_upload_chunk_size = 0
         
         # 初始化并发控制组件
         self.concurrency_manager = ConcurrencyManager()
         self.max_workers = max_workers
+        if async_mode and not HAS_AIOHTTP:
+            self.logger.warning("aiohttp未安装，async_mode不可用，并行批量请求将使用线程池")
+        self.async_mode = async_mode and HAS_AIOHTTP
         
         # 初始化速率限制器
         self.rate_limiter = None
         if rate_limit is not None:
-            self.rate_limiter = RateLimiter(rate=rate_limit, period=rate_limit_period)
+            self.rate_limiter = RateLimiter(rate=rate_limit, time_unit=rate_limit_period)
         
         # 初始化线程池执行器
         self.executor = None
         if max_workers > 1:
             self.executor = ThreadPoolExecutor(max_workers=max_workers)
         
-        # 已在文件顶部导入AuthManager和default_auth_manager
+        # 初始化HTTP会话，复用连接池
+        # session: send_request使用，重试逻辑由send_request自行控制
+        # _session: request使用，重试交给urllib3在适配器层完成
+        self.session = self._create_session(max_retries=0)
+        self._session = self._create_session(max_retries=self._build_retry())
+        
+        # 客户端被回收但未调用close()时，兜底关闭会话和线程池
+        # 使用weakref.finalize而不是__del__，不影响循环垃圾回收，也不会在回收时阻塞等待线程
+        self._owned_executors: List[ThreadPoolExecutor] = [self.executor] if self.executor else []
+        self._finalizer = weakref.finalize(
+            self, _release_client_resources, (self.session, self._session), self._owned_executors
+        )
+        
+    
+    def _build_retry(self) -> Retry:
+        """
+        根据实例的重试配置构建urllib3的Retry对象
+        
+        Returns:
+            Retry实例
+        """
+        if not self.retry_enabled:
+            return Retry(total=0, raise_on_status=False)
+        return Retry(
+            total=self.retry_count,
+            backoff_factor=self.retry_backoff_factor,
+            status_forcelist=self.retry_status_forcelist,
+            allowed_methods=frozenset(self.retry_methods),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+    
+    def _create_session(self, max_retries) -> requests.Session:
+        """
+        创建挂载了连接池适配器的会话
+        
+        Args:
+            max_retries: 传给HTTPAdapter的重试配置（整数或Retry对象）
+            
+        Returns:
+            requests.Session实例
+        """
+        session = requests.Session()
+        adapter = IPRotationAdapter(
+            pool_connections=max(_POOL_CONNECTIONS, len(self.ip_list)),
+            pool_maxsize=max(self.max_workers, _POOL_MAXSIZE),
+            max_retries=max_retries
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
     
     def _prepare_url(self, url: str) -> str:
         """
@@ -1179,6 +1683,44 @@ class HttpClient:
         # 否则直接返回
         return url
     
+    def _build_backoff_table(self) -> List[float]:
+        """
+        预先计算各次重试的指数退避基础延迟
+        
+        Returns:
+            延迟列表，第i项为第i+1次重试的基础延迟（秒）
+        """
+        return [self.retry_backoff_factor * (1 << i) for i in range(max(self.retry_count, 0) + 1)]
+    
+    def _get_backoff_delay(self, attempt: int) -> float:
+        """
+        获取第attempt次重试的基础退避延迟（查表，超出预计算范围时现算）
+        
+        Args:
+            attempt: 重试次数（从1开始）
+            
+        Returns:
+            基础延迟（秒）
+        """
+        table = self._backoff_table
+        if attempt <= len(table):
+            return table[attempt - 1]
+        return self.retry_backoff_factor * (1 << (attempt - 1))
+    
+    def _should_retry_status(self, status_code: int) -> bool:
+        """
+        判断状态码是否需要重试（查表实现）
+        
+        Args:
+            status_code: HTTP状态码
+            
+        Returns:
+            是否需要重试
+        """
+        if 0 <= status_code < _CODE_TABLE_SIZE:
+            return bool(self._code_action[status_code] & _CODE_RETRY)
+        return status_code in self.retry_status_forcelist
+    
     def set_auth_manager(self, auth_manager):
         """
         设置认证管理器
@@ -1200,70 +1742,37 @@ class HttpClient:
         Returns:
             请求响应字典
         """
-        import requests
-        
         # 准备URL
         full_url = self._prepare_url(url)
         
         # 记录请求日志
         self._log_request(method, full_url, **kwargs)
         
-        # 设置超时
-        kwargs.setdefault('timeout', self.timeout)
-        
-        # 设置代理
-        if self.proxy_pool:
-            kwargs.setdefault('proxies', self.proxy_pool)
-        
-        # 设置SSL验证
-        kwargs.setdefault('verify', self.verify_ssl)
+        # 设置超时、代理和SSL验证（调用方传入的参数优先），一次性构建参数字典
+        kwargs = {
+            'timeout': self.timeout,
+            'verify': self.verify_ssl,
+            **({'proxies': self.proxy_pool} if self.proxy_pool else {}),
+            **kwargs
+        }
         
-        # 使用auth_manager添加认证信息
-        if hasattr(self, 'auth_manager') and self.auth_manager:
-            request_data = {'headers': kwargs.get('headers', {})}
-            updated_data = self.auth_manager.add_auth(request_data)
+        # 使用auth_manager添加认证信息（auth_manager在__init__中已初始化为None）
+        auth_manager = self.auth_manager
+        if auth_manager is not None:
+            updated_data = auth_manager.add_auth({'headers': kwargs.get('headers', {})})
             if updated_data and 'headers' in updated_data:
                 kwargs['headers'] = updated_data['headers']
+        _encode_json_kwargs(kwargs)
         
-        # 尝试发送请求（带重试机制）
-        retry_count = 0
-        last_error = None
+        # 发送请求，重试（含退避和Retry-After）由挂载在会话适配器上的urllib3 Retry处理
+        response = self._session.request(method, full_url, **kwargs)
         
-        while retry_count <= self.retry_count:
-            try:
-                response = requests.request(method, full_url, **kwargs)
-                # 检查是否需要重试
-                if self.retry_enabled and method in self.retry_methods and response.status_code in self.retry_status_forcelist:
-                    retry_count += 1
-                    if retry_count > self.retry_count:
-                        break
-                    
-                    # 计算重试延迟
-                    import time
-                    delay = self.retry_backoff_factor * (2 ** (retry_count - 1))
-                    time.sleep(delay)
-                    continue
-                
-                # 请求成功，返回响应
-                return {
-                    'status_code': response.status_code,
-                    'text': response.text,
-                    'headers': dict(response.headers),
-                    'json': response.json() if 'application/json' in response.headers.get('Content-Type', '') else None
-                }
-            except Exception as e:
-                last_error = e
-                retry_count += 1
-                if retry_count > self.retry_count:
-                    break
-                
-                # 计算重试延迟
-                import time
-                delay = self.retry_backoff_factor * (2 ** (retry_count - 1))
-                time.sleep(delay)
-        
-        # 所有重试都失败了，抛出最后一个错误
-        raise last_error or Exception(f"Request failed after {self.retry_count} retries")
+        return {
+            'status_code': response.status_code,
+            'text': response.text,
+            'headers': dict(response.headers),
+            'json': response.json() if 'application/json' in response.headers.get('Content-Type', '') else None
+        }
     
     def _log_request(self, method: str, url: str, **kwargs) -> None:
         """
@@ -1354,7 +1863,6 @@ class HttpClient:
                 file_path = file_data
                 try:
                     # 获取文件名
-                    import os
                     filename = os.path.basename(file_path)
                     # 打开文件并添加到处理后的文件字典
                     processed_files[field_name] = (filename, open(file_path, 'rb'))
@@ -1377,7 +1885,6 @@ class HttpClient:
                 # 尝试获取文件名
                 filename = 'unknown_file'
                 if hasattr(file_data, 'name'):
-                    import os
                     filename = os.path.basename(file_data.name)
                 # 构造文件元组
                 processed_files[field_name] = (filename, file_data)
@@ -1418,8 +1925,15 @@ class HttpClient:
         if not ip:
             return url
         
+        # 同一URL和IP的改写结果直接复用，避免重复解析（压测时同一URL会被反复请求）
+        cache_key = (url, ip)
+        cached = self._url_rewrite_cache.get(cache_key)
+        if cached is not None:
+            new_url, netloc = cached
+            self._host_headers[new_url] = netloc
+            return new_url
+        
         # 解析URL
-        from urllib.parse import urlparse, urlunparse
         parsed_url = urlparse(url)
         
         # 替换主机名为IP地址
@@ -1441,10 +1955,12 @@ class HttpClient:
         ))
         
         # 添加Host头信息
-        if not hasattr(self, '_host_headers'):
-            self._host_headers = {}
         self._host_headers[new_url] = netloc
         
+        if len(self._url_rewrite_cache) >= _URL_REWRITE_CACHE_SIZE:
+            self._url_rewrite_cache.clear()
+        self._url_rewrite_cache[cache_key] = (new_url, netloc)
+        
         return new_url
     
     def set_auth_config(self, auth_config: Dict[str, Any]) -> None:
@@ -1503,8 +2019,7 @@ class HttpClient:
             auth_config: 认证配置字典
             auth_strategy: 认证策略名称（可选）
         """
-        key = (ip, path_pattern)
-        self.ip_path_auth_configs[key] = {
+        self.ip_path_auth_configs[ip][path_pattern] = {
             'config': auth_config,
             'strategy': auth_strategy
         }
@@ -1521,21 +2036,23 @@ class HttpClient:
             (认证配置字典, 认证策略名称) 的元组
         """
         # 解析URL获取路径
-        from urllib.parse import urlparse
         parsed_url = urlparse(url)
         path = parsed_url.path
         
         # 1. 检查IP+路径的特定配置（最高优先级）
-        if ip:
+        # 只在当前IP的路径配置中查找，不遍历其他IP的配置
+        per_ip_configs = self.ip_path_auth_configs.get(ip) if ip else None
+        if per_ip_configs:
             # 尝试精确匹配IP+路径
-            for (config_ip, config_path), config_info in self.ip_path_auth_configs.items():
-                if config_ip == ip and path == config_path:
-                    return config_info['config'], config_info['strategy']
-            
-            # 尝试IP+路径前缀匹配
-            for (config_ip, config_path), config_info in self.ip_path_auth_configs.items():
-                if config_ip == ip and path.startswith(config_path):
-                    return config_info['config'], config_info['strategy']
+            config_info = per_ip_configs.get(path)
+            if config_info is None:
+                # 尝试IP+路径前缀匹配
+                config_info = next(
+                    (info for config_path, info in per_ip_configs.items() if path.startswith(config_path)),
+                    None
+                )
+            if config_info is not None:
+                return config_info['config'], config_info['strategy']
         
         # 2. 检查路径特定配置
         # 尝试精确路径匹配
@@ -1591,75 +2108,142 @@ class HttpClient:
         # 使用指定的认证策略或动态策略或默认认证策略
         strategy = auth_strategy or dynamic_strategy or self.auth_strategy
         
-        # 如果没有指定认证策略，则直接返回原始请求头
+        # 如果没有指定认证策略，则只补充Host头（按IP改写URL后，SNI和证书校验依赖原始Host）
         if not strategy:
-            return headers or {}
+            return self._merge_auth_headers(url, headers, {})
         
         # 使用指定的认证配置或动态配置或默认认证配置
         config = auth_config or dynamic_config or self.auth_config.copy()
         
+        # 认证头与请求体无关的策略直接命中缓存，跳过请求体和文件MD5处理
+        cache_key = _auth_headers_cache_key(strategy, config)
+        if cache_key is not None:
+            cached_headers = self._auth_headers_cache.get(cache_key)
+            if cached_headers is not None:
+                return self._merge_auth_headers(url, headers, cached_headers)
+        
+        # 签名类认证需要的请求信息单独传给认证管理器，不写入（可能是共享的）认证配置
+        request_data = {'method': method, 'url': url}
+        
         # 对于需要body内容的请求方法
         if method in ['POST', 'PUT', 'PATCH', 'DELETE']:
-            # 确定要使用的body内容
-            body_content = json_data if json_data is not None else data
-            
-            # 如果有文件上传，处理文件MD5
+            # 如果有文件上传，按字段处理文件MD5
             file_md5_map = None
             if files:
-                if not file_md5:
-                    # 如果有多个文件，使用process_files_for_auth
-                    if len(files) > 1:
-                        try:
-                            # 使用HMACAuth中的方法进行文件MD5计算
-                            file_md5_map = {}
-                            for key, file_obj in files.items():
-                                if isinstance(file_obj, tuple) and len(file_obj) >= 2:
-                                    file_md5_map[key] = HMACAuth._calculate_file_path_md5(file_obj[1])
-                                elif hasattr(file_obj, 'name'):
-                                    file_md5_map[key] = HMACAuth._calculate_file_path_md5(file_obj.name)
-                                elif hasattr(file_obj, 'read'):
-                                    file_md5_map[key] = HMACAuth._calculate_file_md5(file_obj)
-                        except Exception as e:
-                            logger.warning(f"无法处理多个文件的MD5: {str(e)}")
-                    else:
-                        # 单个文件，尝试计算MD5
-                        for file_key, file_info in files.items():
-                            if isinstance(file_info, tuple) and len(file_info) >= 2:
-                                file_obj = file_info[1]
-                                if hasattr(file_obj, 'name'):
-                                    try:
-                                        file_md5 = HMACAuth._calculate_file_path_md5(file_obj.name)
-                                    except Exception as e:
-                                        logger.warning(f"无法计算文件 {file_obj.name} 的MD5: {str(e)}")
-                                elif hasattr(file_obj, 'read'):
-                                    try:
-                                        file_md5 = HMACAuth._calculate_file_md5(file_obj)
-                                    except Exception as e:
-                                        logger.warning(f"无法计算二进制文件对象的MD5: {str(e)}")
-            
-            # 添加必要的内容到配置中
-            config['body_content'] = body_content
-            config['file_md5'] = file_md5
-            config['file_md5_map'] = file_md5_map
-            config['files'] = files
+                if file_md5 and len(files) == 1:
+                    file_md5_map = {next(iter(files)): file_md5}
+                else:
+                    file_md5_map = {}
+                    for key, file_info in files.items():
+                        key_md5 = self._get_upload_file_md5(file_info)
+                        if key_md5:
+                            file_md5_map[key] = key_md5
+            
+            request_data.update(data=data, json_data=json_data, files=files, file_md5_map=file_md5_map)
         
         try:
             # 获取认证请求头
-            auth_headers = default_auth_manager.get_auth_headers(strategy, **config)
-            
-            # 合并请求头
-            result_headers = (headers or {}).copy()
-            result_headers.update(auth_headers)
+            auth_headers = self._get_auth_manager(strategy, config).get_auth_headers(request_data)
             
-            # 添加Host头（如果有）
-            from urllib.parse import urlparse
-            if url in getattr(self, '_host_headers', {}):
-                result_headers['Host'] = self._host_headers[url]
+            if cache_key is not None:
+                if len(self._auth_headers_cache) >= _AUTH_HEADERS_CACHE_SIZE:
+                    self._auth_headers_cache.clear()
+                self._auth_headers_cache[cache_key] = auth_headers
             
-            return result_headers
+            return self._merge_auth_headers(url, headers, auth_headers)
         except Exception as e:
             logger.error(f"生成认证请求头失败: {str(e)}")
+            return self._merge_auth_headers(url, headers, {})
+    
+    def _get_auth_manager(self, strategy: str, config: Dict[str, Any]) -> AuthManager:
+        """
+        获取认证策略和配置对应的认证管理器，相同配置复用同一实例（OAuth2等策略的token缓存得以保留）
+        
+        Args:
+            strategy: 认证策略名称
+            config: 认证配置
+            
+        Returns:
+            AuthManager实例
+        """
+        key = _auth_config_key(strategy, config)
+        auth_manager = self._auth_managers.get(key) if key is not None else None
+        if auth_manager is None:
+            auth_manager = create_auth_manager({**config, 'type': strategy})
+            if key is not None:
+                if len(self._auth_managers) >= _AUTH_HEADERS_CACHE_SIZE:
+                    self._auth_managers.clear()
+                self._auth_managers[key] = auth_manager
+        return auth_manager
+    
+    def _merge_auth_headers(self, url: str, headers: Optional[Dict[str, str]], auth_headers: Dict[str, str]) -> Dict[str, str]:
+        """
+        合并原始请求头、认证头和Host头
+        
+        Args:
+            url: 请求URL
+            headers: 原始请求头
+            auth_headers: 认证请求头
+            
+        Returns:
+            合并后的请求头
+        """
+        host = self._host_headers.get(url)
+        if host is None and not auth_headers:
+            # 没有需要合并的内容，不复制请求头
             return headers or {}
+        
+        result_headers = (headers or {}).copy()
+        result_headers.update(auth_headers)
+        
+        # 添加Host头（如果有）
+        if host is not None:
+            result_headers['Host'] = host
+        
+        return result_headers
+    
+    def _get_upload_file_md5(self, file_info: Any) -> Optional[str]:
+        """
+        计算上传文件的MD5值
+        
+        对于磁盘上的文件，结果按 (真实路径, 修改时间, 文件大小) 缓存，
+        同一文件在批量请求中上传到多个接口时只计算一次
+        
+        Args:
+            file_info: 文件路径、文件对象、文件内容或 (filename, file_object, ...) 元组
+            
+        Returns:
+            文件的MD5值，无法计算时返回None
+        """
+        file_obj = file_info[1] if isinstance(file_info, tuple) and len(file_info) >= 2 else file_info
+        if isinstance(file_obj, (bytes, bytearray, memoryview)):
+            # upload_file读取的缓存内容在读取时已算好MD5，其他内容直接计算
+            with self._upload_lock:
+                cached = self._upload_md5s.get(id(file_obj))
+            if cached is not None and cached[0] is file_obj:
+                return cached[1]
+            return hashlib.md5(file_obj).hexdigest()
+        
+        file_path = file_obj if isinstance(file_obj, str) else getattr(file_obj, 'name', None)
+        
+        try:
+            if isinstance(file_path, str) and os.path.isfile(file_path):
+                real_path = os.path.realpath(file_path)
+                stat = os.stat(real_path)
+                cache_key = (real_path, stat.st_mtime_ns, stat.st_size)
+                file_md5 = self._file_md5_cache.get(cache_key)
+                if file_md5 is None:
+                    file_md5 = HMACAuth._calculate_file_path_md5(real_path)
+                    if file_md5:
+                        if len(self._file_md5_cache) >= _FILE_MD5_CACHE_SIZE:
+                            self._file_md5_cache.clear()
+                        self._file_md5_cache[cache_key] = file_md5
+                return file_md5
+            if hasattr(file_obj, 'read'):
+                return HMACAuth._calculate_file_md5(file_obj)
+        except Exception as e:
+            logger.warning(f"无法计算文件 {file_path or type(file_obj).__name__} 的MD5: {str(e)}")
+        return None
     
     def _process_dynamic_params(self, data: Any, param_funcs: Optional[Dict[str, Callable]] = None) -> Any:
         """
@@ -1672,58 +2256,95 @@ class HttpClient:
         Returns:
             处理后的数据
         """
-        if param_funcs is None:
-            param_funcs = {}
-        
-        # 默认参数处理函数
-        default_funcs = {
-            'timestamp': lambda: str(int(time.time())),
-            'random_str': lambda: self.random_generator.random_string(),
-            'random_num': lambda: str(random.randint(1000, 9999)),
-            'date': lambda: time.strftime('%Y-%m-%d'),
-            'datetime': lambda: time.strftime('%Y-%m-%d %H:%M:%S')
-        }
+        # 合并默认函数和自定义函数（自定义函数优先），不复制字典；无自定义函数时不产生任何分配
+        all_funcs = ChainMap(param_funcs, self._default_param_funcs) if param_funcs else self._default_param_funcs
+        # 整个数据结构共用同一个时间快照
+        return self._substitute_dynamic_params(data, all_funcs, _get_time_snapshot())
+    
+    def _substitute_dynamic_params(self, data: Any, all_funcs: Mapping[str, Callable],
+                                   snapshot: Tuple[int, str, str, str]) -> Any:
+        """
+        递归替换数据结构中的动态参数
         
-        # 合并默认函数和自定义函数
-        all_funcs = {**default_funcs, **param_funcs}
-        
-        # 处理字符串中的动态参数
-        def _replace_in_string(text: str) -> str:
-            def replace_match(match):
-                expr = match.group(1).strip()
-                # 检查是否是函数调用形式: func() 或 func(arg1, arg2)
-                func_match = re.match(r'([a-zA-Z_]\w*)\((.*)\)', expr)
-                if func_match:
-                    func_name, args_str = func_match.groups()
-                    if func_name in all_funcs:
-                        # 解析参数
-                        args = [arg.strip() for arg in args_str.split(',')] if args_str.strip() else []
-                        try:
-                            return str(all_funcs[func_name](*args))
-                        except Exception as e:
-                            logger.warning(f"动态参数函数执行失败: {expr}, 错误: {str(e)}")
-                            return expr
-                # 检查是否是简单的变量名
-                elif expr in all_funcs:
-                    try:
-                        return str(all_funcs[expr]())
-                    except Exception as e:
-                        logger.warning(f"动态参数函数执行失败: {expr}, 错误: {str(e)}")
-                        return expr
-                return f"${{{expr}}}"  # 保留原始格式
+        Args:
+            data: 需要处理的数据
+            all_funcs: 参数处理函数映射
+            snapshot: 本次替换使用的时间快照
             
-            return self.dynamic_param_pattern.sub(replace_match, text)
-        
-        # 递归处理数据结构
+        Returns:
+            处理后的数据；没有任何动态参数被替换时返回原对象本身
+        """
+        # 写时复制：只有子节点真正发生变化时才创建新的字典/列表
         if isinstance(data, dict):
-            return {k: self._process_dynamic_params(v, param_funcs) for k, v in data.items()}
+            result = None
+            for k, v in data.items():
+                new_v = self._substitute_dynamic_params(v, all_funcs, snapshot)
+                if new_v is not v:
+                    if result is None:
+                        result = data.copy()
+                    result[k] = new_v
+            return data if result is None else result
         elif isinstance(data, list):
-            return [self._process_dynamic_params(item, param_funcs) for item in data]
+            result = None
+            for i, item in enumerate(data):
+                new_item = self._substitute_dynamic_params(item, all_funcs, snapshot)
+                if new_item is not item:
+                    if result is None:
+                        result = data.copy()
+                    result[i] = new_item
+            return data if result is None else result
         elif isinstance(data, str):
-            return _replace_in_string(data)
+            return self._replace_dynamic_params_in_string(data, all_funcs, snapshot)
         else:
             return data
     
+    def _replace_dynamic_params_in_string(self, text: str, all_funcs: Mapping[str, Callable],
+                                          snapshot: Tuple[int, str, str, str]) -> str:
+        """
+        替换字符串中的动态参数
+        
+        Args:
+            text: 原始字符串
+            all_funcs: 参数处理函数映射
+            snapshot: 本次替换使用的时间快照
+            
+        Returns:
+            替换后的字符串
+        """
+        pattern = self.dynamic_param_pattern
+        # 大多数字符串不含动态参数，直接返回原对象；默认模式下用子串查找代替正则搜索
+        if pattern is _DYNAMIC_PARAM_RE:
+            if '${' not in text:
+                return text
+        elif pattern.search(text) is None:
+            return text
+        
+        segments = _parse_dynamic_template(pattern, text)
+        if len(segments) == 1 and isinstance(segments[0], str):
+            # 只有'${'但没有完整的${...}占位符
+            return text
+        
+        parts = []
+        for segment in segments:
+            if isinstance(segment, str):
+                parts.append(segment)
+                continue
+            expr, func_name, args = segment
+            func = all_funcs.get(func_name)
+            if func is None:
+                field = _TIME_SNAPSHOT_FIELDS.get(func_name)
+                if field is not None and not args:
+                    parts.append(snapshot[field])
+                else:
+                    parts.append(f"${{{expr}}}")  # 保留原始格式
+                continue
+            try:
+                parts.append(str(func(*args)))
+            except Exception as e:
+                logger.warning(f"动态参数函数执行失败: {expr}, 错误: {str(e)}")
+                parts.append(expr)
+        return ''.join(parts)
+    
     def send_request(self, 
                       method: str, 
                       url: str, 
@@ -1795,7 +2416,10 @@ class HttpClient:
         # 处理重试配置
         current_retry_enabled = self.retry_enabled if retry_enabled is None else retry_enabled
         current_retry_count = self.retry_count if retry_count is None else retry_count
-        current_retry_status_codes = self.retry_status_codes if retry_on_status_codes is None else retry_on_status_codes
+        if retry_on_status_codes is None:
+            should_retry_status = self._should_retry_status
+        else:
+            should_retry_status = frozenset(retry_on_status_codes).__contains__
         
         # 处理动态参数替换
         if dynamic_params:
@@ -1863,6 +2487,12 @@ class HttpClient:
         
         # 记录请求日志
         self._log_request(method, full_url, **request_kwargs)
+        try:
+            _encode_json_kwargs(request_kwargs)
+        except requests.exceptions.InvalidJSONError as e:
+            # 与其他不可重试的请求错误一样记录并返回None
+            logger.error(f"请求发送失败: {str(e)}")
+            return None
         
         # 定义发送请求的函数，用于速率限制和并发控制
         def _send_request_inner():
@@ -1871,28 +2501,37 @@ class HttpClient:
             last_exception = None
             last_response = None
             
+            # 循环内用到的属性和方法预先绑定到局部变量
+            _request = self.session.request
+            _time = time.time
+            _log_info = logger.info
+            _retry_excs = tuple(self.retry_exceptions)
+            http_method = method.upper()
+            
+            # 预先收集可重置指针的文件对象，重试时无需逐个检查
+            seekable_files = [
+                file_info[1] for file_info in (processed_files or {}).values()
+                if isinstance(file_info, tuple) and len(file_info) >= 2 and hasattr(file_info[1], 'seek')
+            ]
+            
             while retry_count <= max_retries:
                 try:
                     # 对于文件上传请求，确保每次重试前重置文件指针
-                    if processed_files:
-                        for key, file_info in processed_files.items():
-                            if isinstance(file_info, tuple) and len(file_info) >= 2:
-                                file_obj = file_info[1]
-                                if hasattr(file_obj, 'seek'):
-                                    file_obj.seek(0)
+                    for file_obj in seekable_files:
+                        file_obj.seek(0)
                     
-                    start_time = time.time()
-                    response = self.session.request(method=method.upper(), url=full_url, **request_kwargs)
+                    start_time = _time()
+                    response = _request(method=http_method, url=full_url, **request_kwargs)
                     
                     # 记录响应时间
-                    response_time = time.time() - start_time
-                    logger.info(f"请求耗时: {response_time:.3f} 秒, 状态码: {response.status_code}")
+                    response_time = _time() - start_time
+                    _log_info(f"请求耗时: {response_time:.3f} 秒, 状态码: {response.status_code}")
                     
                     # 检查是否需要重试（基于状态码）
-                    if current_retry_enabled and response.status_code in current_retry_status_codes:
+                    if current_retry_enabled and should_retry_status(response.status_code):
                         retry_count += 1
                         last_response = response
-                        wait_time = (self.retry_backoff_factor * (2 ** (retry_count - 1))) + random.uniform(0, 1)
+                        wait_time = self._get_backoff_delay(retry_count) + random.random()
                         logger.warning(f"请求返回状态码 {response.status_code}, 第 {retry_count} 次重试，等待 {wait_time:.2f} 秒")
                         time.sleep(wait_time)
                         continue
@@ -1903,17 +2542,13 @@ class HttpClient:
                     return response
                 except Exception as e:
                     # 检查是否是需要重试的异常类型
-                    should_retry = False
-                    for exc_type in self.retry_exceptions:
-                        if isinstance(e, exc_type):
-                            should_retry = True
-                            break
+                    should_retry = isinstance(e, _retry_excs)
                     
                     last_exception = e
                     
                     if current_retry_enabled and should_retry and retry_count < max_retries:
                         retry_count += 1
-                        wait_time = (self.retry_backoff_factor * (2 ** (retry_count - 1))) + random.uniform(0, 1)
+                        wait_time = self._get_backoff_delay(retry_count) + random.random()
                         logger.warning(f"请求异常: {type(e).__name__} - {str(e)}, 第 {retry_count} 次重试，等待 {wait_time:.2f} 秒")
                         time.sleep(wait_time)
                     else:
@@ -1923,18 +2558,17 @@ class HttpClient:
                         if last_response:
                             return last_response
                         return None
+            
+            # 状态码重试次数用尽，返回最后一次的响应
+            return last_response
         
-        # 应用速率限制
-        if hasattr(self, 'rate_limiter') and self.rate_limiter:
-            # 使用装饰器风格的速率限制
-            @run_with_rate_limit(self.rate_limiter)
-            def _send_request_with_rate_limit():
+        # 应用速率限制：进入限速器时等待到允许发送
+        rate_limiter = self.rate_limiter
+        if rate_limiter:
+            with rate_limiter:
                 return _send_request_inner()
-            
-            return _send_request_with_rate_limit()
-        else:
-            # 直接发送请求
-            return _send_request_inner()
+        # 直接发送请求
+        return _send_request_inner()
     
     def stream_request(self, 
                       method: str, 
@@ -1949,7 +2583,8 @@ class HttpClient:
             method: 请求方法
             url: 请求URL
             chunk_size: 每次读取的字节数
-            process_func: 对每个chunk的处理函数，返回处理后的结果
+            process_func: 对每个chunk的处理函数，返回处理后的结果；
+                未提供时按行读取响应，逐行解析JSON（支持SSE的data:前缀），无法解析的行原样返回
             **kwargs: 传递给send_request的其他参数
             
         Yields:
@@ -1966,39 +2601,36 @@ class HttpClient:
             return
         
         try:
-            # 默认处理函数，尝试解析JSON
-            def default_process(chunk):
-                try:
-                    # 尝试解码为字符串并解析JSON
-                    chunk_str = chunk.decode('utf-8')
-                    # 处理可能的多行JSON
-                    lines = chunk_str.splitlines()
-                    results = []
-                    for line in lines:
-                        line = line.strip()
-                        # 处理SSE格式: data: {json}
-                        if line.startswith('data:'):
-                            line = line[5:].strip()
-                        # 跳过空行
-                        if not line:
-                            continue
+            if process_func:
+                # 使用提供的处理函数逐块处理原始字节
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    if chunk:
+                        yield process_func(chunk)
+            else:
+                # 默认按行处理（兼容SSE格式: data: {json}），每行尝试解析为JSON
+                # 响应头未声明charset时，requests对text/*（如SSE的text/event-stream）默认使用ISO-8859-1，
+                # 其他类型则返回bytes，这里统一按UTF-8增量解码
+                content_type = response.headers.get('Content-Type', '')
+                if response.encoding is None or 'charset' not in content_type.lower():
+                    response.encoding = 'utf-8'
+                loads = _json_loads
+                for line in response.iter_lines(chunk_size=chunk_size, decode_unicode=True):
+                    line = line.strip()
+                    if line.startswith('data:'):
+                        line = line[5:].strip()
+                    # 跳过空行
+                    if not line:
+                        continue
+                    try:
+                        parsed = loads(line)
+                    except ValueError:
+                        # orjson比标准库更严格（如NaN、超长整数），失败时用标准库再试一次
                         try:
-                            return json.loads(line)
-                        except json.JSONDecodeError:
-                            # 如果无法解析为完整JSON，返回原始字符串
-                            return chunk_str
-                except Exception:
-                    # 返回原始chunk
-                    return chunk
-            
-            # 使用提供的处理函数或默认函数
-            process = process_func or default_process
-            
-            # 流式读取响应
-            for chunk in response.iter_content(chunk_size=chunk_size):
-                if chunk:
-                    processed_chunk = process(chunk)
-                    yield processed_chunk
+                            parsed = json.loads(line)
+                        except ValueError:
+                            # 如果无法解析为JSON，返回原始行
+                            parsed = line
+                    yield parsed
         except Exception as e:
             logger.error(f"处理流式响应时出错: {str(e)}")
             raise
@@ -2043,14 +2675,14 @@ class HttpClient:
             verify: 是否验证SSL证书
             allow_redirects: 是否允许重定向
             use_ips: IP地址列表，与URL列表一一对应
-            sequential: 是否顺序执行（False表示并行执行，需要额外线程池支持）
+            sequential: 是否顺序执行（False表示并行执行，结果顺序与URL顺序一致；
+                启用async_mode且不涉及协程模式不支持的功能时使用aiohttp协程并发，否则使用线程池，
+                见_can_use_async_batch）
             **kwargs: 其他参数
             
         Returns:
             URL和响应对象的元组列表
         """
-        results = []
-        
         # 确保列表长度一致，缺少的部分用None填充
         list_length = len(urls)
         if params_list is None:
@@ -2082,38 +2714,196 @@ class HttpClient:
         
         logger.info(f"开始批量发送请求，共{list_length}个请求")
         
-        # 目前只实现顺序执行，并行执行需要额外的线程池支持
-        for i, url in enumerate(urls):
+        # 整个批次共用的请求参数只构建一次，每个请求只传入各自不同的部分
+        # （不复用同一个可变字典：并行模式下多个线程会同时读取它）
+        common_kwargs = {
+            'timeout': self.timeout if timeout is None else timeout,
+            'verify': verify,
+            'allow_redirects': allow_redirects,
+            'auth_strategy': auth_strategy,
+            'auth_config': auth_config,
+            **kwargs
+        }
+        send_request = self.send_request
+        
+        def _send_one(i):
+            url = urls[i]
             logger.info(f"执行第{i+1}/{list_length}个请求: {url}")
             # 预处理文件（如果有）
             processed_files = None
             if files_list[i]:
                 processed_files = self.prepare_file_upload(files_list[i])
             
-            response = self.send_request(
-                method=method,
-                url=url,
+            response = send_request(
+                method,
+                url,
                 params=params_list[i],
                 data=data_list[i],
                 json_data=json_list[i],
                 headers=headers_list[i],
                 cookies=cookies_list[i],
                 files=processed_files,
-                timeout=timeout,
-                verify=verify,
-                allow_redirects=allow_redirects,
                 use_ip=use_ips[i],
-                auth_strategy=auth_strategy,
-                auth_config=auth_config,
                 file_md5=file_md5_list[i],
-                retry_on_file_error=self.retry_on_file_error,
-                **kwargs
+                **common_kwargs
             )
-            results.append((url, response))
+            return url, response
+        
+        if sequential or list_length <= 1:
+            results = [_send_one(i) for i in range(list_length)]
+        elif self.async_mode and self._can_use_async_batch(params_list, data_list, files_list, use_ips, common_kwargs):
+            # 协程并发：单线程内同时发出全部请求
+            results = asyncio.run(self._async_batch(
+                method, urls, params_list, data_list, json_list, headers_list, cookies_list,
+                file_md5_list, common_kwargs
+            ))
+        else:
+            # 并行执行，使用线程池；executor.map保证结果顺序与URL顺序一致
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=min(32, list_length))
+                self._owned_executors.append(self.executor)
+            results = list(self.executor.map(_send_one, range(list_length)))
         
         logger.info("批量请求完成")
         return results
     
+    def _can_use_async_batch(self,
+                             params_list: List[Any],
+                             data_list: List[Any],
+                             files_list: List[Any],
+                             use_ips: List[Any],
+                             common_kwargs: Dict[str, Any]) -> bool:
+        """
+        判断并行批量请求能否使用aiohttp协程并发
+        
+        协程模式只做动态参数替换和认证，不支持文件上传、IP轮询、代理、重试和速率限制，
+        也不能在已运行的事件循环中调用asyncio.run；params或data中含有aiohttp与requests编码方式不同的值
+        （见_is_aiohttp_compatible_fields）时同样不能使用。涉及这些情况时回退到线程池，行为与send_request一致
+        
+        Args:
+            params_list: 参数列表
+            data_list: 数据列表
+            files_list: 文件列表
+            use_ips: IP地址列表
+            common_kwargs: send_batch_requests构建的公共请求参数
+            
+        Returns:
+            是否可以使用协程并发
+        """
+        if any(files_list) or any(use_ips) or self.ip_list:
+            return False
+        if not all(_is_aiohttp_compatible_fields(fields) for fields in params_list) or \
+                not all(_is_aiohttp_compatible_fields(fields) for fields in data_list):
+            return False
+        if self.rate_limiter or (common_kwargs.get('use_proxy') and self.proxy_pool):
+            return False
+        retry_enabled = common_kwargs.get('retry_enabled')
+        retry_count = common_kwargs.get('retry_count')
+        if (self.retry_enabled if retry_enabled is None else retry_enabled) and \
+                (self.retry_count if retry_count is None else retry_count) > 0:
+            return False
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return True
+        return False
+    
+    async def _async_batch(self, 
+                           method: str, 
+                           urls: List[str],
+                           params_list: List[Any],
+                           data_list: List[Any],
+                           json_list: List[Any],
+                           headers_list: List[Any],
+                           cookies_list: List[Any],
+                           file_md5_list: List[Any],
+                           common_kwargs: Dict[str, Any]) -> List[Tuple[str, Optional[requests.Response]]]:
+        """
+        使用aiohttp并发发送批量请求（send_batch_requests在async_mode下的并行实现）
+        
+        动态参数替换和认证头在发送前同步完成，json请求体与send_request一样经_encode_json_kwargs序列化
+        （同时给出data时忽略json，无法序列化时该请求失败），响应转换为requests.Response，
+        与线程池模式返回的结果类型一致；单个请求出错只影响该请求的结果
+        
+        Args:
+            method: 请求方法
+            urls: URL列表
+            params_list: 参数列表
+            data_list: 数据列表
+            json_list: JSON数据列表
+            headers_list: 请求头列表
+            cookies_list: cookies列表
+            file_md5_list: 文件MD5列表
+            common_kwargs: send_batch_requests构建的公共请求参数
+            
+        Returns:
+            URL和响应对象的元组列表，请求失败时响应为None
+        """
+        process = self._process_dynamic_params
+        dynamic = common_kwargs.get('dynamic_params', True)
+        param_funcs = common_kwargs.get('param_funcs')
+        connector = aiohttp.TCPConnector(
+            limit=len(urls),
+            ttl_dns_cache=300,
+            ssl=None if common_kwargs['verify'] else False
+        )
+        timeout = aiohttp.ClientTimeout(total=common_kwargs['timeout'])
+        
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            async def _send_one(i):
+                url = urls[i]
+                full_url = self._prepare_url(url)
+                params, data, json_data = params_list[i], data_list[i], json_list[i]
+                headers, cookies = headers_list[i], cookies_list[i]
+                if dynamic:
+                    params = process(params, param_funcs) if params is not None else None
+                    data = process(data, param_funcs) if isinstance(data, (dict, list)) else data
+                    json_data = process(json_data, param_funcs) if json_data is not None else None
+                    headers = process(headers, param_funcs) if headers is not None else None
+                    cookies = process(cookies, param_funcs) if cookies is not None else None
+                headers = self._prepare_auth_headers(
+                    method=method,
+                    url=full_url,
+                    headers=headers,
+                    data=data,
+                    json_data=json_data,
+                    auth_strategy=common_kwargs.get('auth_strategy'),
+                    auth_config=common_kwargs.get('auth_config'),
+                    file_md5=file_md5_list[i]
+                )
+                request_kwargs = {'data': data, 'json': json_data, 'headers': headers}
+                try:
+                    _encode_json_kwargs(request_kwargs)
+                    if request_kwargs['data']:
+                        request_kwargs.pop('json', None)
+                    async with session.request(
+                        method,
+                        full_url,
+                        params=params,
+                        cookies=cookies,
+                        allow_redirects=common_kwargs['allow_redirects'],
+                        **request_kwargs
+                    ) as res:
+                        content = await res.read()
+                except (aiohttp.ClientError, asyncio.TimeoutError, requests.exceptions.InvalidJSONError,
+                        TypeError, ValueError) as e:
+                    logger.error(f"异步批量请求失败: {method} {url}, 错误: {str(e)}")
+                    return url, None
+                
+                # 转换为requests.Response，调用方可以照常使用status_code、json()、text等
+                response = requests.Response()
+                response.status_code = res.status
+                response.reason = res.reason
+                response.url = str(res.url)
+                response.headers.update(res.headers)
+                response.encoding = res.charset
+                response._content = content
+                for name, morsel in res.cookies.items():
+                    response.cookies.set(name, morsel.value)
+                return url, response
+            
+            return await asyncio.gather(*[_send_one(i) for i in range(len(urls))])
+    
     def send_multiple_paths(self, 
                            base_url: str,
                            paths: List[str],
@@ -2153,47 +2943,46 @@ class HttpClient:
         Returns:
             完整URL和响应对象的元组列表
         """
-        # 构建完整URL列表
-        urls = []
-        for path in paths:
-            # 处理路径，确保格式正确
-            if not path.startswith('/'):
-                path = '/' + path
-            if base_url.endswith('/'):
-                full_url = base_url + path[1:]
-            else:
-                full_url = base_url + path
-            urls.append(full_url)
+        # 构建完整URL列表：基础URL去掉结尾斜杠、路径去掉开头斜杠后用单个'/'连接
+        base = base_url.rstrip('/')
+        urls = [f"{base}/{path.lstrip('/')}" for path in paths]
+        count = len(urls)
+        
+        # 共享参数的动态参数只替换一次，而不是每个路径各替换一次
+        # 注意：因此所有路径使用相同的动态参数值（如random_str）
+        if kwargs.pop('dynamic_params', True):
+            param_funcs = kwargs.pop('param_funcs', None)
+            if params is not None:
+                params = self._process_dynamic_params(params, param_funcs)
+            if isinstance(data, (dict, list)):
+                data = self._process_dynamic_params(data, param_funcs)
+            if json_data is not None:
+                json_data = self._process_dynamic_params(json_data, param_funcs)
+            if headers is not None:
+                headers = self._process_dynamic_params(headers, param_funcs)
+            if cookies is not None:
+                cookies = self._process_dynamic_params(cookies, param_funcs)
         
         # 使用批量请求方法
         return self.send_batch_requests(
             method=method,
             urls=urls,
-            params_list=[params] * len(urls),
-            data_list=[data] * len(urls),
-            json_list=[json_data] * len(urls),
-            headers_list=[headers] * len(urls),
-            cookies_list=[cookies] * len(urls),
-            files_list=[files] * len(urls),
+            params_list=[params] * count,
+            data_list=[data] * count,
+            json_list=[json_data] * count,
+            headers_list=[headers] * count,
+            cookies_list=[cookies] * count,
+            files_list=[files] * count,
             timeout=timeout,
             verify=verify,
             allow_redirects=allow_redirects,
             use_ips=use_ips,
             auth_strategy=auth_strategy,
             auth_config=auth_config,
-            retry_on_file_error=self.retry_on_file_error,
+            dynamic_params=False,
             **kwargs
         )
     
-    def set_ip_list(self, ip_list: List[str]) -> None:
-        """
-        设置IP地址列表
-        
-        Args:
-            ip_list: IP地址列表
-        """
-        self.ip_list = ip_list
-    
     def set_proxy_pool(self, proxy_pool: Dict[str, str]) -> None:
         """
         设置代理池
@@ -2329,47 +3118,93 @@ class HttpClient:
         # 使用request方法发送请求
         return self.request('POST', full_url, **request_kwargs)
     
-    def put(self, url: str, **kwargs) -> Dict[str, Any]:
+    def _get_upload_content(self, file_path: str) -> bytes:
         """
-        发送PUT请求
+        获取上传文件的内容
+        
+        不超过_UPLOAD_CACHE_MAX_FILE_SIZE的文件按 (真实路径, 修改时间, 文件大小) 缓存不可变的bytes，
+        同一文件重复上传时不再打开和读取文件；bytes可被多个线程同时上传，无需担心被关闭或修改。
+        缓存时同时记录内容的MD5，HMAC签名时不再重复计算
         
         Args:
-            url: 请求URL
-            **kwargs: 其他请求参数
+            file_path: 文件路径
             
         Returns:
-            包含响应信息的字典
-        """
-        full_url = self._prepare_url(url)
-        return self.request('PUT', full_url, **kwargs)
+            文件内容
+        """
+        real_path = os.path.realpath(file_path)
+        stat = os.stat(real_path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        with self._upload_lock:
+            cached = self._upload_contents.get(real_path)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        
+        with open(real_path, 'rb') as f:
+            content = f.read()
+        if stat.st_size <= _UPLOAD_CACHE_MAX_FILE_SIZE:
+            content_md5 = hashlib.md5(content).hexdigest()
+            with self._upload_lock:
+                if len(self._upload_contents) >= _UPLOAD_CACHE_SIZE:
+                    self._upload_contents.clear()
+                    self._upload_md5s.clear()
+                previous = self._upload_contents.get(real_path)
+                if previous is not None:
+                    self._upload_md5s.pop(id(previous[1]), None)
+                self._upload_contents[real_path] = (version, content)
+                self._upload_md5s[id(content)] = (content, content_md5)
+        return content
     
-    def delete(self, url: str, **kwargs) -> Dict[str, Any]:
+    def upload_file(self, 
+                    url: str, 
+                    file_path: str, 
+                    file_param: str = 'file',
+                    content_type: Optional[str] = None,
+                    **kwargs) -> Dict[str, Any]:
         """
-        发送DELETE请求
+        上传单个文件（调用方只需提供文件路径，文件句柄由客户端管理）
         
         Args:
             url: 请求URL
-            **kwargs: 其他请求参数
+            file_path: 文件路径
+            file_param: 文件字段名
+            content_type: 文件的Content-Type（可选）
+            **kwargs: 传递给post的其他参数
             
         Returns:
             包含响应信息的字典
         """
-        full_url = self._prepare_url(url)
-        return self.request('DELETE', full_url, **kwargs)
+        return self.upload_multiple_files(url, {file_param: file_path}, content_type=content_type, **kwargs)
     
-    def patch(self, url: str, **kwargs) -> Dict[str, Any]:
+    def upload_multiple_files(self, 
+                              url: str, 
+                              file_paths: Dict[str, str], 
+                              content_type: Optional[str] = None,
+                              **kwargs) -> Dict[str, Any]:
         """
-        发送PATCH请求
+        上传多个文件
         
         Args:
             url: 请求URL
-            **kwargs: 其他请求参数
+            file_paths: 文件字段名到文件路径的映射
+            content_type: 所有文件的Content-Type（可选）
+            **kwargs: 传递给post的其他参数
             
         Returns:
             包含响应信息的字典
         """
-        full_url = self._prepare_url(url)
-        return self.request('PATCH', full_url, **kwargs)
+        files = {}
+        for file_param, file_path in file_paths.items():
+            content = self._get_upload_content(file_path)
+            filename = os.path.basename(file_path)
+            files[file_param] = (filename, content, content_type) if content_type else (filename, content)
+        return self.post(url, files=files, **kwargs)
+    
+    # 发送PUT/DELETE/PATCH请求：直接绑定到request方法（request内部负责拼接URL），
+    # 调用方式为 client.put(url, **kwargs)，返回包含响应信息的字典
+    put = functools.partialmethod(request, 'PUT')
+    delete = functools.partialmethod(request, 'DELETE')
+    patch = functools.partialmethod(request, 'PATCH')
     
     def get_async(self, url: str, **kwargs) -> Dict[str, Any]:
         """
@@ -2405,23 +3240,44 @@ class HttpClient:
         """
         if hasattr(self, 'request_manager'):
             self.request_manager.close()
-        if hasattr(self, 'executor') and self.executor:
+        if self.executor:
             self.executor.shutdown(wait=True)
+        self.session.close()
+        self._session.close()
+        self._file_md5_cache.clear()
+        with self._upload_lock:
+            self._upload_contents.clear()
+            self._upload_md5s.clear()
+        # 资源已显式释放，不再需要回收时的兜底清理
+        self._finalizer.detach()
     
-    def __del__(self):
+    def __enter__(self):
         """
-        析构函数，确保会话和资源关闭
+        进入上下文
+        """
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """
+        退出上下文，关闭会话和线程池
         """
         self.close()
+        return False  # 不抑制异常
     
     def set_ip_list(self, ip_list: List[str]) -> None:
         """
-        设置IP地址列表
+        设置IP地址列表，并确保每个IP的连接池都能同时保持
         
         Args:
             ip_list: IP地址列表
         """
-        self.ip_list = ip_list
+        with self._ip_lock:
+            self.ip_list = list(ip_list)
+            self._current_ip_index = 0
+        for session in (self.session, self._session):
+            for adapter in set(session.adapters.values()):
+                if isinstance(adapter, IPRotationAdapter):
+                    adapter.resize_pool_cache(len(self.ip_list))
         
     def set_proxy_pool(self, proxy_pool: Dict[str, str]) -> None:
         """
@@ -2466,16 +3322,45 @@ class HttpClient:
         Returns:
             测试报告
         """
-        tester = self.get_performance_tester(path=path)
+        try:
+            run_test = self._PERFORMANCE_TESTS[test_type.lower()]
+        except KeyError:
+            raise ValueError(f"不支持的测试类型: {test_type}") from None
         
-        if test_type.lower() == 'concurrency':
-            report = tester.find_max_concurrency(**kwargs)
-        elif test_type.lower() == 'tps':
-            report = tester.find_max_tps(**kwargs)
-        else:
-            raise ValueError(f"不支持的测试类型: {test_type}")
+        return run_test(self.get_performance_tester(path=path), **kwargs)
+
+
+class CookieJarView(_MappingABC):
+    """
+    响应cookies的只读字典视图
+    按需从RequestsCookieJar读取，避免每个响应都调用get_dict()复制一份字典
+    """
+    
+    __slots__ = ('_jar',)
+    
+    def __init__(self, jar):
+        """
+        初始化cookies视图
         
-        return report
+        Args:
+            jar: requests.cookies.RequestsCookieJar实例
+        """
+        self._jar = jar
+    
+    def __getitem__(self, name):
+        value = self._jar.get(name)
+        if value is None:
+            raise KeyError(name)
+        return value
+    
+    def __iter__(self):
+        return (cookie.name for cookie in self._jar)
+    
+    def __len__(self):
+        return len(self._jar)
+    
+    def __repr__(self):
+        return repr(dict(self.items()))
 
 
 # 为了向后兼容，保留RequestSend类
@@ -2484,134 +3369,296 @@ class RequestSend(HttpClient):
     请求发送类（向后兼容）
     """
     
-    def api_run(self, url, method, data=None, headers=None, cookies=None):
-        """向后兼容原有的api_run方法"""
-        # 打印日志
-        logger.info("请求的url为{},类型为{}".format(url, type(url)))
-        # 打印日志
-        logger.info("请求的method为{},类型为{}".format(method, type(method)))
-        # 打印日志
-        logger.info("请求的data为{},类型为{}".format(data, type(data)))
-        # 打印日志
-        logger.info("请求的headers为{},类型为{}".format(headers, type(headers)))
-        # 打印日志
-        logger.info("请求的cookies为{},类型为{}".format(cookies, type(cookies)))
-        
-        # 根据不同方法和头信息调用对应的请求方法
-        if method.lower() == "get":
-            res = self.get(url, params=data, headers=headers, cookies=cookies)
-        elif method.lower() == "post":
-            if headers and headers.get("Content-Type") == "application/json":
-                res = self.post(url, json_data=data, headers=headers, cookies=cookies)
+    def api_run(self, url, method, data=None, headers=None, cookies=None, parse_body=True):
+        """向后兼容原有的api_run方法（parse_body=False时body直接返回原始响应字节，不解析JSON）"""
+        # 打印日志（INFO级别未启用时跳过消息格式化）
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"请求的url为{url},类型为{type(url)}")
+            logger.info(f"请求的method为{method},类型为{type(method)}")
+            logger.info(f"请求的data为{data},类型为{type(data)}")
+            logger.info(f"请求的headers为{headers},类型为{type(headers)}")
+            logger.info(f"请求的cookies为{cookies},类型为{type(cookies)}")
+        
+        # GET请求的data作为查询参数，其他方法按Content-Type决定以JSON还是表单形式发送
+        method = _normalize_method(method)
+        try:
+            if method == "GET":
+                params, body = data, None
+            elif headers and _is_json_content_type(headers.get("Content-Type", "")):
+                # 自行序列化JSON请求体（请求头中已带Content-Type），不经过requests内部的json.dumps；
+                # 含NaN等无法序列化的值时与请求失败一样返回
+                params, body = None, _dump_json_body(data) if data is not None else None
             else:
-                res = self.post(url, data=data, headers=headers, cookies=cookies)
+                params, body = None, data
+            res = self._session.request(
+                method,
+                self._prepare_url(url),
+                params=params,
+                data=body,
+                headers=headers,
+                cookies=cookies,
+                timeout=self.timeout,
+                verify=self.verify_ssl
+            )
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.error(f"请求失败: {method} {url}, 错误: {str(e)}")
+            return {'code': 0, 'headers': {}, 'body': {'hi': '请求失败'}, 'cookies': {}}
+        
+        if not parse_body:
+            # 调用方只关心状态码等信息时，跳过JSON解析
+            body = res.content
         else:
-            res = self.send_request(method, url, data=data, headers=headers, cookies=cookies)
+            # 直接从原始字节解析JSON，省去文本解码
+            try:
+                body = _json_loads(res.content)
+            except ValueError:
+                # orjson仅支持UTF-8，其他编码交给requests按响应编码解析
+                try:
+                    body = res.json()
+                except ValueError:
+                    body = {"hi": "无数据"}
+        
+        # 构造返回结果：headers直接使用不区分大小写的CaseInsensitiveDict，cookies按需读取
+        return {
+            'code': res.status_code,
+            'headers': res.headers,
+            'body': body,
+            'cookies': CookieJarView(res.cookies)
+        }
+    
+    # 向后兼容原有的send方法：直接作为api_run的别名，省去一层转发调用
+    send = api_run
+
+
+class AsyncHttpClient:
+    """
+    基于aiohttp的异步HTTP客户端
+    所有请求共享同一个ClientSession及其TCP连接池，单线程即可维持大量并发中的请求，
+    接口与RequestSend.api_run/send保持一致，便于替换；
+    http2=True时改用httpx.AsyncClient，同一源站的并发请求在少量连接上多路复用
+    """
+    
+    def __init__(self, 
+                 base_url: str = None, 
+                 timeout: float = 30,
+                 limit: int = 200,
+                 limit_per_host: int = 50,
+                 keepalive_timeout: float = 75,
+                 http2: bool = False,
+                 http2_max_connections: int = 100,
+                 http2_max_keepalive: int = 20):
+        """
+        初始化异步HTTP客户端
         
-        if res is None:
-            return {'code': 0, 'headers': {}, 'body': {'hi': '请求失败'}, 'cookies': {}}
+        Args:
+            base_url: 基础URL，用于拼接请求URL
+            timeout: 请求总超时时间（秒）
+            limit: 连接池最大连接数
+            limit_per_host: 单个主机的最大连接数
+            keepalive_timeout: 空闲连接保持时间（秒）
+            http2: 是否使用httpx的HTTP/2模式（需要安装httpx和h2）
+            http2_max_connections: HTTP/2模式下的最大连接数
+            http2_max_keepalive: HTTP/2模式下保持的最大空闲连接数
+        """
+        if http2:
+            if not HAS_HTTPX:
+                raise ImportError("httpx未安装，无法启用HTTP/2，请执行: pip install httpx h2")
+        elif not HAS_AIOHTTP:
+            raise ImportError("aiohttp未安装，无法使用AsyncHttpClient，请执行: pip install aiohttp")
+        self.base_url = base_url
+        self.timeout = timeout
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.http2 = http2
+        self.http2_max_connections = http2_max_connections
+        self.http2_max_keepalive = http2_max_keepalive
+        # 按请求失败处理的异常类型
+        self._request_errors = (httpx.HTTPError if http2 else aiohttp.ClientError, asyncio.TimeoutError)
+        self._session = None
+        self._loop = None  # 同步调用方式使用的事件循环
+    
+    def _prepare_url(self, url: str) -> str:
+        """
+        准备请求URL
+        
+        Args:
+            url: 请求URL
+            
+        Returns:
+            完整的请求URL
+        """
+        if self.base_url and not url.startswith(('http://', 'https://')):
+            return urljoin(self.base_url, url)
+        return url
+    
+    async def _get_session(self):
+        """
+        获取共享会话，首次使用（或已关闭）时在当前事件循环中创建
+        
+        Returns:
+            aiohttp.ClientSession实例（http2模式下为httpx.AsyncClient实例）
+        """
+        if self.http2:
+            if self._session is None or self._session.is_closed:
+                self._session = httpx.AsyncClient(
+                    http2=True,
+                    timeout=self.timeout,
+                    limits=httpx.Limits(
+                        max_connections=self.http2_max_connections,
+                        max_keepalive_connections=self.http2_max_keepalive,
+                        keepalive_expiry=self.keepalive_timeout
+                    )
+                )
+            return self._session
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                enable_cleanup_closed=True
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self._session
+    
+    async def api_run(self, url, method, data=None, headers=None, cookies=None, parse_body=True):
+        """
+        发送异步请求，返回结构与RequestSend.api_run相同
         
-        # 获取响应信息
-        code = res.status_code
-        cookies_dict = res.cookies.get_dict()
-        headers_dict = dict(res.headers)
-        print("头信息是", headers_dict)
+        Args:
+            url: 请求URL
+            method: 请求方法
+            data: 请求数据（GET请求作为查询参数，JSON请求头时作为JSON请求体）
+            headers: 请求头
+            cookies: cookies
+            parse_body: 是否将响应体解析为JSON，为False时body为原始响应字节
+            
+        Returns:
+            包含code、headers、body、cookies的字典
+        """
+        method = _normalize_method(method)
+        is_get = method == 'GET'
+        is_json = bool(headers) and _is_json_content_type(headers.get('Content-Type', ''))
+        request_kwargs = {
+            'params': data if is_get else None,
+            'json': data if not is_get and is_json else None,
+            'data': data if not is_get and not is_json else None,
+            'headers': headers,
+            'cookies': cookies
+        }
+        session = await self._get_session()
         
-        # 构造返回结果
-        dict1 = {}
         try:
-            body = res.json()
-        except:
-            body = {"hi": "无数据"}
+            if self.http2:
+                res = await session.request(method, self._prepare_url(url), **request_kwargs)
+                code, content = res.status_code, res.content
+                cookies_dict = dict(res.cookies)
+            else:
+                async with session.request(method, self._prepare_url(url), **request_kwargs) as res:
+                    code, content = res.status, await res.read()
+                    cookies_dict = {name: morsel.value for name, morsel in res.cookies.items()}
+        except self._request_errors as e:
+            logger.error(f"异步请求失败: {method} {url}, 错误: {str(e)}")
+            return {'code': 0, 'headers': {}, 'body': {'hi': '请求失败'}, 'cookies': {}}
+        
+        if not parse_body:
+            body = content
+        else:
+            try:
+                body = _json_loads(content)
+            except ValueError:
+                body = {"hi": "无数据"}
+        return {
+            'code': code,
+            'headers': dict(res.headers),
+            'body': body,
+            'cookies': cookies_dict
+        }
+    
+    # 与RequestSend.send对应的异步发送方法
+    send = api_run
+    
+    async def send_batch_requests(self, method: str, urls: List[str], **kwargs) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        并发发送批量请求
+        
+        Args:
+            method: 请求方法
+            urls: URL列表
+            **kwargs: 传递给api_run的其他参数（data、headers、cookies）
+            
+        Returns:
+            (URL, 响应字典)元组列表，顺序与urls一致
+        """
+        results = await asyncio.gather(*[self.api_run(url, method, **kwargs) for url in urls])
+        return list(zip(urls, results))
+    
+    async def send_multiple_paths(self, 
+                                  base_url: str, 
+                                  paths: List[str], 
+                                  method: str = 'GET', 
+                                  **kwargs) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        并发向同一基础URL的多个路径发送请求
         
-        dict1['code'] = code
-        dict1['headers'] = headers_dict
-        dict1['body'] = body
-        dict1['cookies'] = cookies_dict
+        Args:
+            base_url: 基础URL
+            paths: 路径列表
+            method: 请求方法
+            **kwargs: 传递给api_run的其他参数
+            
+        Returns:
+            (URL, 响应字典)元组列表
+        """
+        base = base_url.rstrip('/')
+        urls = [f"{base}/{path.lstrip('/')}" for path in paths]
+        return await self.send_batch_requests(method, urls, **kwargs)
+    
+    def run_sync(self, coro):
+        """
+        在客户端专用的事件循环中同步执行协程，供无法使用async的旧调用方使用
         
-        return dict1
+        Args:
+            coro: 协程对象，如 client.api_run(url, 'GET')
+            
+        Returns:
+            协程的返回值
+        """
+        # 会话绑定在创建它的事件循环上，因此同步调用始终复用同一个循环
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(coro)
+    
+    async def close(self) -> None:
+        """
+        关闭共享会话及其连接池
+        """
+        session = self._session
+        if session is not None:
+            if self.http2:
+                await session.aclose()
+            elif not session.closed:
+                await session.close()
+        self._session = None
+    
+    def close_sync(self) -> None:
+        """
+        同步关闭会话和run_sync使用的事件循环
+        """
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.run_until_complete(self.close())
+            self._loop.close()
+        self._loop = None
     
-    def send(self, url, method, **kwargs):
-        """向后兼容原有的send方法"""
-        return self.api_run(url=url, method=method, **kwargs)
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
 
 
 # 保持向后兼容的RequestsUtil类别名
 RequestsUtil = HttpClient
-
-# 测试代码
-if __name__ == '__main__':
-    # 测试多IP和多路径功能
-    client = HttpClient(
-        base_url="http://httpbin.org",
-        ip_list=["127.0.0.1", "192.168.1.1"]  # 示例IP列表
-    )
-    
-    # 测试单请求
-    response = client.get("/get")
-    print(f"单请求状态码: {response.status_code if response else 'None'}")
-    
-    # 测试多路径请求
-    paths = ["/get", "/headers", "/status/200"]
-    results = client.send_multiple_paths(
-        base_url="http://httpbin.org",
-        paths=paths,
-        method="GET"
-    )
-    
-    print("\n多路径请求结果:")
-    for url, resp in results:
-        print(f"URL: {url}, 状态码: {resp.status_code if resp else 'None'}")
-    
-    # 测试批量请求
-    urls = ["http://httpbin.org/get", "http://httpbin.org/post"]
-    batch_results = client.send_batch_requests(
-        method="GET",
-        urls=urls
-    )
-    
-    print("\n批量请求结果:")
-    for url, resp in batch_results:
-        print(f"URL: {url}, 状态码: {resp.status_code if resp else 'None'}")
-    
-    # 测试文件上传功能（模拟）
-    print("\n文件上传功能测试:")
-    try:
-        # 创建一个临时文件用于测试
-        temp_file_path = "temp_test.txt"
-        with open(temp_file_path, "w") as f:
-            f.write("This is a test file for upload")
-        
-        # 测试单文件上传
-        print("\n测试单文件上传:")
-        # 注意：这里只是演示API调用，实际上httpbin.org的/post接口会接收文件但不会真正保存
-        upload_response = client.post(
-            "/post",
-            files={"test_file": open(temp_file_path, "rb")}
-        )
-        print(f"上传状态码: {upload_response.status_code if upload_response else 'None'}")
-        
-        # 测试便捷上传方法
-        print("\n测试便捷上传方法:")
-        # 先关闭之前打开的文件
-        if 'test_file' in locals():
-            test_file.close()
-        
-        # 使用便捷方法上传
-        # 注意：这里只是演示API调用格式
-        print("upload_file方法API:")
-        print("client.upload_file('/post', temp_file_path, file_param='file')")
-        
-        print("\nupload_multiple_files方法API:")
-        print("client.upload_multiple_files('/post', {'file1': temp_file_path, 'file2': temp_file_path})")
-        
-    except Exception as e:
-        print(f"文件上传测试出错: {str(e)}")
-    finally:
-        # 清理临时文件
-        import os
-        if os.path.exists(temp_file_path):
-            try:
-                os.remove(temp_file_path)
-            except:
-                pass
\ No newline at end of file
@@ -2,21 +2,130 @@
 定时任务模块，支持定时执行测试用例和接口测试
 增强版支持：cron表达式、间隔调度、一次性任务、错误重试、状态跟踪和历史记录
 """
+import atexit
+import heapq
+import io
+import itertools
 import json
 import os
 import queue
 import time
 import threading
 import datetime
-from typing import Callable, Dict, Any, Optional, Union, List, Tuple
-from functools import wraps
-from concurrent.futures import ThreadPoolExecutor
-
-import schedule  # 需要安装: pip install schedule
-from croniter import croniter  # 需要安装: pip install croniter
+from collections import deque
+from typing import Callable, Dict, Any, NamedTuple, Optional, Union, List, Tuple
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
 
 from utils.logutil import logger
-from utils.concurrencyutil import ConcurrentExecutor
+
+# 尝试导入orjson以加速测试报告的序列化，如果不可用则使用标准库json
+try:
+    import orjson  # 需要安装: pip install orjson
+except ImportError:
+    orjson = None
+
+# 尝试导入ijson，用于只读取测试报告的摘要字段而不解析全部用例结果
+HAS_IJSON = False
+try:
+    import ijson  # 需要安装: pip install ijson
+    HAS_IJSON = True
+except ImportError:
+    pass
+
+
+# croniter只有cron任务才用得到，首次使用时再导入并构造缓存子类
+_croniter = None
+_CRON_EXPAND_ATTR = None
+_CachedCroniter = None
+
+
+@lru_cache(maxsize=512)
+def _expand_cron(expr_format: str, kwargs: tuple):
+    """解析cron表达式的各字段，相同表达式只做一次正则展开"""
+    return getattr(_croniter, _CRON_EXPAND_ATTR)(expr_format, **dict(kwargs))
+
+
+def _copy_cron_field(value):
+    """复制展开结果中的可变容器，croniter计算下次时间时会原地修改其中的集合"""
+    if isinstance(value, list):
+        return [list(v) if isinstance(v, list) else v for v in value]
+    if isinstance(value, dict):
+        return {k: set(v) if isinstance(v, set) else v for k, v in value.items()}
+    if isinstance(value, set):
+        return set(value)
+    return value
+
+
+def _cached_cron_expand(cls, expr_format, **kwargs):
+    # 以起始时间为基准展开的结果与时间相关，不走缓存
+    if kwargs.get('from_timestamp') is not None:
+        return getattr(_croniter, _CRON_EXPAND_ATTR)(expr_format, **kwargs)
+    
+    result = _expand_cron(expr_format, tuple(sorted(kwargs.items())))
+    return tuple(_copy_cron_field(value) for value in result)
+
+
+def _load_croniter():
+    """
+    导入croniter并返回复用已解析字段的子类
+    表达式不可变，多个任务共用同一表达式时只解析一次，构造和恢复任务都直接取缓存
+    
+    Returns:
+        croniter子类
+    """
+    global _croniter, _CRON_EXPAND_ATTR, _CachedCroniter
+    if _CachedCroniter is None:
+        from croniter import croniter  # 需要安装: pip install croniter
+        
+        class CachedCroniter(croniter):
+            pass
+        
+        # 新版croniter在构造时调用_expand，旧版调用expand（其内部同样委托给_expand）
+        expand_attr = '_expand' if hasattr(croniter, '_expand') else 'expand'
+        setattr(CachedCroniter, expand_attr, classmethod(_cached_cron_expand))
+        # 最后才发布子类，其他线程看到子类时基类和属性名都已就绪
+        _croniter, _CRON_EXPAND_ATTR = croniter, expand_attr
+        _CachedCroniter = CachedCroniter
+    return _CachedCroniter
+
+
+@lru_cache(maxsize=1024)
+def _validate_cron(expr_format: str) -> bool:
+    """校验cron表达式，非法表达式抛出异常；只缓存合法表达式的结果"""
+    _load_croniter()(expr_format)
+    return True
+
+
+@lru_cache(maxsize=4096)
+def _format_timestamp_ms(timestamp_ms: int) -> str:
+    """把毫秒时间戳格式化为ISO字符串，同一毫秒内的记录以及重复查询共用同一个字符串"""
+    return datetime.datetime.fromtimestamp(timestamp_ms / 1000).isoformat(timespec='milliseconds')
+
+
+class _TaskSpec(NamedTuple):
+    """
+    任务的不可变执行参数
+    添加任务时创建一次，每次到期时与重试次数组成(spec, retry_count)放入执行队列
+    """
+    task_id: int
+    func: Callable
+    args: tuple
+    kwargs: Dict[str, Any]
+    name: str
+    timeout: Optional[int]
+    max_retries: int
+
+
+class _TaskMeta(NamedTuple):
+    """任务创建后不再变化的元数据"""
+    task_id: int
+    name: str
+    type: str
+    expression: Optional[str]
+    created_at: datetime.datetime
+    timeout: Optional[int]
+    max_retries: int
 
 
 class TaskScheduler:
@@ -25,26 +134,79 @@ class TaskScheduler:
     支持任务状态跟踪、错误重试、执行历史记录和一次性任务
     """
     
-    def __init__(self):
-        self.tasks: Dict[str, Dict[str, Any]] = {}
-        self.scheduler = schedule
+    # 执行线程每次唤醒最多取出的任务数
+    _EXECUTION_BATCH_SIZE = 32
+    # 每个任务保留的执行历史条数
+    _HISTORY_SIZE = 100
+    # 定时堆中失效条目达到该数量且超过一半时重建定时堆
+    _TIMER_COMPACT_MIN = 64
+    
+    def __init__(self, max_workers: int = 10, queue_max: int = 10000):
+        """
+        初始化调度器
+        
+        Args:
+            max_workers: 并行执行任务的最大线程数
+            queue_max: 执行队列的最大长度，队列满时新到期的任务被丢弃
+        """
+        # 调度状态，仅供定时线程和增删改操作使用
+        # 内部统一以整数作为任务键，只在对外接口处转换为"task_<n>"形式的字符串
+        self.tasks: Dict[int, Dict[str, Any]] = {}
+        # 只读元数据，增删任务时整体替换；频繁变化的状态和计数按列存放
+        # 写操作持锁更新，读操作直接读取无需加锁
+        self._meta: Dict[int, _TaskMeta] = {}
+        self._status: Dict[int, str] = {}
+        self._success_count: Dict[int, int] = {}
+        self._fail_count: Dict[int, int] = {}
+        self._retry_dropped: Dict[int, int] = {}
+        self._last_run: Dict[int, float] = {}
+        self._last_result: Dict[int, Any] = {}
+        self._last_error: Dict[int, str] = {}
+        self._history: Dict[int, deque] = {}
+        self._columns = (self._status, self._success_count, self._fail_count, self._retry_dropped,
+                         self._last_run, self._last_result, self._last_error, self._history)
         self.running = False
-        self.scheduler_thread = None
-        self.lock = threading.RLock()
-        self.task_id_counter = 0
-        self.execution_queue = queue.Queue()
+        # 普通锁即可，持锁期间只调用*_locked方法，不会重入
+        self.lock = threading.Lock()
+        self._task_ids = itertools.count(1)
+        # 有界队列：任务执行跟不上触发频率时丢弃而不是无限堆积
+        self.execution_queue = queue.Queue(maxsize=queue_max)
         self.execution_thread = None
+        self.max_workers = max_workers
+        self._runner_pool = None
+        self._runner_slots = None
+        self._timeout_pool = None
         self._stop_event = threading.Event()
+        # 所有任务共用的定时堆: (下次执行的时间戳, 任务ID)，由单个定时线程按最早截止时间等待
+        self._timer_heap: List[Tuple[float, int]] = []
+        self._timer_cv = threading.Condition(self.lock)
+        self._timer_stale = 0
+        self._timer_thread = None
     
-    def _generate_task_id(self) -> str:
-        """生成唯一的任务ID"""
-        with self.lock:
-            self.task_id_counter += 1
-            return f"task_{int(time.time())}_{self.task_id_counter}"
+    def _generate_task_id(self) -> int:
+        """生成唯一的内部任务键，itertools.count的next在GIL下是原子的，无需加锁"""
+        return next(self._task_ids)
+    
+    @staticmethod
+    def _task_key(task_id: Union[int, str]) -> Optional[int]:
+        """
+        将对外的任务ID转换为内部整数键
+        
+        Args:
+            task_id: "task_<n>"形式的任务ID或整数键
+            
+        Returns:
+            内部整数键，无法识别时返回None
+        """
+        if isinstance(task_id, int):
+            return task_id
+        if isinstance(task_id, str) and task_id.startswith('task_') and task_id[5:].isdigit():
+            return int(task_id[5:])
+        return None
     
     def start(self):
         """
-        启动调度器线程和执行线程
+        启动定时线程和执行线程
         """
         if self.running:
             logger.warning("调度器已经在运行中")
@@ -53,15 +215,20 @@ class TaskScheduler:
         self.running = True
         self._stop_event.clear()
         
-        # 启动调度器线程
-        self.scheduler_thread = threading.Thread(target=self._run_scheduler, daemon=True)
-        self.scheduler_thread.start()
+        # 启动定时线程
+        self._timer_thread = threading.Thread(target=self._run_timer, daemon=True)
+        self._timer_thread.start()
         
-        # 启动执行线程
+        # 启动执行线程池和分发线程，各任务相互独立，到期后并行执行
+        self._runner_pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='sched-run')
+        # 限制已提交未完成的任务数，线程池忙时积压留在有界的执行队列中
+        self._runner_slots = threading.Semaphore(self.max_workers)
+        # 设置了超时的任务在常驻的超时线程池中执行，执行线程只负责等待结果，不再每次创建和销毁线程
+        self._timeout_pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='sched-to')
         self.execution_thread = threading.Thread(target=self._execution_worker, daemon=True)
         self.execution_thread.start()
         
-        logger.info("任务调度器已启动，包括调度线程和执行线程")
+        logger.info("任务调度器已启动，包括定时线程和执行线程")
     
     def stop(self):
         """
@@ -71,150 +238,339 @@ class TaskScheduler:
             logger.warning("调度器已经停止")
             return
         
-        self.running = False
+        with self._timer_cv:
+            self.running = False
+            self._timer_cv.notify_all()
         self._stop_event.set()
         
-        # 等待调度线程结束
-        if self.scheduler_thread:
-            self.scheduler_thread.join(timeout=5)
+        # 等待定时线程结束
+        if self._timer_thread:
+            self._timer_thread.join(timeout=5)
         
         # 等待执行线程结束
         if self.execution_thread:
             self.execution_thread.join(timeout=5)
         
-        self.scheduler.clear()
+        # 不等待正在执行的任务，只是不再接收新任务
+        if self._runner_pool:
+            self._runner_pool.shutdown(wait=False)
+        if self._timeout_pool:
+            self._timeout_pool.shutdown(wait=False)
+        
         with self.lock:
             self.tasks.clear()
+            self._meta = {}
+            for column in self._columns:
+                column.clear()
+            self._timer_heap.clear()
+            self._timer_stale = 0
         
         logger.info("任务调度器已停止")
     
-    def _run_scheduler(self):
+    def _run_timer(self):
         """
-        调度器线程运行函数
+        定时线程运行函数
+        睡眠到堆顶任务的截止时间，醒来后批量取出所有到期任务放入执行队列
         """
-        while self.running:
-            try:
-                self.scheduler.run_pending()
-            except Exception as e:
-                logger.error(f"调度器运行出错: {str(e)}")
-            time.sleep(1)
+        heap = self._timer_heap
+        with self._timer_cv:
+            while self.running:
+                now = time.time()
+                while heap and heap[0][0] <= now:
+                    next_run, task_id = heapq.heappop(heap)
+                    try:
+                        self._fire_timer_locked(next_run, task_id)
+                    except Exception as e:
+                        logger.error(f"定时任务 task_{task_id} 触发出错: {str(e)}")
+                
+                timeout = heap[0][0] - time.time() if heap else None
+                self._timer_cv.wait(timeout)
+    
+    def _fire_timer_locked(self, next_run: float, task_id: int):
+        """
+        处理一个到期的堆条目，调用方需持有self.lock
+        
+        已移除、已暂停或时间戳已过期（暂停后恢复留下的旧条目）的任务直接跳过
+        
+        Args:
+            next_run: 堆条目中的执行时间戳
+            task_id: 内部任务键
+        """
+        task = self.tasks.get(task_id)
+        if task is None or not task['active'] or task.get('_next_run_ts') != next_run:
+            if self._timer_stale:
+                self._timer_stale -= 1
+            return
+        
+        for spec in task['_specs']:
+            self._enqueue_locked(spec)
+        
+        task_type = task['type']
+        if task_type == 'cron':
+            next_ts = task['_cron_iter'].get_next(float)
+        elif task_type == 'interval':
+            # 以上次计划时间为基准累加，不受触发延迟影响；落后超过一个周期时跳过错过的周期
+            period = task['_period']
+            next_ts = next_run + period
+            now = time.time()
+            if next_ts <= now:
+                next_ts += ((now - next_ts) // period + 1) * period
+        else:
+            # 一次性任务触发后不再放回定时堆，也不能再恢复
+            task['_next_run_ts'] = None
+            task['_fired'] = True
+            task['active'] = False
+            return
+        
+        task['_next_run_ts'] = next_ts
+        heapq.heappush(self._timer_heap, (next_ts, task_id))
+    
+    def _push_timer_locked(self, task_id: int, next_run: float):
+        """
+        将任务放入定时堆并唤醒定时线程，调用方需持有self.lock
+        
+        Args:
+            task_id: 内部任务键
+            next_run: 下次执行的时间戳
+        """
+        task = self.tasks[task_id]
+        task['_next_run_ts'] = next_run
+        heapq.heappush(self._timer_heap, (next_run, task_id))
+        self._timer_cv.notify()
+    
+    def _discard_timer_locked(self):
+        """
+        记录定时堆中一个失效的条目，调用方需持有self.lock
+        
+        移除或暂停任务时堆条目只做惰性跳过，长周期任务的条目会一直留到截止时间；
+        失效条目超过堆的一半时过滤后重建，堆的大小始终与活跃任务数同阶
+        """
+        self._timer_stale += 1
+        heap = self._timer_heap
+        if self._timer_stale < self._TIMER_COMPACT_MIN or self._timer_stale * 2 <= len(heap):
+            return
+        
+        tasks = self.tasks
+        heap[:] = [
+            (next_run, task_id) for next_run, task_id in heap
+            if task_id in tasks and tasks[task_id]['active'] and tasks[task_id].get('_next_run_ts') == next_run
+        ]
+        heapq.heapify(heap)
+        self._timer_stale = 0
+    
+    def _add_task_locked(self, task_id: int, task_type: str, name: str, specs: Tuple[_TaskSpec, ...],
+                         next_run: float, timeout: Optional[int], max_retries: int,
+                         expression: Optional[str] = None, **schedule_state):
+        """
+        登记新任务并放入定时堆，调用方需持有self.lock
+        
+        Args:
+            task_id: 内部任务键
+            task_type: 任务类型，interval、cron或one_time
+            name: 任务名称
+            specs: 每次到期时放入执行队列的任务执行参数
+            next_run: 首次执行的时间戳
+            timeout: 任务超时时间（秒）
+            max_retries: 最大重试次数
+            expression: cron表达式
+            **schedule_state: 各类型任务自己的调度状态，如_period、_cron_iter、_deadline
+        """
+        self.tasks[task_id] = dict(schedule_state, type=task_type, name=name, expression=expression,
+                                   active=True, _specs=specs)
+        
+        meta = dict(self._meta)
+        meta[task_id] = _TaskMeta(task_id, name, task_type, expression, datetime.datetime.now(), timeout, max_retries)
+        self._meta = meta
+        
+        self._status[task_id] = 'idle'  # idle, running, success, failed
+        self._success_count[task_id] = 0
+        self._fail_count[task_id] = 0
+        self._retry_dropped[task_id] = 0
+        self._history[task_id] = deque(maxlen=self._HISTORY_SIZE)
+        
+        self._push_timer_locked(task_id, next_run)
     
     def _execution_worker(self):
         """
-        任务执行工作线程
-        负责从队列中取出任务并执行，支持超时控制
+        任务分发线程
+        负责从队列中批量取出任务，合并在一次加锁中标记为运行中，再提交到执行线程池
         """
+        execution_queue = self.execution_queue
         while not self._stop_event.is_set():
             try:
-                task_info = self.execution_queue.get(timeout=1)
-                task_id = task_info['task_id']
-                func = task_info['func']
-                args = task_info['args']
-                kwargs = task_info['kwargs']
-                timeout = task_info.get('timeout')
-                max_retries = task_info.get('max_retries', 0)
-                retry_count = task_info.get('retry_count', 0)
-                
-                try:
-                    # 更新任务状态为运行中
-                    with self.lock:
-                        if task_id in self.tasks:
-                            self.tasks[task_id]['status'] = 'running'
-                            self.tasks[task_id]['last_run_time'] = datetime.datetime.now()
-                    
-                    logger.info(f"开始执行任务 {task_id}: {task_info.get('name')}")
-                    start_time = time.time()
-                    
-                    # 支持超时控制
-                    if timeout:
-                        with ThreadPoolExecutor(max_workers=1) as executor:
-                            future = executor.submit(func, *args, **kwargs)
-                            result = future.result(timeout=timeout)
-                    else:
-                        result = func(*args, **kwargs)
-                    
-                    duration = time.time() - start_time
-                    
-                    # 更新任务状态为成功
-                    with self.lock:
-                        if task_id in self.tasks:
-                            task = self.tasks[task_id]
-                            task['status'] = 'success'
-                            task['success_count'] = task.get('success_count', 0) + 1
-                            task['last_result'] = result
-                            task['retry_count'] = 0
-                            
-                            # 更新执行历史
-                            self._update_execution_history(task_id, True, result, duration)
-                    
-                    logger.info(f"任务 {task_id} 执行成功，耗时: {duration:.2f}秒")
-                    
-                except Exception as e:
-                    duration = time.time() - start_time
-                    error_msg = str(e)
-                    
-                    logger.error(f"任务 {task_id} 执行失败: {error_msg}")
-                    
-                    # 错误重试逻辑
-                    if retry_count < max_retries:
-                        retry_count += 1
-                        logger.info(f"任务 {task_id} 将进行第 {retry_count}/{max_retries} 次重试")
-                        
-                        # 重新放入队列进行重试
-                        task_info['retry_count'] = retry_count
-                        self.execution_queue.put(task_info)
-                    else:
-                        # 更新任务状态为失败
-                        with self.lock:
-                            if task_id in self.tasks:
-                                task = self.tasks[task_id]
-                                task['status'] = 'failed'
-                                task['fail_count'] = task.get('fail_count', 0) + 1
-                                task['last_error'] = error_msg
-                                task['retry_count'] = 0
-                                
-                                # 更新执行历史
-                                self._update_execution_history(task_id, False, error_msg, duration)
-                    
-                finally:
-                    self.execution_queue.task_done()
-                    
+                batch = [execution_queue.get(timeout=1)]
             except queue.Empty:
                 # 队列为空，继续等待
-                pass
+                continue
+            
+            try:
+                while len(batch) < self._EXECUTION_BATCH_SIZE:
+                    try:
+                        batch.append(execution_queue.get_nowait())
+                    except queue.Empty:
+                        break
+                
+                # 更新任务状态为运行中，时间只记录时间戳，查询时再转换为datetime
+                start_time = time.time()
+                status, last_run = self._status, self._last_run
+                with self.lock:
+                    for spec, _ in batch:
+                        task_id = spec.task_id
+                        if task_id in status:
+                            status[task_id] = 'running'
+                            last_run[task_id] = start_time
+                
+                for spec, retry_count in batch:
+                    self._runner_slots.acquire()
+                    try:
+                        self._runner_pool.submit(self._run_one, spec, retry_count)
+                    except Exception:
+                        self._runner_slots.release()
+                        raise
             except Exception as e:
                 logger.error(f"执行工作线程发生异常: {str(e)}")
+            finally:
+                for _ in batch:
+                    execution_queue.task_done()
     
-    def _update_execution_history(self, task_id: str, success: bool, 
-                               result: Any = None, duration: float = 0):
+    def _run_one(self, spec: _TaskSpec, retry_count: int):
         """
-        更新任务执行历史
+        在执行线程池中运行单个任务并写回结果
         
         Args:
-            task_id: 任务ID
-            success: 是否成功
-            result: 执行结果或错误信息
-            duration: 执行时长
+            spec: 任务执行参数
+            retry_count: 本次执行对应的重试次数
         """
-        with self.lock:
-            if task_id in self.tasks:
-                task = self.tasks[task_id]
+        try:
+            outcome = self._run_task(spec, retry_count)
+            if outcome is not None:
+                task_id, success, result, duration = outcome
+                # 历史记录在锁外构造，时间只取毫秒时间戳，查询时再格式化
                 history_item = {
-                    'timestamp': datetime.datetime.now().isoformat(),
+                    'timestamp': int(time.time() * 1000),
                     'success': success,
-                    'result': str(result)[:1000],  # 限制长度
+                    'result': (result if isinstance(result, str) else str(result))[:1000],  # 限制长度
                     'duration': duration,
-                    'retry_count': task.get('retry_count', 0)
+                    'retry_count': retry_count
                 }
+                with self.lock:
+                    self._record_result_locked(task_id, success, result, history_item)
+        except Exception as e:
+            logger.error(f"任务 task_{spec.task_id} 写回执行结果时发生异常: {str(e)}")
+        finally:
+            self._runner_slots.release()
+    
+    def _run_task(self, spec: _TaskSpec, retry_count: int) -> Optional[Tuple[int, bool, Any, float]]:
+        """
+        执行单个任务，失败且未用完重试次数时重新放入队列
+        
+        Args:
+            spec: 任务执行参数
+            retry_count: 本次执行对应的重试次数
+            
+        Returns:
+            (任务ID, 是否成功, 执行结果或错误信息, 执行时长)，进入重试时返回None
+        """
+        task_id, func, args, kwargs, name, timeout, max_retries = spec
+        
+        logger.info(f"开始执行任务 task_{task_id}: {name}")
+        start_time = time.time()
+        
+        try:
+            # 支持超时控制，超时后不再等待函数结束，已开始执行的函数无法被强制中断
+            if timeout:
+                future = self._timeout_pool.submit(func, *args, **kwargs)
+                try:
+                    result = future.result(timeout=timeout)
+                except FuturesTimeoutError:
+                    future.cancel()
+                    raise TimeoutError(f"任务执行超时（{timeout}秒）")
+            else:
+                result = func(*args, **kwargs)
+        except Exception as e:
+            duration = time.time() - start_time
+            error_msg = str(e)
+            
+            logger.error(f"任务 task_{task_id} 执行失败: {error_msg}")
+            
+            # 错误重试逻辑
+            if retry_count < max_retries:
+                retry_count += 1
+                logger.info(f"任务 task_{task_id} 将进行第 {retry_count}/{max_retries} 次重试")
                 
-                # 初始化或获取执行历史
-                if 'execution_history' not in task:
-                    task['execution_history'] = []
-                
-                # 只保留最近100条历史记录
-                task['execution_history'].append(history_item)
-                if len(task['execution_history']) > 100:
-                    task['execution_history'].pop(0)
+                # 重新放入队列进行重试，队列已满时放弃重试并按失败处理
+                try:
+                    self.execution_queue.put_nowait((spec, retry_count))
+                    return None
+                except queue.Full:
+                    logger.warning(f"执行队列已满，放弃任务 task_{task_id} 的重试")
+                    with self.lock:
+                        if task_id in self._retry_dropped:
+                            self._retry_dropped[task_id] += 1
+            
+            return task_id, False, error_msg, duration
+        
+        duration = time.time() - start_time
+        logger.info(f"任务 task_{task_id} 执行成功，耗时: {duration:.2f}秒")
+        return task_id, True, result, duration
+    
+    def _enqueue_locked(self, spec: _TaskSpec) -> bool:
+        """
+        将到期任务放入执行队列，队列已满时丢弃并计为一次失败，调用方需持有self.lock
+        
+        Args:
+            spec: 任务执行参数
+            
+        Returns:
+            是否成功入队
+        """
+        try:
+            self.execution_queue.put_nowait((spec, 0))
+            return True
+        except queue.Full:
+            task_id = spec.task_id
+            logger.warning(f"执行队列已满，丢弃任务 task_{task_id}")
+            if task_id in self._fail_count:
+                self._fail_count[task_id] += 1
+            return False
+    
+    def _record_result_locked(self, task_id: int, success: bool, result: Any, history_item: Dict[str, Any]):
+        """
+        写回任务的执行结果，调用方需持有self.lock
+        
+        Args:
+            task_id: 内部任务键
+            success: 是否成功
+            result: 执行结果或错误信息
+            history_item: 已构造好的执行历史记录
+        """
+        if task_id not in self.tasks:
+            return
+        
+        if success:
+            self._status[task_id] = 'success'
+            self._success_count[task_id] += 1
+            self._last_result[task_id] = result
+        else:
+            self._status[task_id] = 'failed'
+            self._fail_count[task_id] += 1
+            self._last_error[task_id] = result
+        
+        # 更新执行历史
+        self._update_execution_history_locked(task_id, history_item)
+    
+    def _update_execution_history_locked(self, task_id: int, history_item: Dict[str, Any]):
+        """
+        更新任务执行历史，调用方需持有self.lock
+        
+        Args:
+            task_id: 内部任务键
+            history_item: 执行历史记录，包含时间戳、是否成功、结果、耗时和重试次数
+        """
+        history = self._history.get(task_id)
+        if history is not None:
+            # 执行历史为定长队列，只保留最近100条记录
+            history.append(history_item)
     
     def add_interval_task(self, 
                          func: Callable, 
@@ -245,56 +601,56 @@ class TaskScheduler:
         Returns:
             任务ID
         """
+        period = seconds + minutes * 60 + hours * 3600 + days * 86400
+        if period <= 0:
+            raise ValueError("间隔时间必须大于0")
+        
         task_id = self._generate_task_id()
-        kwargs = kwargs or {}
         name = task_name or func.__name__
+        spec = _TaskSpec(task_id, func, args, kwargs or {}, name, timeout, max_retries)
         
-        # 创建任务执行包装函数
-        @wraps(func)
-        def task_wrapper():
-            task_info = {
-                'task_id': task_id,
-                'func': func,
-                'args': args,
-                'kwargs': kwargs,
-                'name': name,
-                'timeout': timeout,
-                'max_retries': max_retries,
-                'retry_count': 0
-            }
-            # 将任务放入执行队列
-            self.execution_queue.put(task_info)
-        
-        # 创建定时任务
-        job = self.scheduler.every()
-        if days > 0:
-            job = job.days
-        elif hours > 0:
-            job = job.hours
-        elif minutes > 0:
-            job = job.minutes
-        else:
-            job = job.seconds
+        with self._timer_cv:
+            self._add_task_locked(task_id, 'interval', name, (spec,), time.time() + period,
+                                  timeout, max_retries, _period=period)
         
-        job = job.do(task_wrapper)
+        logger.info(f"添加固定间隔任务 task_{task_id}: {name}, 间隔: {period}秒, 超时: {timeout}秒, 重试: {max_retries}次")
+        return f"task_{task_id}"
+    
+    def add_interval_group(self,
+                           funcs: List[Callable],
+                           seconds: int,
+                           task_name: Optional[str] = None,
+                           timeout: Optional[int] = None,
+                           max_retries: int = 0) -> str:
+        """
+        添加一组相同间隔的任务，整组只占用一个定时堆条目
+        每次到期时把组内所有函数分别放入执行队列，由执行线程池并行执行
         
-        with self.lock:
-            self.tasks[task_id] = {
-                'job': job,
-                'func': func,
-                'type': 'interval',
-                'name': name,
-                'created_at': datetime.datetime.now(),
-                'active': True,
-                'timeout': timeout,
-                'max_retries': max_retries,
-                'status': 'idle',  # idle, running, success, failed
-                'success_count': 0,
-                'fail_count': 0
-            }
-        
-        logger.info(f"添加固定间隔任务 {task_id}: {name}, 超时: {timeout}秒, 重试: {max_retries}次")
-        return task_id
+        Args:
+            funcs: 要执行的函数列表
+            seconds: 秒间隔
+            task_name: 任务组名称
+            timeout: 每个函数的超时时间（秒）
+            max_retries: 每个函数的最大重试次数
+            
+        Returns:
+            任务ID，组内函数的执行结果和历史都记录在该任务下
+        """
+        if not funcs:
+            raise ValueError("任务组不能为空")
+        if seconds <= 0:
+            raise ValueError("间隔时间必须大于0")
+        
+        task_id = self._generate_task_id()
+        name = task_name or f"任务组({len(funcs)}个任务)"
+        specs = tuple(_TaskSpec(task_id, func, (), {}, func.__name__, timeout, max_retries) for func in funcs)
+        
+        with self._timer_cv:
+            self._add_task_locked(task_id, 'interval', name, specs, time.time() + seconds,
+                                  timeout, max_retries, _period=seconds)
+        
+        logger.info(f"添加固定间隔任务组 task_{task_id}: {name}, 函数数: {len(funcs)}, 间隔: {seconds}秒")
+        return f"task_{task_id}"
     
     def add_cron_task(self, 
                      func: Callable,
@@ -319,204 +675,143 @@ class TaskScheduler:
         Returns:
             任务ID
         """
-        # 验证cron表达式
+        # 验证cron表达式，合法表达式的校验结果和展开字段都已缓存，后面构造迭代器时不再重复解析
         try:
-            croniter(cron_expression, datetime.datetime.now())
+            _validate_cron(cron_expression)
         except Exception as e:
             logger.error(f"无效的cron表达式: {cron_expression}, 错误: {str(e)}")
             raise ValueError(f"无效的cron表达式: {cron_expression}")
         
         task_id = self._generate_task_id()
-        kwargs = kwargs or {}
         name = task_name or func.__name__
+        spec = _TaskSpec(task_id, func, args, kwargs or {}, name, timeout, max_retries)
         
-        # 创建任务执行包装函数
-        def task_executor():
-            task_info = {
-                'task_id': task_id,
-                'func': func,
-                'args': args,
-                'kwargs': kwargs,
-                'name': name,
-                'timeout': timeout,
-                'max_retries': max_retries,
-                'retry_count': 0
-            }
-            # 将任务放入执行队列
-            self.execution_queue.put(task_info)
-        
-        # 使用schedule库的every().do()配合自定义的cron检查
-        # 我们将使用一个每秒检查的任务来检查cron表达式
-        cron = croniter(cron_expression, datetime.datetime.now())
-        next_run = cron.get_next(datetime.datetime)
-        
-        @wraps(func)
-        def cron_checker():
-            nonlocal next_run
-            now = datetime.datetime.now()
-            if now >= next_run:
-                task_executor()
-                next_run = cron.get_next(datetime.datetime)
-        
-        job = self.scheduler.every(1).seconds.do(cron_checker)
+        # 使用带时区的本地时间，get_next(float)返回真实的时间戳，同时按本地时间解释cron表达式
+        cron = _load_croniter()(cron_expression, datetime.datetime.now().astimezone())
         
-        with self.lock:
-            self.tasks[task_id] = {
-                'job': job,
-                'func': func,
-                'type': 'cron',
-                'expression': cron_expression,
-                'name': name,
-                'created_at': datetime.datetime.now(),
-                'active': True,
-                'timeout': timeout,
-                'max_retries': max_retries,
-                'status': 'idle',
-                'success_count': 0,
-                'fail_count': 0,
-                '_cron_iter': cron,
-                '_next_run': next_run
-            }
-        
-        logger.info(f"添加cron任务 {task_id}: {name}, 表达式: {cron_expression}, 超时: {timeout}秒, 重试: {max_retries}次")
-        return task_id
+        with self._timer_cv:
+            self._add_task_locked(task_id, 'cron', name, (spec,), cron.get_next(float),
+                                  timeout, max_retries, expression=cron_expression, _cron_iter=cron)
+        
+        logger.info(f"添加cron任务 task_{task_id}: {name}, 表达式: {cron_expression}, 超时: {timeout}秒, 重试: {max_retries}次")
+        return f"task_{task_id}"
     
-    def remove_task(self, task_id: str) -> bool:
+    def remove_task(self, task_id: Union[int, str]) -> bool:
         """
         移除定时任务
         
         Args:
-            task_id: 任务ID
+            task_id: 任务ID，"task_<n>"形式的字符串或整数键
             
         Returns:
             是否成功移除
         """
+        key = self._task_key(task_id)
         with self.lock:
-            if task_id not in self.tasks:
+            if key not in self.tasks:
                 logger.warning(f"任务 {task_id} 不存在")
                 return False
             
-            task_info = self.tasks.pop(task_id)
-            self.scheduler.cancel_job(task_info['job'])
+            # 堆中的条目不做删除，到期时发现任务已不存在会被惰性跳过
+            task_info = self.tasks.pop(key)
+            if task_info['active']:
+                self._discard_timer_locked()
+            
+            meta = dict(self._meta)
+            del meta[key]
+            self._meta = meta
+            for column in self._columns:
+                column.pop(key, None)
         
         logger.info(f"移除任务 {task_id}: {task_info['name']}")
         return True
     
-    def pause_task(self, task_id: str) -> bool:
+    def pause_task(self, task_id: Union[int, str]) -> bool:
         """
         暂停定时任务
         
         Args:
-            task_id: 任务ID
+            task_id: 任务ID，"task_<n>"形式的字符串或整数键
             
         Returns:
             是否成功暂停
         """
+        key = self._task_key(task_id)
         with self.lock:
-            if task_id not in self.tasks:
+            if key not in self.tasks:
                 logger.warning(f"任务 {task_id} 不存在")
                 return False
             
-            task_info = self.tasks[task_id]
+            task_info = self.tasks[key]
+            if task_info.get('_fired'):
+                logger.warning(f"一次性任务 {task_id} 已经执行过")
+                return False
             if not task_info.get('active', True):
                 logger.warning(f"任务 {task_id} 已经处于暂停状态")
                 return False
             
-            self.scheduler.cancel_job(task_info['job'])
+            # 暂停只清除活跃标记，堆中的条目到期时被惰性跳过
             task_info['active'] = False
+            self._discard_timer_locked()
         
         logger.info(f"暂停任务 {task_id}: {task_info['name']}")
         return True
     
-    def resume_task(self, task_id: str) -> bool:
+    def resume_task(self, task_id: Union[int, str]) -> bool:
         """
         恢复定时任务
         
         Args:
-            task_id: 任务ID
+            task_id: 任务ID，"task_<n>"形式的字符串或整数键
             
         Returns:
             是否成功恢复
         """
+        key = self._task_key(task_id)
         with self.lock:
-            if task_id not in self.tasks:
+            if key not in self.tasks:
                 logger.warning(f"任务 {task_id} 不存在")
                 return False
             
-            task_info = self.tasks[task_id]
+            task_info = self.tasks[key]
+            if task_info.get('_fired'):
+                logger.warning(f"一次性任务 {task_id} 已经执行过，无法恢复")
+                return False
             if task_info.get('active', True):
                 logger.warning(f"任务 {task_id} 已经处于运行状态")
                 return False
             
-            # 重新创建任务
+            # 重新放回定时堆，暂停前留下的旧条目因时间戳不匹配被跳过
             if task_info['type'] == 'interval':
-                # 重新计算间隔参数（这里简化处理，实际可能需要更复杂的计算）
-                # 由于schedule库的限制，我们简单地重新添加任务
-                task_info['job'] = self.scheduler.every(1).seconds.do(task_info['func'])
+                self._push_timer_locked(key, time.time() + task_info['_period'])
+            elif task_info['type'] == 'one_time':
+                # 一次性任务按添加时确定的截止时间执行，暂停期间已过截止时间则立即执行
+                self._push_timer_locked(key, max(task_info['_deadline'], time.time()))
             elif task_info['type'] == 'cron':
-                # 对于cron任务，重新创建cron迭代器
-                cron = croniter(task_info['expression'], datetime.datetime.now())
+                # 对于cron任务，从当前时间重新创建cron迭代器并放回定时堆
+                cron = _load_croniter()(task_info['expression'], datetime.datetime.now().astimezone())
                 task_info['_cron_iter'] = cron
-                task_info['_next_run'] = cron.get_next(datetime.datetime)
-                
-                @wraps(task_info['func'])
-                def cron_checker():
-                    nonlocal task_info
-                    now = datetime.datetime.now()
-                    if now >= task_info['_next_run']:
-                        try:
-                            task_info['func']()
-                        except Exception as e:
-                            logger.error(f"cron任务 {task_id} 执行失败: {str(e)}")
-                        task_info['_next_run'] = task_info['_cron_iter'].get_next(datetime.datetime)
-                
-                task_info['job'] = self.scheduler.every(1).seconds.do(cron_checker)
+                self._push_timer_locked(key, cron.get_next(float))
             
             task_info['active'] = True
         
         logger.info(f"恢复任务 {task_id}: {task_info['name']}")
         return True
     
-    def get_task_info(self, task_id: str) -> Optional[Dict[str, Any]]:
+    def get_task_info(self, task_id: Union[int, str]) -> Optional[Dict[str, Any]]:
         """
         获取任务信息
         
         Args:
-            task_id: 任务ID
+            task_id: 任务ID，"task_<n>"形式的字符串或整数键
             
         Returns:
             任务信息字典
         """
-        with self.lock:
-            task_info = self.tasks.get(task_id)
-            if not task_info:
-                return None
-            
-            # 返回安全的任务信息副本，包含状态和重试信息
-            result = {
-                'task_id': task_id,
-                'name': task_info['name'],
-                'type': task_info['type'],
-                'active': task_info['active'],
-                'created_at': task_info['created_at'],
-                'expression': task_info.get('expression'),
-                'next_run': task_info.get('_next_run'),
-                'status': task_info.get('status', 'idle'),
-                'success_count': task_info.get('success_count', 0),
-                'fail_count': task_info.get('fail_count', 0),
-                'max_retries': task_info.get('max_retries', 0),
-                'timeout': task_info.get('timeout')
-            }
-            
-            # 添加最近的执行结果
-            if 'last_result' in task_info:
-                result['last_result'] = task_info['last_result']
-            if 'last_error' in task_info:
-                result['last_error'] = task_info['last_error']
-            if 'last_run_time' in task_info:
-                result['last_run_time'] = task_info['last_run_time']
-                
-            return result
+        meta = self._meta.get(self._task_key(task_id))
+        if meta is None:
+            return None
+        return self._format_task_info(meta)
     
     def list_tasks(self) -> List[Dict[str, Any]]:
         """
@@ -526,12 +821,59 @@ class TaskScheduler:
             任务信息列表
         """
         tasks = []
-        with self.lock:
-            for task_id in self.tasks:
-                task_info = self.get_task_info(task_id)
-                if task_info:
-                    tasks.append(task_info)
+        for meta in list(self._meta.values()):
+            task_info = self._format_task_info(meta)
+            if task_info:
+                tasks.append(task_info)
         return tasks
+    
+    def _format_task_info(self, meta: _TaskMeta) -> Optional[Dict[str, Any]]:
+        """
+        按列读取任务的当前状态，组装成对外返回的任务信息副本
+        不加锁，时间戳在此处转换为datetime，并附带当前执行队列的积压长度
+        
+        Args:
+            meta: 任务元数据
+            
+        Returns:
+            任务信息字典，任务已被并发移除时返回None
+        """
+        task_id = meta.task_id
+        task = self.tasks.get(task_id)
+        history = self._history.get(task_id)
+        if task is None or history is None:
+            return None
+        
+        next_run_ts = task.get('_next_run_ts')
+        result = {
+            'task_id': f"task_{task_id}",
+            'name': meta.name,
+            'type': meta.type,
+            'active': task['active'],
+            'created_at': meta.created_at,
+            'expression': meta.expression,
+            'next_run': datetime.datetime.fromtimestamp(next_run_ts) if next_run_ts is not None else None,
+            'status': self._status.get(task_id, 'idle'),
+            'success_count': self._success_count.get(task_id, 0),
+            'fail_count': self._fail_count.get(task_id, 0),
+            'retry_dropped': self._retry_dropped.get(task_id, 0),
+            'max_retries': meta.max_retries,
+            'timeout': meta.timeout,
+            'execution_history': [
+                dict(item, timestamp=_format_timestamp_ms(item['timestamp']))
+                for item in list(history)
+            ]
+        }
+        
+        # 添加最近的执行结果
+        if task_id in self._last_result:
+            result['last_result'] = self._last_result[task_id]
+        if task_id in self._last_error:
+            result['last_error'] = self._last_error[task_id]
+        if task_id in self._last_run:
+            result['last_run_time'] = datetime.datetime.fromtimestamp(self._last_run[task_id])
+        result['queue_depth'] = self.execution_queue.qsize()
+        return result
         
     def add_one_time_task(self, 
                          func: Callable,
@@ -557,50 +899,16 @@ class TaskScheduler:
             任务ID
         """
         task_id = self._generate_task_id()
-        kwargs = kwargs or {}
         name = task_name or func.__name__
+        spec = _TaskSpec(task_id, func, args, kwargs or {}, name, timeout, max_retries)
+        deadline = time.time() + delay_seconds
         
-        # 创建任务执行包装函数
-        @wraps(func)
-        def task_wrapper():
-            task_info = {
-                'task_id': task_id,
-                'func': func,
-                'args': args,
-                'kwargs': kwargs,
-                'name': name,
-                'timeout': timeout,
-                'max_retries': max_retries,
-                'retry_count': 0
-            }
-            # 将任务放入执行队列
-            self.execution_queue.put(task_info)
-            
-            # 执行完成后移除任务（在实际执行后）
-            with self.lock:
-                if task_id in self.tasks:
-                    self.scheduler.cancel_job(self.tasks[task_id]['job'])
-        
-        # 创建一次性任务
-        job = self.scheduler.every(delay_seconds).seconds.do(task_wrapper)
+        with self._timer_cv:
+            self._add_task_locked(task_id, 'one_time', name, (spec,), deadline,
+                                  timeout, max_retries, _deadline=deadline)
         
-        with self.lock:
-            self.tasks[task_id] = {
-                'job': job,
-                'func': func,
-                'type': 'one_time',
-                'name': name,
-                'created_at': datetime.datetime.now(),
-                'active': True,
-                'timeout': timeout,
-                'max_retries': max_retries,
-                'status': 'idle',
-                'success_count': 0,
-                'fail_count': 0
-            }
-        
-        logger.info(f"添加一次性任务 {task_id}: {name}, 延迟: {delay_seconds}秒, 超时: {timeout}秒, 重试: {max_retries}次")
-        return task_id
+        logger.info(f"添加一次性任务 task_{task_id}: {name}, 延迟: {delay_seconds}秒, 超时: {timeout}秒, 重试: {max_retries}次")
+        return f"task_{task_id}"
 
 
 class ApiTaskScheduler:
@@ -648,15 +956,7 @@ class ApiTaskScheduler:
         if task_name is None:
             task_name = f"{method.upper()} {url}"
         
-        def api_test_task():
-            try:
-                logger.info(f"执行API测试: {task_name}")
-                response = client.send_request(method, url, **request_kwargs)
-                if response:
-                    logger.info(f"API测试结果 - URL: {url}, 状态码: {response.status_code}, 响应时间: {response.elapsed.total_seconds():.3f}s")
-                return response
-            except Exception as e:
-                logger.error(f"API测试失败: {str(e)}")
+        api_test_task = self._make_api_test(client, method, url, task_name, request_kwargs)
         
         if schedule_type == 'interval':
             return self.scheduler.add_interval_task(
@@ -732,17 +1032,75 @@ class ApiTaskScheduler:
         else:
             raise ValueError(f"不支持的调度类型: {schedule_type}")
     
+    def schedule_api_tests(self,
+                           client,  # HttpClient实例
+                           test_configs: List[Dict[str, Any]],
+                           interval_seconds: int = 60,
+                           task_name: Optional[str] = None) -> str:
+        """
+        以相同间隔调度多个API测试，整组共用一次定时唤醒并发执行
+        
+        与schedule_batch_test不同，各接口作为独立任务并行请求，互不阻塞
+        
+        Args:
+            client: HttpClient实例
+            test_configs: 测试配置列表，每个配置包含method, url及其他请求参数
+            interval_seconds: 间隔秒数
+            task_name: 任务组名称
+            
+        Returns:
+            任务ID
+        """
+        if task_name is None:
+            task_name = f"API测试组 ({len(test_configs)}个接口)"
+        
+        api_tests = []
+        for config in test_configs:
+            request_kwargs = dict(config)
+            method = request_kwargs.pop('method', 'GET')
+            url = request_kwargs.pop('url', '')
+            api_tests.append(self._make_api_test(client, method, url, f"{method.upper()} {url}", request_kwargs))
+        
+        return self.scheduler.add_interval_group(api_tests, seconds=interval_seconds, task_name=task_name)
+    
+    @staticmethod
+    def _make_api_test(client, method: str, url: str, task_name: str, request_kwargs: Dict[str, Any]) -> Callable:
+        """
+        创建单个API测试的执行函数
+        
+        Args:
+            client: HttpClient实例
+            method: 请求方法
+            url: 请求URL
+            task_name: 任务名称
+            request_kwargs: 请求参数
+            
+        Returns:
+            执行一次请求并记录结果的函数
+        """
+        def api_test_task():
+            try:
+                logger.info(f"执行API测试: {task_name}")
+                response = client.send_request(method, url, **request_kwargs)
+                if response:
+                    logger.info(f"API测试结果 - URL: {url}, 状态码: {response.status_code}, 响应时间: {response.elapsed.total_seconds():.3f}s")
+                return response
+            except Exception as e:
+                logger.error(f"API测试失败: {str(e)}")
+        
+        return api_test_task
+    
     # 复用TaskScheduler的方法
-    def remove_task(self, task_id: str) -> bool:
+    def remove_task(self, task_id: Union[int, str]) -> bool:
         return self.scheduler.remove_task(task_id)
     
-    def pause_task(self, task_id: str) -> bool:
+    def pause_task(self, task_id: Union[int, str]) -> bool:
         return self.scheduler.pause_task(task_id)
     
-    def resume_task(self, task_id: str) -> bool:
+    def resume_task(self, task_id: Union[int, str]) -> bool:
         return self.scheduler.resume_task(task_id)
     
-    def get_task_info(self, task_id: str) -> Optional[Dict[str, Any]]:
+    def get_task_info(self, task_id: Union[int, str]) -> Optional[Dict[str, Any]]:
         return self.scheduler.get_task_info(task_id)
     
     def list_tasks(self) -> List[Dict[str, Any]]:
@@ -754,11 +1112,48 @@ class TestCaseScheduler(TaskScheduler):
     专门用于测试用例调度的调度器
     支持测试套件管理、批量执行和测试报告生成
     """
-    def __init__(self):
+    # 测试报告先缓存在内存中，攒够一批或距上次写盘超过一定时间后一次性追加到JSONL文件
+    _REPORT_FLUSH_EVERY = 16
+    _REPORT_FLUSH_INTERVAL = 30
+    _REPORT_LOG_NAME = 'suite_reports.jsonl'
+    # 报告中的摘要字段，生成报告时都排在test_results之前
+    _REPORT_SUMMARY_FIELDS = ('suite_name', 'timestamp', 'duration', 'total', 'passed', 'failed', 'pass_rate')
+    _JSON_SCALAR_EVENTS = frozenset(('null', 'boolean', 'integer', 'double', 'number', 'string'))
+    
+    def __init__(self, suite_workers: Optional[int] = None, io_bound: bool = True):
+        """
+        初始化测试用例调度器
+        
+        Args:
+            suite_workers: 运行测试套件的最大并发数，不指定时按可用CPU数推算
+            io_bound: 用例是否以等待网络IO为主，是则默认并发数为CPU数的2倍（至少4），否则等于CPU数
+        """
         super().__init__()
+        if suite_workers is None:
+            cpus = self._available_cpus()
+            suite_workers = max(4, cpus * 2) if io_bound else cpus
+        self.suite_workers = max(1, suite_workers)
         self.test_suites = {}  # 测试套件管理
         self.report_dir = os.path.join(os.path.dirname(__file__), '..', 'reports')
         os.makedirs(self.report_dir, exist_ok=True)
+        # 待写盘的报告，元素为已序列化的单行JSON
+        self._pending_reports: deque = deque()
+        self._last_report_flush = time.monotonic()
+        self._report_lock = threading.Lock()
+        # 进程退出时写出尚未落盘的报告
+        atexit.register(self.flush_reports)
+    
+    def stop(self):
+        """停止调度器，并写出尚未落盘的测试报告"""
+        super().stop()
+        self.flush_reports()
+    
+    @staticmethod
+    def _available_cpus() -> int:
+        """当前进程可用的CPU数，优先按CPU亲和性计算，不支持的平台退回cpu_count"""
+        if hasattr(os, 'sched_getaffinity'):
+            return len(os.sched_getaffinity(0)) or 1
+        return os.cpu_count() or 1
     
     def add_test_suite(self, suite_name: str, test_cases: list):
         """
@@ -799,14 +1194,16 @@ class TestCaseScheduler(TaskScheduler):
             return {'suite_name': suite_name, 'success': False, 'error': '测试套件不存在'}
         
         logger.info(f"开始运行测试套件 '{suite_name}'")
+        test_cases = self.test_suites[suite_name]
         test_results = []
         suite_start_time = time.time()
         
-        # 使用并发执行器执行测试用例
-        with ConcurrentExecutor(max_workers=5) as executor:
+        # 使用线程池并发执行测试用例，按完成顺序收集结果
+        # ConcurrentExecutor的任务包装不返回函数结果，这里需要直接拿到每个用例的返回值
+        with ThreadPoolExecutor(max_workers=max(1, min(self.suite_workers, len(test_cases)))) as executor:
             future_to_test = {}
             
-            for i, (test_case_func, args, kwargs) in enumerate(self.test_suites[suite_name]):
+            for i, (test_case_func, args, kwargs) in enumerate(test_cases):
                 # 为每个测试用例创建一个包装函数
                 def test_wrapper(func, test_args, test_kwargs, test_idx=i):
                     try:
@@ -841,7 +1238,7 @@ class TestCaseScheduler(TaskScheduler):
                 future_to_test[future] = test_case_func.__name__
             
             # 收集结果
-            for future in concurrent.futures.as_completed(future_to_test):
+            for future in as_completed(future_to_test):
                 test_name = future_to_test[future]
                 try:
                     result = future.result()
@@ -893,7 +1290,7 @@ class TestCaseScheduler(TaskScheduler):
             return self.add_interval_task(
                 run_suite_wrapper,
                 interval_seconds,
-                name=f"测试套件-{suite_name}",
+                task_name=f"测试套件-{suite_name}",
                 timeout=3600,  # 测试套件超时时间（秒）
                 max_retries=1
             )
@@ -901,7 +1298,7 @@ class TestCaseScheduler(TaskScheduler):
             return self.add_cron_task(
                 run_suite_wrapper,
                 cron_expression,
-                name=f"测试套件-{suite_name}",
+                task_name=f"测试套件-{suite_name}",
                 timeout=3600,
                 max_retries=1
             )
@@ -909,7 +1306,7 @@ class TestCaseScheduler(TaskScheduler):
             return self.add_one_time_task(
                 run_suite_wrapper,
                 delay_seconds,
-                name=f"测试套件-{suite_name}",
+                task_name=f"测试套件-{suite_name}",
                 timeout=3600,
                 max_retries=1
             )
@@ -939,39 +1336,177 @@ class TestCaseScheduler(TaskScheduler):
     
     def _save_test_report(self, report):
         """
-        保存测试报告到文件
-        """
-        timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"test_suite_{report['suite_name']}_{timestamp}.json"
-        file_path = os.path.join(self.report_dir, filename)
+        保存测试报告，先放入待写盘队列，攒够一批或距上次写盘超过一定时间后再统一写入
         
+        Args:
+            report: 测试报告
+        """
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(report, f, ensure_ascii=False, indent=2, default=str)
-            logger.info(f"测试报告已保存到: {file_path}")
+            line = self._dump_report(report)
         except Exception as e:
             logger.error(f"保存测试报告失败: {str(e)}")
+            return
+        
+        with self._report_lock:
+            self._pending_reports.append(line)
+            flush_due = (len(self._pending_reports) >= self._REPORT_FLUSH_EVERY
+                         or time.monotonic() - self._last_report_flush > self._REPORT_FLUSH_INTERVAL)
+        
+        if flush_due:
+            self.flush_reports()
     
-    def get_latest_reports(self, count=5):
+    @staticmethod
+    def _dump_report(report) -> bytes:
+        """
+        把测试报告序列化为单行JSON
+        
+        Args:
+            report: 测试报告
+            
+        Returns:
+            UTF-8编码的JSON，不含换行
+        """
+        if orjson is not None:
+            try:
+                return orjson.dumps(report, default=str, option=orjson.OPT_NON_STR_KEYS)
+            except TypeError:
+                pass
+        return json.dumps(report, ensure_ascii=False, default=str).encode('utf-8')
+    
+    @property
+    def _report_log_path(self) -> str:
+        """汇总测试报告的JSONL文件路径"""
+        return os.path.join(self.report_dir, self._REPORT_LOG_NAME)
+    
+    def flush_reports(self) -> bool:
+        """
+        把待写盘的测试报告一次性追加到JSONL文件，整批只做一次写入和一次fsync
+        
+        Returns:
+            bool: 是否写入成功，没有待写盘的报告时也返回True
+        """
+        file_path = self._report_log_path
+        with self._report_lock:
+            if not self._pending_reports:
+                return True
+            
+            batch = list(self._pending_reports)
+            try:
+                with open(file_path, 'ab') as f:
+                    f.write(b'\n'.join(batch) + b'\n')
+                    f.flush()
+                    os.fsync(f.fileno())
+            except Exception as e:
+                # 写入失败时保留待写盘的报告，下次再试
+                logger.error(f"保存测试报告失败: {str(e)}")
+                return False
+            
+            self._pending_reports.clear()
+            self._last_report_flush = time.monotonic()
+        
+        logger.info(f"已将 {len(batch)} 份测试报告保存到: {file_path}")
+        return True
+    
+    @staticmethod
+    def _read_jsonl_tail(file_path: str, count: int, block_size: int = 65536) -> List[bytes]:
+        """
+        从文件末尾向前分块读取，只取最后count行，不读取整个文件
+        
+        Args:
+            file_path: JSONL文件路径
+            count: 需要的行数
+            block_size: 每次向前读取的字节数
+            
+        Returns:
+            最后count个非空行，按文件中的先后顺序排列
+        """
+        if count <= 0:
+            return []
+        
+        with open(file_path, 'rb') as f:
+            position = f.seek(0, os.SEEK_END)
+            data = b''
+            # 多读到一个换行符，保证最前面那一行之后的count行都是完整的
+            while position > 0 and data.count(b'\n') <= count:
+                read_size = min(block_size, position)
+                position -= read_size
+                f.seek(position)
+                data = f.read(read_size) + data
+        
+        lines = [line for line in data.split(b'\n') if line.strip()]
+        return lines[-count:]
+    
+    def _load_report(self, f, include_results: bool) -> Dict[str, Any]:
+        """
+        从二进制文件对象中读取一份测试报告
+        
+        不需要用例结果且安装了ijson时流式读取，摘要字段读齐后立即停止，不解析后面的test_results
+        
+        Args:
+            f: 二进制文件对象
+            include_results: 是否包含test_results
+            
+        Returns:
+            测试报告，不包含用例结果时只有摘要字段
+        """
+        if include_results or not HAS_IJSON:
+            data = f.read()
+            report = orjson.loads(data) if orjson is not None else json.loads(data)
+            if not include_results:
+                report.pop('test_results', None)
+            return report
+        
+        report = {}
+        fields = self._REPORT_SUMMARY_FIELDS
+        scalar_events = self._JSON_SCALAR_EVENTS
+        for prefix, event, value in ijson.parse(f, use_float=True):
+            # 顶层字段的前缀就是字段名本身
+            if prefix in fields and event in scalar_events:
+                report[prefix] = value
+                if len(report) == len(fields):
+                    break
+        return report
+    
+    def get_latest_reports(self, count=5, include_results: bool = False):
         """
         获取最近的测试报告
         
+        包括尚未写盘的报告、JSONL文件末尾的报告，以及旧版按单个JSON文件保存的报告
+        
         Args:
             count: 返回报告数量
+            include_results: 是否包含每个用例的执行结果(test_results)，列表展示通常只需要摘要
             
         Returns:
             list: 报告列表
         """
         try:
+            log_path = self._report_log_path
+            log_name = self._REPORT_LOG_NAME
+            
+            with self._report_lock:
+                lines = list(self._pending_reports)[-count:]
+            if os.path.isfile(log_path):
+                lines = self._read_jsonl_tail(log_path, count) + lines
+            
             reports = []
-            for filename in os.listdir(self.report_dir):
-                if filename.endswith('.json'):
-                    file_path = os.path.join(self.report_dir, filename)
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        report = json.load(f)
-                        report['file_path'] = file_path
-                        report['file_name'] = filename
-                        reports.append(report)
+            for line in lines:
+                report = self._load_report(io.BytesIO(line), include_results)
+                report['file_path'] = log_path
+                report['file_name'] = log_name
+                reports.append(report)
+            
+            # 旧版报告生成后不再修改，按文件修改时间取最新的count个，只解析这些文件
+            with os.scandir(self.report_dir) as it:
+                entries = [entry for entry in it if entry.name.endswith('.json') and entry.is_file()]
+            latest = heapq.nlargest(count, entries, key=lambda entry: entry.stat().st_mtime)
+            
+            for entry in latest:
+                with open(entry.path, 'rb') as f:
+                    report = self._load_report(f, include_results)
+                report['file_path'] = entry.path
+                report['file_name'] = entry.name
+                reports.append(report)
             
             # 按时间排序
             reports.sort(key=lambda x: x['timestamp'], reverse=True)
@@ -986,58 +1521,9 @@ global_scheduler = TaskScheduler()
 global_api_scheduler = ApiTaskScheduler()
 
 
-def schedule_interval(func: Callable, 
-                     seconds: int = 0,
-                     minutes: int = 0,
-                     hours: int = 0,
-                     days: int = 0,
-                     args: tuple = (),
-                     kwargs: Optional[Dict[str, Any]] = None,
-                     task_name: Optional[str] = None) -> str:
-    """
-    装饰器：使用固定时间间隔调度函数
-    
-    Args:
-        func: 要调度的函数
-        seconds: 秒间隔
-        minutes: 分钟间隔
-        hours: 小时间隔
-        days: 天间隔
-        args: 函数位置参数
-        kwargs: 函数关键字参数
-        task_name: 任务名称
-        
-    Returns:
-        任务ID
-    """
-    task_id = global_scheduler.add_interval_task(
-        func, seconds, minutes, hours, days, args, kwargs, task_name
-    )
-    return task_id
-
-
-def schedule_cron(func: Callable,
-                  cron_expression: str,
-                  args: tuple = (),
-                  kwargs: Optional[Dict[str, Any]] = None,
-                  task_name: Optional[str] = None) -> str:
-    """
-    装饰器：使用cron表达式调度函数
-    
-    Args:
-        func: 要调度的函数
-        cron_expression: cron表达式
-        args: 函数位置参数
-        kwargs: 函数关键字参数
-        task_name: 任务名称
-        
-    Returns:
-        任务ID
-    """
-    task_id = global_scheduler.add_cron_task(
-        func, cron_expression, args, kwargs, task_name
-    )
-    return task_id
+# 使用全局调度器调度函数，直接绑定调度器方法，参数与add_interval_task/add_cron_task相同
+schedule_interval = global_scheduler.add_interval_task
+schedule_cron = global_scheduler.add_cron_task
 
 
 # 确保在导入时启动全局调度器
@@ -13,18 +13,138 @@
 import asyncio
 import json
 import logging
+import re
 import time
+from array import array
+from enum import IntEnum
 from typing import (
     Optional, Dict, Any, Callable, List, Generator, AsyncGenerator,
-    Tuple, Union
+    NamedTuple, Tuple, Union
 )
 
+# 尝试导入orjson以加速记录的序列化，如果不可用则使用标准库json
+try:
+    import orjson  # 需要安装: pip install orjson
+except ImportError:
+    orjson = None
+
 # 配置日志
 logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 
+def _orjson_default(obj: Any) -> Any:
+    """orjson不直接支持NamedTuple，按普通数组输出，与标准库json一致"""
+    if isinstance(obj, tuple):
+        return list(obj)
+    raise TypeError
+
+
+def _dump_json(obj: Any, pretty: bool = False) -> bytes:
+    """
+    将对象序列化为UTF-8编码的JSON
+    
+    优先使用orjson；orjson不支持的类型回退到标准库
+    
+    Args:
+        obj: 待序列化的对象
+        pretty: 是否缩进输出
+        
+    Returns:
+        JSON字节串
+    """
+    if orjson is not None:
+        try:
+            option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+            return orjson.dumps(obj, default=_orjson_default, option=option)
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False, indent=2 if pretty else None).encode('utf-8')
+
+
+class AssertionType(IntEnum):
+    """断言类型编码，添加断言时由类型名转换一次，之后按编码查表"""
+    CONTAINS = 0
+    EQUALS = 1
+    STARTS_WITH = 2
+    ENDS_WITH = 3
+    REGEX = 4
+    LENGTH_GT = 5
+    LENGTH_LT = 6
+
+
+# 断言类型名到编码的映射
+_ASSERTION_TYPE_CODES = {
+    'contains': AssertionType.CONTAINS,
+    'equals': AssertionType.EQUALS,
+    'starts_with': AssertionType.STARTS_WITH,
+    'ends_with': AssertionType.ENDS_WITH,
+    'regex': AssertionType.REGEX,
+    'length_gt': AssertionType.LENGTH_GT,
+    'length_lt': AssertionType.LENGTH_LT,
+}
+
+# 各断言类型的检查函数工厂，按编码索引；参数为(期望值, 预编译的正则)，生成的函数参数为(原始值, 字符串形式的值)
+_ASSERTION_CHECK_FACTORIES = (
+    lambda expected, compiled: lambda value, text: expected in text,
+    lambda expected, compiled: lambda value, text: value == expected,
+    lambda expected, compiled: lambda value, text: text.startswith(expected),
+    lambda expected, compiled: lambda value, text: text.endswith(expected),
+    lambda expected, compiled: lambda value, text, search=compiled.search: search(text) is not None,
+    lambda expected, compiled: lambda value, text: len(text) > expected,
+    lambda expected, compiled: lambda value, text: len(text) < expected,
+)
+
+# 各断言类型失败时的提示信息，按编码索引；参数为(期望值, 字符串形式的实际值)
+_ASSERTION_MESSAGES = (
+    lambda expected, text: f"期望包含 '{expected}'，实际值为 '{text}'",
+    lambda expected, text: f"期望等于 '{expected}'，实际值为 '{text}'",
+    lambda expected, text: f"期望以 '{expected}' 开头，实际值为 '{text}'",
+    lambda expected, text: f"期望以 '{expected}' 结尾，实际值为 '{text}'",
+    lambda expected, text: f"期望匹配正则表达式 '{expected}'，实际值为 '{text}'",
+    lambda expected, text: f"期望长度大于 {expected}，实际长度为 {len(text)}",
+    lambda expected, text: f"期望长度小于 {expected}，实际长度为 {len(text)}",
+)
+
+
+# 表示调用方未提供预先取出的content
+_MISSING = object()
+
+
+def _extract_content(chunk: Dict[str, Any]) -> Any:
+    """默认的取值函数，直接使用数据块的content字段"""
+    return chunk.get('content', '')
+
+
+def _build_assertion_check(assertion: Dict[str, Any]) -> Callable[[Any, str], bool]:
+    """
+    按断言类型编码生成检查函数，添加断言时生成一次，验证数据块时直接调用
+    
+    Args:
+        assertion: 断言定义
+        
+    Returns:
+        检查函数，参数为(原始值, 字符串形式的值)；不支持的断言类型始终返回False
+    """
+    type_code = assertion['type_code']
+    if type_code is None:
+        return lambda value, text: False
+    return _ASSERTION_CHECK_FACTORIES[type_code](assertion['expected'], assertion.get('compiled'))
+
+
+class AssertionResult(NamedTuple):
+    """
+    单个数据块上一条断言的结果
+    断言名称、类型和期望值对同一条断言都相同，只保存断言序号，需要字典形式时用StreamValidator.materialize_result转换
+    """
+    assertion_id: int
+    actual: Any
+    passed: bool
+    message: str
+    chunk_index: int
+
+
 class StreamValidator:
     """
     流式响应验证器
@@ -54,14 +174,20 @@ class StreamValidator:
             expected_value: 期望的值
             extract_func: 从数据块中提取要验证的值的函数，如果为None则直接使用content字段
         """
-        self.assertions.append({
+        assertion = {
             'name': assertion_name,
             'type': assertion_type,
+            'type_code': _ASSERTION_TYPE_CODES.get(assertion_type),
             'expected': expected_value,
-            'extract_func': extract_func or (lambda x: x.get('content', ''))
-        })
+            'extract_func': extract_func or _extract_content
+        }
+        # 正则表达式只在添加断言时编译一次，验证每个数据块时直接复用
+        if assertion_type == 'regex':
+            assertion['compiled'] = re.compile(expected_value)
+        assertion['check'] = _build_assertion_check(assertion)
+        self.assertions.append(assertion)
     
-    def validate_chunk(self, chunk: Dict[str, Any], full_content: str = "") -> List[Dict[str, Any]]:
+    def validate_chunk(self, chunk: Dict[str, Any], full_content: str = "") -> List[AssertionResult]:
         """
         验证单个数据块
         
@@ -72,75 +198,78 @@ class StreamValidator:
         Returns:
             断言结果列表
         """
+        return self.validate_chunk_counted(chunk)[0]
+    
+    def validate_chunk_counted(self, chunk: Dict[str, Any],
+                               content: Any = _MISSING) -> Tuple[List[AssertionResult], int]:
+        """
+        验证单个数据块，并在同一次遍历中统计通过的断言数
+        
+        Args:
+            chunk: 当前数据块
+            content: 调用方已经取出的content字段，使用默认取值函数的断言直接复用
+            
+        Returns:
+            (断言结果列表, 通过的断言数)
+        """
         chunk_results = []
+        passed_count = 0
+        has_content = content is not _MISSING
         
-        for assertion in self.assertions:
+        for assertion_id, assertion in enumerate(self.assertions):
             try:
                 # 提取要验证的值
-                value = assertion['extract_func'](chunk)
+                extract_func = assertion['extract_func']
+                if has_content and extract_func is _extract_content:
+                    value = content
+                else:
+                    value = extract_func(chunk)
+                text = value if isinstance(value, str) else str(value)
                 
-                # 执行断言
-                passed = False
+                # 执行断言，只有失败时才生成提示信息
+                passed = bool(assertion['check'](value, text))
                 message = ""
-                
-                if assertion['type'] == 'contains':
-                    passed = assertion['expected'] in str(value)
-                    message = f"期望包含 '{assertion['expected']}'，实际值为 '{str(value)}'"
-                    
-                elif assertion['type'] == 'equals':
-                    passed = value == assertion['expected']
-                    message = f"期望等于 '{assertion['expected']}'，实际值为 '{str(value)}'"
-                    
-                elif assertion['type'] == 'starts_with':
-                    passed = str(value).startswith(assertion['expected'])
-                    message = f"期望以 '{assertion['expected']}' 开头，实际值为 '{str(value)}'"
-                    
-                elif assertion['type'] == 'ends_with':
-                    passed = str(value).endswith(assertion['expected'])
-                    message = f"期望以 '{assertion['expected']}' 结尾，实际值为 '{str(value)}'"
-                    
-                elif assertion['type'] == 'regex':
-                    import re
-                    passed = bool(re.search(assertion['expected'], str(value)))
-                    message = f"期望匹配正则表达式 '{assertion['expected']}'，实际值为 '{str(value)}'"
-                    
-                elif assertion['type'] == 'length_gt':
-                    passed = len(str(value)) > assertion['expected']
-                    message = f"期望长度大于 {assertion['expected']}，实际长度为 {len(str(value))}"
-                    
-                elif assertion['type'] == 'length_lt':
-                    passed = len(str(value)) < assertion['expected']
-                    message = f"期望长度小于 {assertion['expected']}，实际长度为 {len(str(value))}"
+                if not passed:
+                    type_code = assertion['type_code']
+                    if type_code is not None:
+                        message = _ASSERTION_MESSAGES[type_code](assertion['expected'], text)
                 
                 # 添加结果
-                result = {
-                    'name': assertion['name'],
-                    'type': assertion['type'],
-                    'expected': assertion['expected'],
-                    'actual': value,
-                    'passed': passed,
-                    'message': message,
-                    'chunk_index': len(self.results)
-                }
+                result = AssertionResult(assertion_id, value, passed, message, len(self.results))
                 
                 chunk_results.append(result)
                 self.results.append(result)
+                if passed:
+                    passed_count += 1
                 
             except Exception as e:
                 # 断言执行出错
-                error_result = {
-                    'name': assertion['name'],
-                    'type': assertion['type'],
-                    'expected': assertion['expected'],
-                    'actual': None,
-                    'passed': False,
-                    'message': f"断言执行错误: {str(e)}",
-                    'chunk_index': len(self.results)
-                }
+                error_result = AssertionResult(assertion_id, None, False, f"断言执行错误: {str(e)}", len(self.results))
                 chunk_results.append(error_result)
                 self.results.append(error_result)
         
-        return chunk_results
+        return chunk_results, passed_count
+    
+    def materialize_result(self, result: AssertionResult) -> Dict[str, Any]:
+        """
+        把断言结果转换为包含断言名称、类型和期望值的字典，用于展示或序列化
+        
+        Args:
+            result: 断言结果，需来自当前断言列表（reset之前）
+            
+        Returns:
+            断言结果字典
+        """
+        assertion = self.assertions[result.assertion_id]
+        return {
+            'name': assertion['name'],
+            'type': assertion['type'],
+            'expected': assertion['expected'],
+            'actual': result.actual,
+            'passed': result.passed,
+            'message': result.message,
+            'chunk_index': result.chunk_index
+        }
     
     def get_summary(self) -> Dict[str, Any]:
         """
@@ -149,7 +278,7 @@ class StreamValidator:
         Returns:
             断言摘要信息
         """
-        passed_count = sum(1 for r in self.results if r['passed'])
+        passed_count = sum(1 for r in self.results if r.passed)
         total_count = len(self.results)
         
         return {
@@ -164,8 +293,8 @@ class StreamValidator:
         """
         重置验证器状态
         """
-        self.assertions = []
-        self.results = []
+        self.assertions.clear()
+        self.results.clear()
 
 
 class StreamMetricsCollector:
@@ -178,22 +307,79 @@ class StreamMetricsCollector:
         """
         初始化指标收集器
         """
+        # 开始时刻同时记录挂钟时间和单调时钟，其余时刻只记单调时钟纳秒数，输出时再换算为挂钟时间
         self.start_time = None
-        self.end_time = None
-        self.chunks = []
+        self._start_ns = None
+        self._end_ns = None
+        # 每个数据块的指标按列存放在定长类型数组中，汇总值随记录累加
+        self._timestamps_ns = array('q')
+        self._content_lens = array('q')
+        self._raw_sizes = array('q')
+        self.total_content_length = 0
         self.total_bytes = 0
-        self.first_chunk_time = None
-        self.last_chunk_time = None
+    
+    def _to_wall_time(self, timestamp_ns: Optional[int]) -> Optional[float]:
+        """
+        把单调时钟纳秒数换算为挂钟时间戳
+        
+        Args:
+            timestamp_ns: 单调时钟纳秒数
+            
+        Returns:
+            挂钟时间戳（秒），未开始收集时返回None
+        """
+        if timestamp_ns is None or self._start_ns is None:
+            return None
+        return self.start_time + (timestamp_ns - self._start_ns) / 1e9
+    
+    @property
+    def end_time(self) -> Optional[float]:
+        """停止收集的时间"""
+        return self._to_wall_time(self._end_ns)
+    
+    @property
+    def first_chunk_time(self) -> Optional[float]:
+        """收到第一个数据块的时间"""
+        return self._to_wall_time(self._timestamps_ns[0]) if self._timestamps_ns else None
+    
+    @property
+    def last_chunk_time(self) -> Optional[float]:
+        """收到最后一个数据块的时间"""
+        return self._to_wall_time(self._timestamps_ns[-1]) if self._timestamps_ns else None
+    
+    @property
+    def chunks(self) -> List[Dict[str, Any]]:
+        """
+        已记录数据块的信息列表，按需从各列构造
+        
+        Returns:
+            数据块信息列表，包含时间戳、内容长度、原始大小和序号
+        """
+        return [
+            {'timestamp': self._to_wall_time(timestamp_ns), 'content_length': content_length,
+             'raw_size': raw_size, 'index': index}
+            for index, (timestamp_ns, content_length, raw_size)
+            in enumerate(zip(self._timestamps_ns, self._content_lens, self._raw_sizes))
+        ]
     
     def start(self) -> None:
         """
         开始收集指标
         """
         self.start_time = time.time()
-        self.chunks = []
+        self._start_ns = time.monotonic_ns()
+        self._end_ns = None
+        self._clear_chunks()
+    
+    def _clear_chunks(self) -> None:
+        """
+        原地清空已记录的数据块及汇总值
+        """
+        del self._timestamps_ns[:]
+        del self._content_lens[:]
+        del self._raw_sizes[:]
+        self.total_content_length = 0
         self.total_bytes = 0
-        self.first_chunk_time = None
-        self.last_chunk_time = None
     
     def record_chunk(self, chunk: Dict[str, Any], raw_size: int = 0) -> None:
         """
@@ -203,31 +389,28 @@ class StreamMetricsCollector:
             chunk: 数据块
             raw_size: 原始数据块大小（字节）
         """
-        current_time = time.time()
-        
-        # 记录第一个块的时间
-        if self.first_chunk_time is None:
-            self.first_chunk_time = current_time
-        
-        # 更新最后一个块的时间
-        self.last_chunk_time = current_time
-        
-        # 记录块信息
-        chunk_info = {
-            'timestamp': current_time,
-            'content_length': len(chunk.get('content', '')),
-            'raw_size': raw_size,
-            'index': len(self.chunks)
-        }
+        self.record_content_length(len(chunk.get('content', '')), raw_size)
+    
+    def record_content_length(self, content_length: int, raw_size: int = 0) -> None:
+        """
+        按已知的内容长度记录一个数据块，调用方已取出content时省去再次读取
         
-        self.chunks.append(chunk_info)
+        Args:
+            content_length: 数据块内容长度
+            raw_size: 原始数据块大小（字节）
+        """
+        # 记录块信息，第一个和最后一个块的时间直接取自时间戳数组
+        self._timestamps_ns.append(time.monotonic_ns())
+        self._content_lens.append(content_length)
+        self._raw_sizes.append(raw_size)
+        self.total_content_length += content_length
         self.total_bytes += raw_size
     
     def stop(self) -> None:
         """
         停止收集指标
         """
-        self.end_time = time.time()
+        self._end_ns = time.monotonic_ns()
     
     def get_metrics(self) -> Dict[str, Any]:
         """
@@ -240,33 +423,31 @@ class StreamMetricsCollector:
         if self.start_time is None:
             return {"error": "指标收集未开始"}
         
-        total_time = (self.end_time or time.time()) - self.start_time
+        timestamps_ns = self._timestamps_ns
+        total_time = ((self._end_ns or time.monotonic_ns()) - self._start_ns) / 1e9
         
         # 首次响应时间（TTFB - Time To First Byte）
         ttfb = None
-        if self.first_chunk_time:
-            ttfb = self.first_chunk_time - self.start_time
+        if timestamps_ns:
+            ttfb = (timestamps_ns[0] - self._start_ns) / 1e9
         
-        # 块间隔统计
-        chunk_intervals = []
-        if len(self.chunks) > 1:
-            for i in range(1, len(self.chunks)):
-                interval = self.chunks[i]['timestamp'] - self.chunks[i-1]['timestamp']
-                chunk_intervals.append(interval)
-        
-        avg_chunk_interval = sum(chunk_intervals) / len(chunk_intervals) if chunk_intervals else 0
+        # 块间隔统计：相邻间隔之和等于首尾时间差，无需逐个计算
+        total_chunks = len(timestamps_ns)
+        avg_chunk_interval = 0
+        if total_chunks > 1:
+            avg_chunk_interval = (timestamps_ns[-1] - timestamps_ns[0]) / 1e9 / (total_chunks - 1)
         
         # 吞吐量计算
         throughput_bytes_per_second = self.total_bytes / total_time if total_time > 0 else 0
-        throughput_chunks_per_second = len(self.chunks) / total_time if total_time > 0 else 0
+        throughput_chunks_per_second = total_chunks / total_time if total_time > 0 else 0
         
         # 内容增长速度（每秒字符数）
-        total_content_length = sum(chunk['content_length'] for chunk in self.chunks)
+        total_content_length = self.total_content_length
         content_speed = total_content_length / total_time if total_time > 0 else 0
         
         return {
             'total_time': total_time,
-            'total_chunks': len(self.chunks),
+            'total_chunks': total_chunks,
             'total_bytes': self.total_bytes,
             'total_content_length': total_content_length,
             'ttfb': ttfb,
@@ -284,7 +465,10 @@ class StreamMetricsCollector:
         """
         重置指标收集器
         """
-        self.__init__()
+        self.start_time = None
+        self._start_ns = None
+        self._end_ns = None
+        self._clear_chunks()
 
 
 class StreamRecorder:
@@ -299,49 +483,61 @@ class StreamRecorder:
         """
         self.records = []
         self.start_time = None
+        # 记录的相对时间按单调时钟计算，不受系统时间调整影响
+        self._start_ns = None
     
     def start(self) -> None:
         """
         开始记录
         """
         self.start_time = time.time()
+        self._start_ns = time.monotonic_ns()
         self.records = []
     
-    def record(self, chunk: Dict[str, Any], metadata: Optional[Dict[str, Any]] = None) -> None:
+    def record(self, chunk: Dict[str, Any], metadata: Optional[Dict[str, Any]] = None, copy: bool = True) -> None:
         """
         记录一个数据块
         
         Args:
             chunk: 数据块
             metadata: 附加的元数据
+            copy: 是否复制数据块，为False时直接保存引用，调用方记录后不应再修改该数据块
         """
+        start_ns = self._start_ns
         record = {
-            'timestamp': time.time() - (self.start_time or time.time()),
-            'chunk': chunk.copy(),
+            'timestamp': (time.monotonic_ns() - start_ns) / 1e9 if start_ns is not None else 0.0,
+            'chunk': chunk.copy() if copy else chunk,
             'metadata': metadata or {}
         }
         self.records.append(record)
     
-    def save_to_file(self, file_path: str) -> bool:
+    def save_to_file(self, file_path: str, pretty: bool = False) -> bool:
         """
-        保存记录到文件
+        保存记录到文件，逐条序列化写入，不在内存中构造整个文件内容
         
         Args:
             file_path: 文件路径
+            pretty: 是否缩进输出每条记录，记录较多时缩进会明显拖慢保存
             
         Returns:
             是否保存成功
         """
         try:
-            data = {
+            header = _dump_json({
                 'start_time': self.start_time,
                 'end_time': time.time(),
-                'total_records': len(self.records),
-                'records': self.records
-            }
+                'total_records': len(self.records)
+            })
             
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            with open(file_path, 'wb') as f:
+                # 去掉头部对象的右括号，接着写入records数组
+                f.write(header[:-1])
+                f.write(b',"records":[')
+                for index, record in enumerate(self.records):
+                    if index:
+                        f.write(b',')
+                    f.write(_dump_json(record, pretty))
+                f.write(b']}')
             
             logger.info(f"流式记录已保存到 {file_path}")
             return True
@@ -391,20 +587,26 @@ class StreamRecorder:
         Yields:
             重放的数据块
         """
-        previous_time = 0
+        if not self.records:
+            return
+        
+        # 以第一条记录的重放时刻为基准计算每条记录的绝对截止时间，误差不随记录数累积
+        loop = asyncio.get_running_loop()
+        base = loop.time() - self.records[0]['timestamp']
         for record in self.records:
-            # 等待与原始时间间隔相同的时间
-            if previous_time > 0:
-                await asyncio.sleep(record['timestamp'] - previous_time)
+            delay = base + record['timestamp'] - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
             
-            previous_time = record['timestamp']
             yield record['chunk']
     
     def reset(self) -> None:
         """
         重置记录器
         """
-        self.__init__()
+        self.records.clear()
+        self.start_time = None
+        self._start_ns = None
 
 
 class StreamProcessorPipeline:
@@ -443,17 +645,32 @@ class StreamProcessorPipeline:
             chunk: 输入数据块
             
         Returns:
-            处理后的数据块
+            处理后的数据块，处理器原地修改时与输入是同一个对象
         """
-        processed_chunk = chunk.copy()
+        processors = self.processors
+        if not processors:
+            return chunk
         
-        for processor in self.processors:
+        # 只有一个处理器时直接调用，省去循环
+        if len(processors) == 1:
+            processor = processors[0]
+            try:
+                result = processor(chunk)
+            except Exception as e:
+                self._log_processor_error(processor, e)
+                return chunk
+            return chunk if result is None else result
+        
+        processed_chunk = chunk
+        
+        for processor in processors:
             try:
-                processed_chunk = processor(processed_chunk)
-                if processed_chunk is None:
-                    processed_chunk = chunk.copy()
+                # 处理器返回None时沿用当前数据块，不再复制
+                result = processor(processed_chunk)
+                if result is not None:
+                    processed_chunk = result
             except Exception as e:
-                logger.error(f"处理器 {processor.__name__ if hasattr(processor, '__name__') else str(processor)} 执行出错: {str(e)}")
+                self._log_processor_error(processor, e)
         
         return processed_chunk
     
@@ -465,9 +682,12 @@ class StreamProcessorPipeline:
             chunk: 输入数据块
             
         Returns:
-            处理后的数据块
+            处理后的数据块，处理器原地修改时与输入是同一个对象
         """
-        processed_chunk = chunk.copy()
+        if not self.processors:
+            return chunk
+        
+        processed_chunk = chunk
         
         for processor in self.processors:
             try:
@@ -480,15 +700,26 @@ class StreamProcessorPipeline:
                 if result is not None:
                     processed_chunk = result
             except Exception as e:
-                logger.error(f"处理器 {processor.__name__ if hasattr(processor, '__name__') else str(processor)} 执行出错: {str(e)}")
+                self._log_processor_error(processor, e)
         
         return processed_chunk
     
+    @staticmethod
+    def _log_processor_error(processor: Callable, error: Exception) -> None:
+        """
+        记录处理器执行出错的日志
+        
+        Args:
+            processor: 出错的处理器
+            error: 捕获的异常
+        """
+        logger.error(f"处理器 {processor.__name__ if hasattr(processor, '__name__') else str(processor)} 执行出错: {str(error)}")
+    
     def reset(self) -> None:
         """
         重置处理管道
         """
-        self.processors = []
+        self.processors.clear()
 
 
 class AdvancedStreamTester:
@@ -497,20 +728,49 @@ class AdvancedStreamTester:
     集成了验证、指标收集和记录功能，提供一站式流式接口测试体验
     """
     
-    def __init__(self):
+    def __init__(self, record_enabled: bool = True):
         """
         初始化高级流式测试器
+        
+        Args:
+            record_enabled: 是否记录数据块，只需要验证和指标时可关闭以省去记录开销
         """
+        self.record_enabled = record_enabled
         self.validator = StreamValidator()
         self.metrics_collector = StreamMetricsCollector()
         self.recorder = StreamRecorder()
         self.processor_pipeline = StreamProcessorPipeline()
         
-        # 处理状态
-        self.full_content = ""
+        # 处理状态，完整内容按片段累积，读取full_content时才拼接
+        self._content_parts: List[str] = []
+        self._full_content_cache: Optional[str] = ""
         self.is_started = False
         self.start_time = None
     
+    @property
+    def full_content(self) -> str:
+        """
+        到目前为止的完整内容，拼接结果缓存到下一个数据块到来
+        
+        Returns:
+            完整内容
+        """
+        if self._full_content_cache is None:
+            self._full_content_cache = ''.join(self._content_parts)
+        return self._full_content_cache
+    
+    def _append_content(self, chunk: Dict[str, Any]) -> None:
+        """
+        追加数据块内容，并在数据块中标记当前已累积的片段数
+        
+        Args:
+            chunk: 数据块
+        """
+        if 'content' in chunk:
+            self._content_parts.append(chunk['content'])
+            self._full_content_cache = None
+            chunk['full_content_parts_len'] = len(self._content_parts)
+    
     def add_assertion(
         self,
         assertion_name: str,
@@ -556,7 +816,8 @@ class AdvancedStreamTester:
         if not self.is_started:
             self.metrics_collector.start()
             self.recorder.start()
-            self.full_content = ""
+            self._content_parts = []
+            self._full_content_cache = ""
             self.start_time = time.time()
             self.is_started = True
         
@@ -564,7 +825,7 @@ class AdvancedStreamTester:
     
     def process_chunk(self, chunk: Dict[str, Any], raw_size: int = 0) -> Dict[str, Any]:
         """
-        处理一个数据块
+        处理一个数据块，full_content_parts_len和assertion_results直接写入传入的数据块
         
         Args:
             chunk: 数据块
@@ -578,31 +839,19 @@ class AdvancedStreamTester:
             self.start()
         
         # 更新完整内容
-        if 'content' in chunk:
-            self.full_content += chunk['content']
-            chunk['full_content'] = self.full_content
-        
-        # 使用处理管道处理数据
-        processed_chunk = self.processor_pipeline.process_chunk(chunk)
-        
-        # 验证数据
-        assertion_results = self.validator.validate_chunk(processed_chunk, self.full_content)
-        processed_chunk['assertion_results'] = assertion_results
-        
-        # 收集指标
-        self.metrics_collector.record_chunk(processed_chunk, raw_size)
+        self._append_content(chunk)
         
-        # 记录数据
-        self.recorder.record(processed_chunk, {
-            'assertion_results_count': len(assertion_results),
-            'assertion_passed_count': sum(1 for r in assertion_results if r['passed'])
-        })
+        # 使用处理管道处理数据，没有处理器时直接使用原数据块
+        if self.processor_pipeline.processors:
+            processed_chunk = self.processor_pipeline.process_chunk(chunk)
+        else:
+            processed_chunk = chunk
         
-        return processed_chunk
+        return self._finalize_chunk(processed_chunk, raw_size)
     
     async def process_chunk_async(self, chunk: Dict[str, Any], raw_size: int = 0) -> Dict[str, Any]:
         """
-        异步处理一个数据块
+        异步处理一个数据块，full_content_parts_len和assertion_results直接写入传入的数据块
         
         Args:
             chunk: 数据块
@@ -616,25 +865,48 @@ class AdvancedStreamTester:
             self.start()
         
         # 更新完整内容
-        if 'content' in chunk:
-            self.full_content += chunk['content']
-            chunk['full_content'] = self.full_content
+        self._append_content(chunk)
+        
+        # 使用处理管道处理数据，没有处理器时直接使用原数据块
+        if self.processor_pipeline.processors:
+            processed_chunk = await self.processor_pipeline.process_chunk_async(chunk)
+        else:
+            processed_chunk = chunk
+        
+        return self._finalize_chunk(processed_chunk, raw_size)
+    
+    def _finalize_chunk(self, processed_chunk: Dict[str, Any], raw_size: int) -> Dict[str, Any]:
+        """
+        对已经过处理管道的数据块执行验证、指标收集和记录，同步和异步处理共用
+        
+        content只从数据块中取一次，默认取值的断言和指标收集都直接复用；
+        返回的数据块中断言结果为AssertionResult，记录的数据块中转换为字典，保存到文件后可以脱离验证器读取
         
-        # 使用处理管道处理数据
-        processed_chunk = await self.processor_pipeline.process_chunk_async(chunk)
+        Args:
+            processed_chunk: 处理后的数据块
+            raw_size: 原始数据大小
+            
+        Returns:
+            处理后的数据块
+        """
+        content = processed_chunk.get('content', '')
         
         # 验证数据
-        assertion_results = self.validator.validate_chunk(processed_chunk, self.full_content)
+        assertion_results, passed_count = self.validator.validate_chunk_counted(processed_chunk, content)
         processed_chunk['assertion_results'] = assertion_results
         
         # 收集指标
-        self.metrics_collector.record_chunk(processed_chunk, raw_size)
+        self.metrics_collector.record_content_length(len(content), raw_size)
         
-        # 记录数据
-        self.recorder.record(processed_chunk, {
-            'assertion_results_count': len(assertion_results),
-            'assertion_passed_count': sum(1 for r in assertion_results if r['passed'])
-        })
+        # 记录数据，浅复制后替换断言结果，不影响返回给调用方的数据块
+        if self.record_enabled:
+            materialize = self.validator.materialize_result
+            recorded_chunk = dict(processed_chunk)
+            recorded_chunk['assertion_results'] = [materialize(result) for result in assertion_results]
+            self.recorder.record(recorded_chunk, {
+                'assertion_results_count': len(assertion_results),
+                'assertion_passed_count': passed_count
+            }, copy=False)
         
         return processed_chunk
     
@@ -649,11 +921,12 @@ class AdvancedStreamTester:
             self.metrics_collector.stop()
             self.is_started = False
         
-        # 生成测试结果摘要
+        # 生成测试结果摘要，关闭记录时处理的块数以指标收集器为准
+        performance_metrics = self.metrics_collector.get_metrics()
         return {
             'assertion_summary': self.validator.get_summary(),
-            'performance_metrics': self.metrics_collector.get_metrics(),
-            'total_chunks_processed': len(self.recorder.records),
+            'performance_metrics': performance_metrics,
+            'total_chunks_processed': performance_metrics.get('total_chunks', len(self.recorder.records)),
             'full_content_length': len(self.full_content),
             'execution_time': time.time() - (self.start_time or time.time()),
             'all_assertions_passed': self.validator.get_summary()['all_passed']
@@ -679,15 +952,37 @@ class AdvancedStreamTester:
         self.metrics_collector.reset()
         self.recorder.reset()
         self.processor_pipeline.reset()
-        self.full_content = ""
+        self._content_parts.clear()
+        self._full_content_cache = ""
         self.is_started = False
         self.start_time = None
 
 
 # 预定义的实用处理器函数
+def _parse_field_path(field_path: str) -> List[Tuple[str, Optional[int]]]:
+    """
+    把字段路径解析为步骤列表
+    
+    Args:
+        field_path: 字段路径，如 "data.result.items[0].name"
+        
+    Returns:
+        (字段名, 数组下标)列表，普通字段的下标为None
+    """
+    steps = []
+    for part in field_path.split('.'):
+        # 处理数组索引
+        if '[' in part and ']' in part:
+            array_name, index = part.split('[')
+            steps.append((array_name, int(index.replace(']', ''))))
+        else:
+            steps.append((part, None))
+    return steps
+
+
 def create_json_extractor(field_path: str) -> Callable:
     """
-    创建一个JSON字段提取器
+    创建一个JSON字段提取器，字段路径在创建时解析一次
     
     Args:
         field_path: 字段路径，如 "data.result.items[0].name"
@@ -695,23 +990,18 @@ def create_json_extractor(field_path: str) -> Callable:
     Returns:
         提取函数
     """
+    steps = _parse_field_path(field_path)
+    
     def extractor(chunk: Dict[str, Any]) -> Any:
         value = chunk
-        parts = field_path.split('.')
-        
-        for part in parts:
-            # 处理数组索引
-            if '[' in part and ']' in part:
-                array_name, index = part.split('[')
-                index = int(index.replace(']', ''))
-                if array_name in value and isinstance(value[array_name], list) and 0 <= index < len(value[array_name]):
-                    value = value[array_name][index]
-                else:
-                    return None
-            else:
-                # 处理普通字段
-                if isinstance(value, dict) and part in value:
-                    value = value[part]
+        
+        for name, index in steps:
+            if not isinstance(value, dict) or name not in value:
+                return None
+            value = value[name]
+            if index is not None:
+                if isinstance(value, list) and 0 <= index < len(value):
+                    value = value[index]
                 else:
                     return None
         
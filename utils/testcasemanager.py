@@ -2,14 +2,323 @@ import json
 import yaml
 import os
 import re
+import mmap
+import struct
+import hashlib
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import count
 from datetime import datetime
-from typing import List, Dict, Any, Optional, Union
+from types import MappingProxyType
+from typing import List, Dict, Any, Mapping, Optional, Union
 import pandas as pd
 
+# 尝试导入msgspec以加速测试用例的持久化，如果不可用则使用JSON文件存储
+try:
+    import msgspec  # 需要安装: pip install msgspec
+    _encoder = msgspec.msgpack.Encoder()
+    _decoder = msgspec.msgpack.Decoder()
+    HAS_MSGSPEC = True
+except ImportError:
+    msgspec = None
+    _encoder = None
+    _decoder = None
+    HAS_MSGSPEC = False
+
+# 尝试导入orjson以加速JSON的读写，如果不可用则使用标准库json
+try:
+    import orjson  # 需要安装: pip install orjson
+    _ORJSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+except ImportError:
+    orjson = None
+    _ORJSON_OPTIONS = 0
+
+# openpyxl用于流式读取Excel文件
+try:
+    import openpyxl  # 需要安装: pip install openpyxl
+except ImportError:
+    openpyxl = None
+
+# 优先使用libyaml的C实现解析和生成YAML，不可用时回退到纯Python实现
+try:
+    from yaml import CSafeLoader as _YamlLoader, CDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader, Dumper as _YamlDumper
+
+# msgpack帧头：4字节大端序的负载长度
+_FRAME_HEADER = struct.Struct('>I')
+
+# 测试用例快照索引文件：文件头（魔数、快照字节数、条目数）+ 按ID哈希排序的 (哈希, 偏移, 长度) 条目
+_SNAPSHOT_INDEX_HEADER = struct.Struct('>4sQQ')
+_SNAPSHOT_INDEX_ENTRY = struct.Struct('>QQI')
+_SNAPSHOT_INDEX_MAGIC = b'TCI1'
+
+# Excel单元格中疑似JSON对象或数组的字符串（以 { 或 [ 开头）
+_JSONISH = re.compile(r'^[\{\[]')
+
+# 搜索关键词中只对单个字段有意义、不能在拼接后的搜索串上预筛选的写法（\A、\Z和零宽断言）
+_FIELD_ONLY_PATTERN = re.compile(r'\\[AZ]|\(\?<?[=!]')
+
+# 文件读写缓冲区大小，减少序列化过程中的小块读写系统调用
+_IO_BUFFER_SIZE = 1 << 16
+
+
+def _write_frames(file_path: str, records) -> List[tuple]:
+    """
+    将记录逐条编码为带长度前缀的msgpack帧并写入文件
+    
+    先写入临时文件再替换，避免写入中断时损坏已有数据
+    
+    Args:
+        file_path: 目标文件路径
+        records: 可迭代的记录
+    
+    Returns:
+        List: 每条记录负载的 (偏移, 长度)
+    """
+    tmp_path = file_path + '.tmp'
+    pack = _FRAME_HEADER.pack
+    encode = _encoder.encode
+    header_size = _FRAME_HEADER.size
+    spans = []
+    offset = 0
+    with open(tmp_path, 'wb', buffering=_IO_BUFFER_SIZE) as f:
+        for record in records:
+            buf = encode(record)
+            f.write(pack(len(buf)) + buf)
+            spans.append((offset + header_size, len(buf)))
+            offset += header_size + len(buf)
+    os.replace(tmp_path, file_path)
+    return spans
+
+
+def _hash_case_id(case_id: str) -> int:
+    """
+    计算测试用例ID的64位哈希，用于快照索引（跨进程稳定）
+    
+    Args:
+        case_id: 测试用例ID
+    
+    Returns:
+        int: 64位无符号哈希值
+    """
+    return int.from_bytes(hashlib.blake2b(case_id.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def _dump_json(obj: Any) -> bytes:
+    """
+    将对象序列化为带缩进的UTF-8 JSON字节串
+    
+    Args:
+        obj: 要序列化的对象
+    
+    Returns:
+        bytes: JSON字节串
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=_ORJSON_OPTIONS)
+        except TypeError:
+            # orjson不支持的类型（如超过64位的整数）回退到标准库
+            pass
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+
+
+def _load_json(data: bytes) -> Any:
+    """
+    解析JSON字节串
+    
+    Args:
+        data: JSON字节串
+    
+    Returns:
+        Any: 解析后的对象
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _try_load_json(value: str) -> Any:
+    """
+    尝试把字符串解析为JSON，解析失败时原样返回
+    
+    Args:
+        value: 字符串
+    
+    Returns:
+        Any: 解析后的对象或原字符串
+    """
+    try:
+        return _load_json(value)
+    except ValueError:
+        return value
+
+
+def _read_frames(file_path: str):
+    """
+    按长度前缀依次解码文件中的msgpack帧
+    
+    Args:
+        file_path: 文件路径
+    
+    Returns:
+        Generator: 解码后的记录，末尾不完整的帧会被忽略
+    """
+    with open(file_path, 'rb') as f:
+        data = memoryview(f.read())
+    
+    for start, length in _iter_frame_spans(data):
+        yield _decoder.decode(data[start:start + length])
+
+
+def _iter_frame_spans(data):
+    """
+    按长度前缀遍历缓冲区中的完整帧，不解码
+    
+    Args:
+        data: 帧数据缓冲区
+    
+    Returns:
+        Generator: 每一帧负载的 (偏移, 长度)，末尾不完整的帧会被忽略
+    """
+    unpack_from = _FRAME_HEADER.unpack_from
+    header_size = _FRAME_HEADER.size
+    offset = 0
+    end = len(data)
+    while offset + header_size <= end:
+        (length,) = unpack_from(data, offset)
+        offset += header_size
+        if offset + length > end:
+            break
+        yield offset, length
+        offset += length
+
+
+class _SnapshotIndex:
+    """
+    测试用例快照的只读索引
+    
+    通过mmap映射test_cases.mpk和test_cases.idx，按ID二分查找并只解码单条测试用例，
+    启动时无需解码整个快照
+    """
+    def __init__(self, snapshot_path: str, index_path: str):
+        """
+        初始化快照索引，文件不完整或与快照不匹配时抛出ValueError
+        
+        Args:
+            snapshot_path: 快照文件路径
+            index_path: 索引文件路径
+        """
+        self.snapshot_path = snapshot_path
+        self._snapshot = None
+        self._index = None
+        try:
+            with open(snapshot_path, 'rb') as f:
+                self._snapshot = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            with open(index_path, 'rb') as f:
+                self._index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            
+            magic, snapshot_size, self._count = _SNAPSHOT_INDEX_HEADER.unpack_from(self._index, 0)
+            expected_size = _SNAPSHOT_INDEX_HEADER.size + self._count * _SNAPSHOT_INDEX_ENTRY.size
+            if magic != _SNAPSHOT_INDEX_MAGIC or snapshot_size != len(self._snapshot) \
+                    or expected_size != len(self._index):
+                raise ValueError("测试用例快照索引与快照不匹配")
+        except (OSError, ValueError, struct.error):
+            self.close()
+            raise ValueError("测试用例快照索引不可用")
+    
+    def get(self, case_id: str) -> Optional[Dict[str, Any]]:
+        """
+        按ID查找并解码单条测试用例
+        
+        Args:
+            case_id: 测试用例ID
+        
+        Returns:
+            Dict or None: 测试用例数据或None
+        """
+        if not isinstance(case_id, str):
+            return None
+        
+        target = _hash_case_id(case_id)
+        index = self._index
+        unpack_from = _SNAPSHOT_INDEX_ENTRY.unpack_from
+        base = _SNAPSHOT_INDEX_HEADER.size
+        entry_size = _SNAPSHOT_INDEX_ENTRY.size
+        
+        # 在按哈希排序的条目中二分查找第一个匹配项
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if unpack_from(index, base + mid * entry_size)[0] < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        
+        # 哈希可能冲突，逐个比对记录中的ID
+        while lo < self._count:
+            hash_value, offset, length = unpack_from(index, base + lo * entry_size)
+            if hash_value != target:
+                break
+            record_id, case_data = _decoder.decode(self._snapshot[offset:offset + length])
+            if record_id == case_id:
+                return case_data
+            lo += 1
+        return None
+    
+    def close(self):
+        """
+        关闭映射的文件
+        """
+        for mapped in (self._snapshot, self._index):
+            if mapped is not None:
+                mapped.close()
+        self._snapshot = None
+        self._index = None
+    
+    @staticmethod
+    def write(index_path: str, snapshot_path: str, case_ids: List[str], spans: List[tuple]):
+        """
+        为快照写入索引文件，存在非字符串ID时删除索引（不启用延迟加载）
+        
+        Args:
+            index_path: 索引文件路径
+            snapshot_path: 快照文件路径
+            case_ids: 按快照顺序排列的测试用例ID
+            spans: 每条记录负载的 (偏移, 长度)
+        """
+        if not all(isinstance(case_id, str) for case_id in case_ids):
+            if os.path.exists(index_path):
+                os.remove(index_path)
+            return
+        
+        entries = sorted(
+            (_hash_case_id(case_id), offset, length)
+            for case_id, (offset, length) in zip(case_ids, spans)
+        )
+        pack = _SNAPSHOT_INDEX_ENTRY.pack
+        tmp_path = index_path + '.tmp'
+        with open(tmp_path, 'wb', buffering=_IO_BUFFER_SIZE) as f:
+            f.write(_SNAPSHOT_INDEX_HEADER.pack(
+                _SNAPSHOT_INDEX_MAGIC, os.path.getsize(snapshot_path), len(entries)
+            ))
+            for entry in entries:
+                f.write(pack(*entry))
+        os.replace(tmp_path, index_path)
+
+
 class TestCaseManager:
     """
     测试用例管理类，提供测试用例的创建、读取、更新、删除以及导入导出功能
     """
+    # 追加日志超过该大小（字节）时压缩为快照
+    WAL_COMPACT_THRESHOLD = 4 << 20
+    # 追加日志的写缓冲大小
+    WAL_BUFFER_SIZE = 1 << 16
+    # 延迟加载期间缓存的已解码测试用例数量
+    COLD_CACHE_SIZE = 1024
+    
     def __init__(self, storage_dir: str = "./test_cases"):
         """
         初始化测试用例管理器
@@ -18,8 +327,31 @@ class TestCaseManager:
             storage_dir: 测试用例存储目录
         """
         self.storage_dir = storage_dir
+        # 延迟加载的测试用例快照索引，首次需要全部用例时才完整解码
+        self._snapshot_index = None
+        # 延迟加载期间从日志回放的用例操作，以及按ID记录的最新结果（删除为None）
+        self._pending_ops = []
+        self._overlay = {}
+        # 延迟加载期间从快照解码的测试用例缓存，避免反复解码热点用例
+        self._cold_get = lru_cache(maxsize=self.COLD_CACHE_SIZE)(self._decode_snapshot_case)
         self.test_cases = {}
         self.test_suites = {}
+        self._wal = None
+        # 批量写入模式下变更不立即持久化
+        self._batch_mode = False
+        # 批量写入期间复用的时间戳
+        self._batch_now = None
+        # 搜索用的每个测试用例的字符串字段拼接缓存，用例变更时失效
+        self._search_index = {}
+        # 倒排索引：字段名 -> 字段值 -> 测试用例ID集合，用于等值过滤
+        self._index = {}
+        # 每个测试用例被加入索引的 (字段名, 字段值)，删除索引时使用
+        self._indexed_fields = {}
+        # 测试用例的插入顺序，保证过滤结果与遍历顺序一致
+        self._case_order = {}
+        self._order_counter = count()
+        # 反向索引：测试用例ID -> 包含该用例的测试套件ID集合
+        self._case_to_suites = {}
         
         # 确保存储目录存在
         if not os.path.exists(storage_dir):
@@ -27,88 +359,448 @@ class TestCaseManager:
         
         # 加载已有的测试用例
         self._load_existing_cases()
+        if self._snapshot_index is None:
+            self._index_loaded_cases()
+        for suite_id, suite_data in self.test_suites.items():
+            self._index_suite(suite_id, suite_data)
+        
+        # 安装了msgspec时，增删改只追加写入日志，不再重写整个文件
+        if HAS_MSGSPEC:
+            self._open_wal()
     
     def _load_existing_cases(self):
         """
         加载存储目录中已有的测试用例
+        
+        安装了msgspec时优先读取msgpack快照，不存在时回退到JSON文件（兼容旧数据）；
+        快照带有效索引时只映射文件，测试用例在首次需要时才解码
         """
         try:
-            # 加载JSON格式的测试用例
-            json_cases_path = os.path.join(self.storage_dir, "test_cases.json")
-            if os.path.exists(json_cases_path):
-                with open(json_cases_path, 'r', encoding='utf-8') as f:
-                    self.test_cases = json.load(f)
-            
-            # 加载测试套件配置
-            suites_path = os.path.join(self.storage_dir, "test_suites.json")
-            if os.path.exists(suites_path):
-                with open(suites_path, 'r', encoding='utf-8') as f:
-                    self.test_suites = json.load(f)
+            self._snapshot_index = self._open_snapshot_index()
+            if self._snapshot_index is None:
+                self.test_cases = self._load_store("test_cases")
+            self.test_suites = self._load_store("test_suites")
         except Exception as e:
             print(f"加载现有测试用例时出错: {e}")
     
+    def _open_snapshot_index(self) -> Optional[_SnapshotIndex]:
+        """
+        打开测试用例快照索引
+        
+        Returns:
+            _SnapshotIndex or None: 快照索引，不可用时返回None
+        """
+        snapshot_path = os.path.join(self.storage_dir, "test_cases.mpk")
+        index_path = os.path.join(self.storage_dir, "test_cases.idx")
+        if not HAS_MSGSPEC or not os.path.exists(snapshot_path) or not os.path.exists(index_path):
+            return None
+        try:
+            return _SnapshotIndex(snapshot_path, index_path)
+        except ValueError:
+            return None
+    
+    def _index_loaded_cases(self):
+        """
+        为已加载到内存的全部测试用例建立索引
+        """
+        for case_id, case_data in self._test_cases.items():
+            case_data['id'] = case_id
+            self._index_case(case_id, case_data)
+    
+    @property
+    def test_cases(self) -> Dict[str, Any]:
+        """
+        全部测试用例，延迟加载时首次访问会完整解码快照
+        
+        Returns:
+            Dict: 以ID为键的测试用例数据
+        """
+        if self._snapshot_index is not None:
+            self._materialize()
+        return self._test_cases
+    
+    @test_cases.setter
+    def test_cases(self, value: Dict[str, Any]):
+        self._test_cases = value
+    
+    def _materialize(self):
+        """
+        完整解码快照，建立索引并按顺序应用延迟期间回放的用例操作
+        """
+        snapshot_index, self._snapshot_index = self._snapshot_index, None
+        snapshot_path = snapshot_index.snapshot_path
+        snapshot_index.close()
+        # 更新、删除等操作都会先完整加载，缓存在此统一失效
+        self._cold_get.cache_clear()
+        
+        self._test_cases = dict(_read_frames(snapshot_path))
+        self._index_loaded_cases()
+        
+        pending_ops, self._pending_ops = self._pending_ops, []
+        self._overlay = {}
+        for op, key, data in pending_ops:
+            self._apply_op(op, key, data)
+    
+    def _load_store(self, name: str) -> Dict[str, Any]:
+        """
+        加载单个存储文件
+        
+        Args:
+            name: 存储文件名（不含扩展名）
+        
+        Returns:
+            Dict: 以ID为键的数据
+        """
+        mpk_path = os.path.join(self.storage_dir, f"{name}.mpk")
+        if HAS_MSGSPEC and os.path.exists(mpk_path):
+            # 每一帧是一条 [id, data] 记录
+            return dict(_read_frames(mpk_path))
+        
+        json_path = os.path.join(self.storage_dir, f"{name}.json")
+        if os.path.exists(json_path):
+            with open(json_path, 'rb', buffering=_IO_BUFFER_SIZE) as f:
+                return _load_json(f.read())
+        return {}
+    
+    def _save_store(self, name: str, data: Dict[str, Any]) -> None:
+        """
+        保存单个存储文件
+        
+        Args:
+            name: 存储文件名（不含扩展名）
+            data: 以ID为键的数据
+        """
+        if HAS_MSGSPEC:
+            mpk_path = os.path.join(self.storage_dir, f"{name}.mpk")
+            spans = _write_frames(mpk_path, data.items())
+            if name == "test_cases":
+                # 同时写入按ID查找的索引，供下次启动延迟加载
+                index_path = os.path.join(self.storage_dir, f"{name}.idx")
+                _SnapshotIndex.write(index_path, mpk_path, list(data), spans)
+        else:
+            json_path = os.path.join(self.storage_dir, f"{name}.json")
+            with open(json_path, 'wb', buffering=_IO_BUFFER_SIZE) as f:
+                f.write(_dump_json(data))
+    
+    def _open_wal(self):
+        """
+        回放已有的追加日志并打开日志文件用于追加写入
+        """
+        wal_path = os.path.join(self.storage_dir, "cases.wal")
+        valid_end = 0
+        if os.path.exists(wal_path):
+            with open(wal_path, 'rb') as f:
+                data = memoryview(f.read())
+            try:
+                for start, length in _iter_frame_spans(data):
+                    record = _decoder.decode(data[start:start + length])
+                    self._apply_op(record['op'], record['id'], record.get('data'))
+                    valid_end = start + length
+            except Exception as e:
+                print(f"回放测试用例日志时出错: {e}")
+        
+        self._wal = open(wal_path, 'ab', buffering=self.WAL_BUFFER_SIZE)
+        
+        # 丢弃不完整或损坏的尾帧，保证后续追加的记录可以被正确回放
+        if self._wal.tell() > valid_end:
+            self._wal.seek(valid_end)
+            self._wal.truncate()
+    
+    def _apply_op(self, op: str, key: str, data: Any = None):
+        """
+        将一条日志操作应用到内存数据
+        
+        Args:
+            op: 操作类型，put_case / del_case / put_suite
+            key: 测试用例ID或测试套件ID
+            data: 操作携带的数据
+        """
+        if op in ('put_case', 'del_case') and self._snapshot_index is not None:
+            # 快照尚未解码，用例操作暂存，完整加载时再按顺序应用
+            self._pending_ops.append((op, key, data))
+            if op == 'put_case':
+                data['id'] = key
+                self._overlay[key] = data
+            else:
+                self._overlay[key] = None
+                self._detach_from_suites(key)
+        elif op == 'put_case':
+            self._put_case(key, data)
+        elif op == 'del_case':
+            self._remove_case(key)
+        elif op == 'put_suite':
+            self._put_suite(key, data)
+    
+    def _index_case(self, case_id: str, case_data: Dict[str, Any]):
+        """
+        将测试用例的可哈希字段加入倒排索引
+        
+        Args:
+            case_id: 测试用例ID
+            case_data: 测试用例数据
+        """
+        index = self._index
+        fields = [('id', case_id)]
+        append_field = fields.append
+        for key, value in case_data.items():
+            if key == 'id':
+                continue
+            # 先查后建，避免每个字段都创建临时的空字典和空集合
+            values = index.get(key)
+            if values is None:
+                values = index[key] = {}
+            try:
+                ids = values.get(value)
+            except TypeError:
+                # 字典、列表等不可哈希的值不建索引，过滤时回退到遍历
+                continue
+            if ids is None:
+                values[value] = {case_id}
+            else:
+                ids.add(case_id)
+            append_field((key, value))
+        index.setdefault('id', {})[case_id] = {case_id}
+        self._indexed_fields[case_id] = fields
+        case_order = self._case_order
+        if case_id not in case_order:
+            case_order[case_id] = next(self._order_counter)
+    
+    def _unindex_case(self, case_id: str):
+        """
+        从倒排索引中移除测试用例
+        
+        Args:
+            case_id: 测试用例ID
+        """
+        index = self._index
+        for key, value in self._indexed_fields.pop(case_id, ()):
+            values = index[key]
+            ids = values[value]
+            ids.discard(case_id)
+            if not ids:
+                del values[value]
+    
+    def _put_case(self, case_id: str, case_data: Dict[str, Any]):
+        """
+        写入内存中的测试用例并更新相关索引
+        
+        Args:
+            case_id: 测试用例ID
+            case_data: 测试用例数据
+        """
+        # 先取出全部用例（延迟加载时会完整解码），再更新索引
+        test_cases = self.test_cases
+        self._unindex_case(case_id)
+        # ID直接存放在用例数据中，读取时无需再复制字典注入ID
+        case_data['id'] = case_id
+        test_cases[case_id] = case_data
+        self._search_index.pop(case_id, None)
+        self._index_case(case_id, case_data)
+    
+    def _remove_case(self, case_id: str):
+        """
+        从内存中删除测试用例，并从所属的测试套件中移除
+        
+        Args:
+            case_id: 测试用例ID
+        """
+        self.test_cases.pop(case_id, None)
+        self._search_index.pop(case_id, None)
+        self._unindex_case(case_id)
+        self._case_order.pop(case_id, None)
+        self._detach_from_suites(case_id)
+    
+    def _detach_from_suites(self, case_id: str):
+        """
+        从包含该测试用例的测试套件中移除它
+        
+        Args:
+            case_id: 测试用例ID
+        """
+        for suite_id in self._case_to_suites.pop(case_id, ()):
+            cases = self.test_suites[suite_id].get('cases') or []
+            if case_id in cases:
+                cases.remove(case_id)
+    
+    def _index_suite(self, suite_id: str, suite_data: Dict[str, Any]):
+        """
+        将测试套件包含的测试用例加入反向索引
+        
+        Args:
+            suite_id: 测试套件ID
+            suite_data: 测试套件数据
+        """
+        case_to_suites = self._case_to_suites
+        for case_id in suite_data.get('cases') or []:
+            case_to_suites.setdefault(case_id, set()).add(suite_id)
+    
+    def _put_suite(self, suite_id: str, suite_data: Dict[str, Any]):
+        """
+        写入内存中的测试套件并更新反向索引
+        
+        Args:
+            suite_id: 测试套件ID
+            suite_data: 测试套件数据
+        """
+        old_suite = self.test_suites.get(suite_id)
+        if old_suite is not None:
+            for case_id in old_suite.get('cases') or []:
+                suite_ids = self._case_to_suites.get(case_id)
+                if suite_ids is not None:
+                    suite_ids.discard(suite_id)
+        self.test_suites[suite_id] = suite_data
+        self._index_suite(suite_id, suite_data)
+    
+    def _append_wal(self, op: str, key: str, data: Any = None) -> bool:
+        """
+        追加一条日志记录，未启用日志时退回到保存完整文件
+        
+        Args:
+            op: 操作类型
+            key: 测试用例ID或测试套件ID
+            data: 操作携带的数据
+        
+        Returns:
+            bool: 是否写入成功
+        """
+        if self._batch_mode:
+            return True
+        if self._wal is None:
+            return self.save_cases()
+        
+        buf = _encoder.encode({'op': op, 'id': key, 'data': data})
+        self._wal.write(_FRAME_HEADER.pack(len(buf)) + buf)
+        self._wal.flush()
+        return self.compact()
+    
+    @contextmanager
+    def _batch_writes(self):
+        """
+        批量写入上下文：期间的变更只修改内存数据，退出时统一保存一次
+        """
+        self._batch_mode = True
+        try:
+            yield
+        finally:
+            self._batch_mode = False
+            self._batch_now = None
+            self.save_cases()
+    
+    def _now_iso(self) -> str:
+        """
+        获取当前时间的ISO格式字符串，批量写入期间整批共用同一个时间戳
+        
+        Returns:
+            str: ISO格式的时间字符串
+        """
+        if not self._batch_mode:
+            return datetime.now().isoformat()
+        if self._batch_now is None:
+            self._batch_now = datetime.now().isoformat()
+        return self._batch_now
+    
+    def compact(self, force: bool = False) -> bool:
+        """
+        压缩追加日志：日志超过阈值时写入完整快照并清空日志
+        
+        Args:
+            force: 是否忽略阈值强制压缩
+        
+        Returns:
+            bool: 是否成功
+        """
+        if self._wal is None:
+            return True
+        if not force and self._wal.tell() < self.WAL_COMPACT_THRESHOLD:
+            return True
+        return self.save_cases()
+    
     def save_cases(self):
         """
         保存测试用例到文件
         """
         try:
             # 保存测试用例
-            json_cases_path = os.path.join(self.storage_dir, "test_cases.json")
-            with open(json_cases_path, 'w', encoding='utf-8') as f:
-                json.dump(self.test_cases, f, ensure_ascii=False, indent=2)
+            self._save_store("test_cases", self.test_cases)
             
             # 保存测试套件
-            suites_path = os.path.join(self.storage_dir, "test_suites.json")
-            with open(suites_path, 'w', encoding='utf-8') as f:
-                json.dump(self.test_suites, f, ensure_ascii=False, indent=2)
+            self._save_store("test_suites", self.test_suites)
+            
+            # 快照已包含全部数据，清空追加日志
+            if self._wal is not None:
+                self._wal.seek(0)
+                self._wal.truncate()
             
             return True
         except Exception as e:
             print(f"保存测试用例时出错: {e}")
             return False
     
-    def create_test_case(self, case_id: str, case_data: Dict[str, Any]) -> bool:
+    def create_test_case(self, case_id: str, case_data: Mapping[str, Any]) -> bool:
         """
         创建新的测试用例
         
         Args:
             case_id: 测试用例ID
-            case_data: 测试用例数据
+            case_data: 测试用例数据（复制后保存，不修改传入的对象）
         
         Returns:
             bool: 是否创建成功
         """
         try:
             # 添加元数据
-            case_data['created_at'] = datetime.now().isoformat()
-            case_data['updated_at'] = datetime.now().isoformat()
+            case_data = dict(case_data)
+            case_data['created_at'] = case_data['updated_at'] = self._now_iso()
             case_data['status'] = case_data.get('status', 'active')
             
-            self.test_cases[case_id] = case_data
-            return self.save_cases()
+            self._put_case(case_id, case_data)
+            return self._append_wal('put_case', case_id, case_data)
         except Exception as e:
             print(f"创建测试用例时出错: {e}")
             return False
     
-    def get_test_case(self, case_id: str) -> Optional[Dict[str, Any]]:
+    def get_test_case(self, case_id: str) -> Optional[Mapping[str, Any]]:
         """
         获取测试用例
         
+        Args:
+            case_id: 测试用例ID
+        
+        Returns:
+            Mapping or None: 测试用例数据的只读视图或None（修改时复制为dict后调用update_test_case）
+        """
+        if self._snapshot_index is None:
+            case_data = self._test_cases.get(case_id)
+        elif case_id in self._overlay:
+            # 延迟加载期间：先查日志回放的结果，再从快照中只解码这一条
+            case_data = self._overlay[case_id]
+        else:
+            # 解码结果被缓存且会在完整加载时丢弃，同样只能以只读视图返回
+            case_data = self._cold_get(case_id)
+        return None if case_data is None else MappingProxyType(case_data)
+    
+    def _decode_snapshot_case(self, case_id: str) -> Optional[Dict[str, Any]]:
+        """
+        从快照中解码单条测试用例（经由 _cold_get 缓存调用）
+        
         Args:
             case_id: 测试用例ID
         
         Returns:
             Dict or None: 测试用例数据或None
         """
-        return self.test_cases.get(case_id)
+        case_data = self._snapshot_index.get(case_id)
+        if case_data is not None:
+            case_data['id'] = case_id
+        return case_data
     
-    def update_test_case(self, case_id: str, case_data: Dict[str, Any]) -> bool:
+    def update_test_case(self, case_id: str, case_data: Mapping[str, Any]) -> bool:
         """
         更新测试用例
         
         Args:
             case_id: 测试用例ID
-            case_data: 要更新的测试用例数据
+            case_data: 要更新的测试用例数据，可以直接传入get_test_case返回的只读视图（复制后保存）
         
         Returns:
             bool: 是否更新成功
@@ -118,12 +810,13 @@ class TestCaseManager:
         
         try:
             # 更新测试用例，但保留创建时间
+            case_data = dict(case_data)
             created_at = self.test_cases[case_id].get('created_at')
             case_data['created_at'] = created_at
-            case_data['updated_at'] = datetime.now().isoformat()
+            case_data['updated_at'] = self._now_iso()
             
-            self.test_cases[case_id] = case_data
-            return self.save_cases()
+            self._put_case(case_id, case_data)
+            return self._append_wal('put_case', case_id, case_data)
         except Exception as e:
             print(f"更新测试用例时出错: {e}")
             return False
@@ -142,19 +835,13 @@ class TestCaseManager:
             return False
         
         try:
-            del self.test_cases[case_id]
-            
-            # 同时从测试套件中移除
-            for suite_id, suite in self.test_suites.items():
-                if case_id in suite.get('cases', []):
-                    suite['cases'].remove(case_id)
-            
-            return self.save_cases()
+            self._remove_case(case_id)
+            return self._append_wal('del_case', case_id)
         except Exception as e:
             print(f"删除测试用例时出错: {e}")
             return False
     
-    def list_test_cases(self, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    def list_test_cases(self, filters: Optional[Dict[str, Any]] = None) -> List[Mapping[str, Any]]:
         """
         列出测试用例，支持过滤
         
@@ -162,28 +849,48 @@ class TestCaseManager:
             filters: 过滤条件
         
         Returns:
-            List: 测试用例列表
+            List: 测试用例的只读视图列表（修改时复制为dict后调用update_test_case，避免索引失效）
         """
-        result = []
+        if not filters:
+            return [MappingProxyType(case_data) for case_data in self.test_cases.values()]
         
-        for case_id, case_data in self.test_cases.items():
-            # 添加case_id到数据中
-            case_with_id = case_data.copy()
-            case_with_id['id'] = case_id
-            
-            # 应用过滤条件
-            if filters:
-                match = True
-                for key, value in filters.items():
-                    if key not in case_with_id or case_with_id[key] != value:
-                        match = False
-                        break
-                if match:
-                    result.append(case_with_id)
-            else:
-                result.append(case_with_id)
+        test_cases = self.test_cases
+        case_ids = self._lookup_index(filters)
+        if case_ids is not None:
+            return [MappingProxyType(test_cases[case_id]) for case_id in case_ids]
         
-        return result
+        # 存在不可哈希的过滤值时遍历全部用例
+        filter_items = list(filters.items())
+        return [
+            MappingProxyType(case_data) for case_data in test_cases.values()
+            if all(key in case_data and case_data[key] == value for key, value in filter_items)
+        ]
+    
+    def _lookup_index(self, filters: Dict[str, Any]) -> Optional[List[str]]:
+        """
+        通过倒排索引求满足全部等值过滤条件的测试用例ID
+        
+        Args:
+            filters: 过滤条件
+        
+        Returns:
+            List or None: 按插入顺序排列的测试用例ID，存在不可哈希的过滤值时返回None
+        """
+        index = self._index
+        matched = []
+        try:
+            for key, value in filters.items():
+                ids = index.get(key, {}).get(value)
+                if not ids:
+                    return []
+                matched.append(ids)
+        except TypeError:
+            return None
+        
+        # 从最小的集合开始求交集
+        matched.sort(key=len)
+        case_ids = matched[0].intersection(*matched[1:])
+        return sorted(case_ids, key=self._case_order.__getitem__)
     
     def create_test_suite(self, suite_id: str, suite_name: str, case_ids: List[str]) -> bool:
         """
@@ -204,14 +911,15 @@ class TestCaseManager:
                     print(f"测试用例 {case_id} 不存在")
                     return False
             
-            self.test_suites[suite_id] = {
+            now = self._now_iso()
+            self._put_suite(suite_id, {
                 'name': suite_name,
                 'cases': case_ids,
-                'created_at': datetime.now().isoformat(),
-                'updated_at': datetime.now().isoformat()
-            }
+                'created_at': now,
+                'updated_at': now
+            })
             
-            return self.save_cases()
+            return self._append_wal('put_suite', suite_id, self.test_suites[suite_id])
         except Exception as e:
             print(f"创建测试套件时出错: {e}")
             return False
@@ -224,23 +932,22 @@ class TestCaseManager:
             suite_id: 测试套件ID
         
         Returns:
-            Dict or None: 测试套件数据或None
+            Dict or None: 测试套件数据的副本（cases_data为测试用例的只读视图）或None
         """
         suite = self.test_suites.get(suite_id)
         if suite:
-            # 获取完整的测试用例数据
+            # 获取完整的测试用例数据；用例ID列表也复制一份，避免修改后反向索引失效
+            test_cases = self.test_cases
             suite_with_cases = suite.copy()
-            cases_data = []
-            for case_id in suite.get('cases', []):
-                if case_id in self.test_cases:
-                    case_data = self.test_cases[case_id].copy()
-                    case_data['id'] = case_id
-                    cases_data.append(case_data)
-            suite_with_cases['cases_data'] = cases_data
+            suite_with_cases['cases'] = list(suite.get('cases') or [])
+            suite_with_cases['cases_data'] = [
+                MappingProxyType(test_cases[case_id])
+                for case_id in suite_with_cases['cases'] if case_id in test_cases
+            ]
             return suite_with_cases
         return None
     
-    def search_test_cases(self, keyword: str) -> List[Dict[str, Any]]:
+    def search_test_cases(self, keyword: str) -> List[Mapping[str, Any]]:
         """
         搜索测试用例
         
@@ -248,23 +955,43 @@ class TestCaseManager:
             keyword: 搜索关键词
         
         Returns:
-            List: 符合条件的测试用例列表
+            List: 符合条件的测试用例的只读视图列表
         """
-        result = []
-        pattern = re.compile(keyword, re.IGNORECASE)
+        # 关键词逐个字段匹配（^、$ 对应字段的开头和结尾，不会跨字段匹配）；
+        # 先用按行拼接的搜索串以多行模式预筛选，未命中的用例不再逐个字段检查
+        search = re.compile(keyword, re.IGNORECASE).search
+        prefilter = None
+        if not _FIELD_ONLY_PATTERN.search(keyword):
+            prefilter = re.compile(keyword, re.IGNORECASE | re.MULTILINE).search
+        get_blob = self._search_index.get
+        build_blob = self._build_search_blob
         
+        result = []
         for case_id, case_data in self.test_cases.items():
-            case_with_id = case_data.copy()
-            case_with_id['id'] = case_id
-            
-            # 搜索所有字符串字段
-            for key, value in case_with_id.items():
-                if isinstance(value, str) and pattern.search(value):
-                    result.append(case_with_id)
-                    break
-        
+            if prefilter is not None and not prefilter(get_blob(case_id) or build_blob(case_id, case_data)):
+                continue
+            if search(case_id) or any(
+                    isinstance(v, str) and search(v) for k, v in case_data.items() if k != 'id'):
+                result.append(MappingProxyType(case_data))
         return result
     
+    def _build_search_blob(self, case_id: str, case_data: Dict[str, Any]) -> str:
+        """
+        把测试用例的所有字符串字段（含ID）按行拼接并缓存，用于多行模式下的预筛选
+        
+        Args:
+            case_id: 测试用例ID
+            case_data: 测试用例数据
+        
+        Returns:
+            str: 拼接后的字符串
+        """
+        blob = "\n".join(
+            [case_id] + [v for k, v in case_data.items() if k != 'id' and isinstance(v, str)]
+        )
+        self._search_index[case_id] = blob
+        return blob
+    
     # 导入导出功能
     def import_from_json(self, file_path: str) -> bool:
         """
@@ -277,29 +1004,30 @@ class TestCaseManager:
             bool: 是否导入成功
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                imported_data = json.load(f)
+            with open(file_path, 'rb', buffering=_IO_BUFFER_SIZE) as f:
+                imported_data = _load_json(f.read())
             
-            # 检查是否是测试用例列表
-            if isinstance(imported_data, list):
-                for case_data in imported_data:
-                    case_id = case_data.pop('id', f"imported_{len(self.test_cases) + 1}")
-                    self.create_test_case(case_id, case_data)
-            # 检查是否是单个测试用例
-            elif isinstance(imported_data, dict) and 'test_cases' not in imported_data:
-                case_id = imported_data.pop('id', f"imported_{len(self.test_cases) + 1}")
-                self.create_test_case(case_id, imported_data)
-            # 检查是否是完整的导出格式
-            elif isinstance(imported_data, dict) and 'test_cases' in imported_data:
-                # 导入测试用例
-                for case_id, case_data in imported_data['test_cases'].items():
-                    self.create_test_case(case_id, case_data)
-                
-                # 导入测试套件
-                if 'test_suites' in imported_data:
-                    for suite_id, suite_data in imported_data['test_suites'].items():
-                        self.test_suites[suite_id] = suite_data
-                    self.save_cases()
+            # 批量导入期间只修改内存数据，结束时统一保存一次
+            with self._batch_writes():
+                # 检查是否是测试用例列表
+                if isinstance(imported_data, list):
+                    for case_data in imported_data:
+                        case_id = case_data.pop('id', f"imported_{len(self.test_cases) + 1}")
+                        self.create_test_case(case_id, case_data)
+                # 检查是否是单个测试用例
+                elif isinstance(imported_data, dict) and 'test_cases' not in imported_data:
+                    case_id = imported_data.pop('id', f"imported_{len(self.test_cases) + 1}")
+                    self.create_test_case(case_id, imported_data)
+                # 检查是否是完整的导出格式
+                elif isinstance(imported_data, dict) and 'test_cases' in imported_data:
+                    # 导入测试用例
+                    for case_id, case_data in imported_data['test_cases'].items():
+                        self.create_test_case(case_id, case_data)
+                    
+                    # 导入测试套件
+                    if 'test_suites' in imported_data:
+                        for suite_id, suite_data in imported_data['test_suites'].items():
+                            self._put_suite(suite_id, suite_data)
             
             return True
         except Exception as e:
@@ -317,25 +1045,26 @@ class TestCaseManager:
             bool: 是否导入成功
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                imported_data = yaml.safe_load(f)
+            with open(file_path, 'r', encoding='utf-8', buffering=_IO_BUFFER_SIZE) as f:
+                imported_data = yaml.load(f, Loader=_YamlLoader)
             
-            # 处理逻辑与JSON类似
-            if isinstance(imported_data, list):
-                for case_data in imported_data:
-                    case_id = case_data.pop('id', f"imported_{len(self.test_cases) + 1}")
-                    self.create_test_case(case_id, case_data)
-            elif isinstance(imported_data, dict) and 'test_cases' not in imported_data:
-                case_id = imported_data.pop('id', f"imported_{len(self.test_cases) + 1}")
-                self.create_test_case(case_id, imported_data)
-            elif isinstance(imported_data, dict) and 'test_cases' in imported_data:
-                for case_id, case_data in imported_data['test_cases'].items():
-                    self.create_test_case(case_id, case_data)
-                
-                if 'test_suites' in imported_data:
-                    for suite_id, suite_data in imported_data['test_suites'].items():
-                        self.test_suites[suite_id] = suite_data
-                    self.save_cases()
+            # 批量导入期间只修改内存数据，结束时统一保存一次
+            with self._batch_writes():
+                # 处理逻辑与JSON类似
+                if isinstance(imported_data, list):
+                    for case_data in imported_data:
+                        case_id = case_data.pop('id', f"imported_{len(self.test_cases) + 1}")
+                        self.create_test_case(case_id, case_data)
+                elif isinstance(imported_data, dict) and 'test_cases' not in imported_data:
+                    case_id = imported_data.pop('id', f"imported_{len(self.test_cases) + 1}")
+                    self.create_test_case(case_id, imported_data)
+                elif isinstance(imported_data, dict) and 'test_cases' in imported_data:
+                    for case_id, case_data in imported_data['test_cases'].items():
+                        self.create_test_case(case_id, case_data)
+                    
+                    if 'test_suites' in imported_data:
+                        for suite_id, suite_data in imported_data['test_suites'].items():
+                            self._put_suite(suite_id, suite_data)
             
             return True
         except Exception as e:
@@ -353,33 +1082,42 @@ class TestCaseManager:
             bool: 是否导入成功
         """
         try:
-            # 读取Excel文件
-            df = pd.read_excel(file_path)
+            if openpyxl is None:
+                raise ImportError("导入Excel需要安装openpyxl: pip install openpyxl")
             
-            # 将DataFrame转换为字典列表
-            cases_data = df.to_dict('records')
-            
-            for case_data in cases_data:
-                # 清理NaN值
-                clean_data = {k: v for k, v in case_data.items() if pd.notna(v)}
-                
-                # 获取或生成测试用例ID
-                case_id = clean_data.pop('id', None)
-                if not case_id:
-                    case_id = clean_data.pop('case_id', f"imported_{len(self.test_cases) + 1}")
-                
-                # 将字符串格式的列表、字典转换为实际对象
-                for key, value in clean_data.items():
-                    if isinstance(value, str):
-                        # 尝试转换为JSON
-                        if (value.startswith('{') and value.endswith('}')) or \
-                           (value.startswith('[') and value.endswith(']')):
-                            try:
-                                clean_data[key] = json.loads(value)
-                            except:
-                                pass
+            # 以只读模式流式读取第一个工作表，不构建完整的DataFrame
+            workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+            try:
+                rows = workbook.worksheets[0].iter_rows(values_only=True)
+                header = [
+                    name if name is not None else f"Unnamed: {i}"
+                    for i, name in enumerate(next(rows, None) or ())
+                ]
                 
-                self.create_test_case(case_id, clean_data)
+                # 批量导入期间只修改内存数据，结束时统一保存一次
+                with self._batch_writes():
+                    for row in rows:
+                        # 跳过空单元格和空行
+                        clean_data = {k: v for k, v in zip(header, row) if v is not None}
+                        if not clean_data:
+                            continue
+                        
+                        # 获取或生成测试用例ID
+                        case_id = clean_data.pop('id', None)
+                        if not case_id:
+                            case_id = clean_data.pop('case_id', f"imported_{len(self.test_cases) + 1}")
+                        
+                        # 将字符串格式的列表、字典转换为实际对象，先用正则筛出候选单元格，解析失败的保留原字符串
+                        pending = [
+                            key for key, value in clean_data.items()
+                            if isinstance(value, str) and _JSONISH.match(value) and value[-1] in '}]'
+                        ]
+                        for key in pending:
+                            clean_data[key] = _try_load_json(clean_data[key])
+                        
+                        self.create_test_case(case_id, clean_data)
+            finally:
+                workbook.close()
             
             return True
         except Exception as e:
@@ -398,26 +1136,35 @@ class TestCaseManager:
             bool: 是否导出成功
         """
         try:
-            export_data = {
-                'test_cases': {},
-                'test_suites': self.test_suites,
-                'export_time': datetime.now().isoformat()
-            }
-            
             # 导出指定的测试用例或全部测试用例
             if case_ids:
-                for case_id in case_ids:
-                    if case_id in self.test_cases:
-                        export_data['test_cases'][case_id] = self.test_cases[case_id]
+                cases = [
+                    (case_id, self.test_cases[case_id])
+                    for case_id in dict.fromkeys(case_ids) if case_id in self.test_cases
+                ]
             else:
-                export_data['test_cases'] = self.test_cases
+                cases = self.test_cases.items()
             
             # 确保目录存在
             os.makedirs(os.path.dirname(file_path), exist_ok=True)
             
-            # 写入文件
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(export_data, f, ensure_ascii=False, indent=2)
+            # 逐个测试用例序列化后写入，不在内存中构建完整的导出文档；
+            # 片段中的换行补上所在层级的缩进，输出与整体缩进序列化一致
+            with open(file_path, 'wb', buffering=_IO_BUFFER_SIZE) as f:
+                f.write(b'{\n  "test_cases": {')
+                separator = b'\n    '
+                for case_id, case_data in cases:
+                    f.write(separator)
+                    f.write(_dump_json(case_id))
+                    f.write(b': ')
+                    f.write(_dump_json(case_data).replace(b'\n', b'\n    '))
+                    separator = b',\n    '
+                f.write(b'}' if separator == b'\n    ' else b'\n  }')
+                f.write(b',\n  "test_suites": ')
+                f.write(_dump_json(self.test_suites).replace(b'\n', b'\n  '))
+                f.write(b',\n  "export_time": ')
+                f.write(_dump_json(datetime.now().isoformat()))
+                f.write(b'\n}')
             
             return True
         except Exception as e:
@@ -453,8 +1200,8 @@ class TestCaseManager:
             os.makedirs(os.path.dirname(file_path), exist_ok=True)
             
             # 写入文件
-            with open(file_path, 'w', encoding='utf-8') as f:
-                yaml.dump(export_data, f, default_flow_style=False, allow_unicode=True)
+            with open(file_path, 'w', encoding='utf-8', buffering=_IO_BUFFER_SIZE) as f:
+                yaml.dump(export_data, f, Dumper=_YamlDumper, default_flow_style=False, allow_unicode=True)
             
             return True
         except Exception as e:
@@ -474,25 +1221,19 @@ class TestCaseManager:
         """
         try:
             # 准备要导出的测试用例
-            cases_to_export = []
-            
             if case_ids:
-                for case_id in case_ids:
-                    if case_id in self.test_cases:
-                        case_data = self.test_cases[case_id].copy()
-                        case_data['id'] = case_id
-                        cases_to_export.append(case_data)
+                cases = [self.test_cases[case_id] for case_id in case_ids if case_id in self.test_cases]
             else:
-                for case_id, case_data in self.test_cases.items():
-                    data = case_data.copy()
-                    data['id'] = case_id
-                    cases_to_export.append(data)
+                cases = self.test_cases.values()
             
-            # 转换复杂数据类型为字符串
-            for case in cases_to_export:
-                for key, value in case.items():
-                    if isinstance(value, (dict, list)):
-                        case[key] = json.dumps(value, ensure_ascii=False)
+            # 复制用例的同时把复杂数据类型转换为字符串
+            cases_to_export = [
+                {
+                    key: json.dumps(value, ensure_ascii=False) if isinstance(value, (dict, list)) else value
+                    for key, value in case.items()
+                }
+                for case in cases
+            ]
             
             # 创建DataFrame并导出到Excel
             df = pd.DataFrame(cases_to_export)